@@ -23,178 +23,35 @@
 # limitations under the License.
 
 import os
-from benchmark_utilities.analysis import BenchmarkAnalyzer
+import sys
+import argparse
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, ExecuteProcess
 from launch.substitutions import LaunchConfiguration
-from launch.conditions import IfCondition
-
-import sys
-import argparse
-import json
 
-# Launch file with command:
-# 
 
 def main(argv):
-    
     # Parse the command-line arguments
     parser = argparse.ArgumentParser()
     parser.add_argument('--hardware_device_type', type=str, help='Hardware Device Type (e.g. cpu or fpga)', default ='cpu')
     parser.add_argument('--trace_path', type=str, help='Path to trace files (e.g. /tmp/analysis/trace)', default = '/tmp/analysis/trace')
     parser.add_argument('--metrics', type=str, help='List of metrics to be analyzed (e.g. latency and/or throughput)', default = ['latency'])
-    parser.add_argument('--integrated', type=str, help='Integrated or separated version of the Resize and Rectify nodes (only for fpga now)', default='false') 
-    parser.add_argument('--trace_set_filter_type', type=str, help='Weather to filter trace sets by name or by unique ID', default='name') 
+    parser.add_argument('--integrated', type=str, help='Integrated or separated version of the Resize and Rectify nodes (only for fpga now)', default='false')
+    parser.add_argument('--trace_set_filter_type', type=str, help='Weather to filter trace sets by name or by unique ID', default=None)
     args = parser.parse_args(argv)
 
-    # Get the values of the arguments
-    hardware_device_type = args.hardware_device_type
-    trace_path = args.trace_path
-    metrics_string = args.metrics
-    metrics_elements = [element.strip() for element in metrics_string.strip("[]").split(",")]
-    metrics = json.loads(json.dumps(metrics_elements))
-    integrated = args.integrated
-    trace_set_filter_type = args.trace_set_filter_type
-
-    # Instantiate the class
-    ba = BenchmarkAnalyzer('xarm_moveit_fake', hardware_device_type)
-    ba.set_trace_sets_filter_type(trace_set_filter_type)
-
-    if hardware_device_type == 'cpu':
-        # add parameters for analyzing the traces
-        ## using message header id
-        target_chain = [
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_init",       # 0
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_init",          # 1
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_fini",          # 2
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_fini",       # 3
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_init",        # 4
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_init",           # 5
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_fini",           # 6
-            "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_fini"         # 7
-        ]
+    # target and power chains are declared in the "analysis" section of benchmark.yaml,
+    # see "ros2 benchmark analyze"
+    from ros2benchmark.verb.analyze import analyze_benchmark
+    analyze_benchmark(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmark.yaml'),
+        hardware_device_type=args.hardware_device_type,
+        trace_path=args.trace_path,
+        metrics=args.metrics,
+        integrated=(args.integrated == 'true'),
+        trace_sets_filter_type=args.trace_set_filter_type,
+    )
 
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_init",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_init",
-                "colors_fg": "yellow",
-                "colors_fg_bokeh": "salmon",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_init",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_init",
-                "colors_fg": "red",
-                "colors_fg_bokeh": "darksalmon",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_fini",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_fini",
-                "colors_fg": "red",
-                "colors_fg_bokeh": "lightcoral",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_fini",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_robot_collision_cb_fini",
-                "colors_fg": "yellow",
-                "colors_fg_bokeh": "darkred",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_init",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_init",
-                "colors_fg": "yellow",
-                "colors_fg_bokeh": "salmon",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_init",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_init",
-                "colors_fg": "red",
-                "colors_fg_bokeh": "darksalmon",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_fini",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_fini",
-                "colors_fg": "red",
-                "colors_fg_bokeh": "lightcoral",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        ba.add_target(
-            {
-                "name": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_fini",
-                "name_disambiguous": "robotcore_manipulation:robotcore_moveit2_fcl_check_self_collision_cb_fini",
-                "colors_fg": "yellow",
-                "colors_fg_bokeh": "darkred",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-        )
-        
-    num_metrics = 0 # initialize the metric count
-    add_power = False # initialize the boolean
-    for metric in metrics:
-        if metric == 'power':
-            add_power = True
-            ba.add_power(
-            {
-                "name": "robotcore_power:robotcore_power_output_cb_fini",
-                "name_disambiguous": "robotcore_power:robotcore_power_output_cb_fini",
-                "colors_fg": "blue",
-                "colors_fg_bokeh": "silver",
-                "layer": "userland",
-                "label_layer": 4,
-                "marker": "plus",
-            }
-            )
-        else:
-            num_metrics += 1 # it will be larger than 0 if other metrics besides power are desired
-    
-    for metric in metrics:
-        if metric == 'latency':
-            ba.analyze_latency(trace_path, add_power)
-        elif metric == 'throughput':
-            ba.analyze_throughput(trace_path, add_power)
-        elif metric == 'power': 
-            if num_metrics == 0: # launch independently iff no other metric is requested
-                total_consumption = ba.analyze_power(trace_path)
-                print("The average consumption is {} W".format(total_consumption))
-        else:
-            print('The metric ' + metric + ' is not yet implemented\n')
-    
 
 def generate_launch_description():
     # Declare the launch arguments
@@ -215,7 +72,7 @@ def generate_launch_description():
         default_value=['latency'],
         description='List of metrics to be analyzed (e.g. latency and/or throughput)'
     )
-    
+
     integrated_arg = DeclareLaunchArgument(
         'integrated',
         default_value="false",
@@ -224,15 +81,16 @@ def generate_launch_description():
 
     # Create the launch description
     ld = LaunchDescription()
-    
-    # Define the ExecuteProcess action to run the Python script
+
+    # Analyze all metrics in a single process, see "ros2 benchmark analyze"
     analyzer = ExecuteProcess(
         cmd=[
-            'python3', "src/benchmarks/benchmarks/manipulation/d2_collision_checking_fcl/launch/analyze_d2_collision_checking_fcl.launch.py",
+            'ros2', 'benchmark', 'analyze', 'd2',
             '--hardware_device_type', LaunchConfiguration('hardware_device_type'),
             '--trace_path', LaunchConfiguration('trace_path'),
             '--metrics', LaunchConfiguration('metrics'),
-            '--integrated', LaunchConfiguration('integrated')],
+            '--integrated', LaunchConfiguration('integrated'),
+            '--searchpath', 'src'],
         output='screen'
     )
 
@@ -241,7 +99,7 @@ def generate_launch_description():
     ld.add_action(trace_path_arg)
     ld.add_action(metrics_arg)
     ld.add_action(integrated_arg)
-    
+
     # Add the ExecuteProcess action to the launch description
     ld.add_action(analyzer)
 
@@ -249,4 +107,3 @@ def generate_launch_description():
 
 if __name__ == '__main__':
     main(sys.argv[1:])
-    
\ No newline at end of file
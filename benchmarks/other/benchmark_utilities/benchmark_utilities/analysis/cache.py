@@ -0,0 +1,336 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import array
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+from benchmark_utilities.analysis.events import TraceEvent, iter_trace_events
+
+# bump whenever the layout of the cached columns changes
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = "/tmp/analysis/cache"
+
+# size the cache is pruned down to, least recently used entries first
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# events converted to Python objects at once while iterating columns
+COLUMN_CHUNK = 65536
+
+# sentinels for missing integer/float fields
+MISSING_INT = -1
+MISSING_FLOAT = np.nan
+
+
+def trace_fingerprint(tracename):
+    """
+    Returns a list of (relative path, size, mtime) for every file in a trace
+
+    Used to detect whether a trace changed since it was last cached.
+    """
+    fingerprint = []
+    for root, dirs, files in os.walk(tracename):
+        dirs.sort()
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            stat = os.stat(path)
+            fingerprint.append((os.path.relpath(path, tracename), stat.st_size, stat.st_mtime_ns))
+    return fingerprint
+
+
+def cache_key(tracename, names):
+    """
+    Returns the cache key of a trace for a given set of event names
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names extracted (e.g. target_chain + power_chain)
+    """
+    digest = hashlib.sha1()
+    digest.update(str(CACHE_VERSION).encode("utf-8"))
+    digest.update(os.path.abspath(tracename).encode("utf-8"))
+    for entry in trace_fingerprint(tracename):
+        digest.update(repr(entry).encode("utf-8"))
+    for name in sorted(set(names)):
+        digest.update(name.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ColumnBuilder:
+    """
+    Packs compact events into NumPy columns as they are appended
+
+    Message sizes are variable-length per event and thereby stored
+    flattened, together with the offsets of each event into them.
+    """
+
+    def __init__(self, names):
+        """
+        :param: names: event names, the position of each name is its id
+        """
+        self.names = sorted(set(names))
+        self.name_ids = {name: index for index, name in enumerate(self.names)}
+
+        self.name_id = array.array("h")
+        self.ns = array.array("q")
+        self.vpid = array.array("q")
+        self.vtid = array.array("q")
+        self.header_sec = array.array("q")
+        self.header_nsec = array.array("q")
+        self.msg_sizes = array.array("q")
+        self.msg_sizes_offsets = array.array("q", [0])
+        self.update_rate = array.array("d")
+        self.power = array.array("d")
+
+    def append(self, event):
+        self.name_id.append(self.name_ids[event.name])
+        self.ns.append(event.ns)
+        self.vpid.append(MISSING_INT if event.vpid is None else event.vpid)
+        self.vtid.append(MISSING_INT if event.vtid is None else event.vtid)
+        self.header_sec.append(MISSING_INT if event.header_sec is None else event.header_sec)
+        self.header_nsec.append(MISSING_INT if event.header_nsec is None else event.header_nsec)
+        self.msg_sizes.extend(event.msg_sizes)
+        self.msg_sizes_offsets.append(len(self.msg_sizes))
+        self.update_rate.append(MISSING_FLOAT if event.update_rate is None else event.update_rate)
+        self.power.append(MISSING_FLOAT if event.power is None else event.power)
+
+    def columns(self):
+        """
+        Returns the dict of NumPy columns of the events appended so far
+        """
+        return {
+            "names": np.array(self.names, dtype=str),
+            "name_id": np.asarray(self.name_id, dtype=np.int16),
+            "ns": np.asarray(self.ns, dtype=np.int64),
+            "vpid": np.asarray(self.vpid, dtype=np.int64),
+            "vtid": np.asarray(self.vtid, dtype=np.int64),
+            "header_sec": np.asarray(self.header_sec, dtype=np.int64),
+            "header_nsec": np.asarray(self.header_nsec, dtype=np.int64),
+            "msg_sizes": np.asarray(self.msg_sizes, dtype=np.int64),
+            "msg_sizes_offsets": np.asarray(self.msg_sizes_offsets, dtype=np.int64),
+            "update_rate": np.asarray(self.update_rate, dtype=np.float64),
+            "power": np.asarray(self.power, dtype=np.float64),
+        }
+
+
+def events_to_columns(events, names):
+    """
+    Packs compact events into a dict of NumPy columns, see ColumnBuilder
+
+    :param: events: iterable of TraceEvent
+    :param: names: event names, the position of each name is its id
+    """
+    builder = ColumnBuilder(names)
+    for event in events:
+        builder.append(event)
+    return builder.columns()
+
+
+def iter_column_events(columns, names=None, chunk=COLUMN_CHUNK):
+    """
+    Yields compact events out of cached columns, in trace order
+
+    Columns are converted to Python objects chunk events at a time, so
+    memory doesn't grow with the length of the trace beyond the columns.
+
+    :param: columns: dict of NumPy columns (see events_to_columns)
+    :param: names: only yield events with these names, all if None
+    :param: chunk: events converted at once
+    """
+    all_names = [str(name) for name in columns["names"]]
+    name_id = columns["name_id"]
+    if names is None:
+        indices = np.arange(len(name_id))
+    else:
+        names = set(names)
+        wanted = [index for index, name in enumerate(all_names) if name in names]
+        indices = np.flatnonzero(np.isin(name_id, wanted))
+    offsets = columns["msg_sizes_offsets"]
+
+    for first in range(0, len(indices), chunk):
+        selected = indices[first:first + chunk]
+        # convert to Python scalars in bulk rather than element by element
+        chunk_name_id = name_id[selected].tolist()
+        ns = columns["ns"][selected].tolist()
+        vpid = columns["vpid"][selected].tolist()
+        vtid = columns["vtid"][selected].tolist()
+        header_sec = columns["header_sec"][selected].tolist()
+        header_nsec = columns["header_nsec"][selected].tolist()
+        update_rate = columns["update_rate"][selected].tolist()
+        power = columns["power"][selected].tolist()
+        starts = offsets[selected]
+        ends = offsets[selected + 1]
+        sizes_base = int(starts[0]) if len(selected) else 0
+        msg_sizes = columns["msg_sizes"][sizes_base:int(ends[-1]) if len(selected) else 0].tolist()
+        starts = (starts - sizes_base).tolist()
+        ends = (ends - sizes_base).tolist()
+
+        for i in range(len(ns)):
+            yield TraceEvent(
+                all_names[chunk_name_id[i]],
+                ns[i],
+                None if vpid[i] == MISSING_INT else vpid[i],
+                None if vtid[i] == MISSING_INT else vtid[i],
+                None if header_sec[i] == MISSING_INT else header_sec[i],
+                None if header_nsec[i] == MISSING_INT else header_nsec[i],
+                tuple(msg_sizes[starts[i]:ends[i]]),
+                None if update_rate[i] != update_rate[i] else update_rate[i],  # NaN check
+                None if power[i] != power[i] else power[i],
+            )
+
+
+def save_columns(path, columns):
+    """
+    Atomically writes columns into a .npz file
+    """
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_columns(path):
+    """
+    Reads columns from a .npz file written by save_columns
+    """
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def prune_cache(cache_dir, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Removes the least recently used entries of a cache until it fits in max_bytes
+
+    Entries are touched when loaded (see cached_columns), so their mtime
+    tells when they were last used.
+
+    :param: cache_dir: directory of the cache
+    :param: max_bytes: size of the cache, None never prunes
+    """
+    if max_bytes is None or not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for file in os.listdir(cache_dir):
+        if not file.endswith(".npz"):
+            continue
+        path = os.path.join(cache_dir, file)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # removed meanwhile, e.g. by another analysis
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    entries.sort()
+    total = sum(entry[1] for entry in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def cached_columns(tracename, names, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the cached columns of a trace for the given event names, None
+    if there's no valid entry
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names extracted
+    :param: cache_dir: directory of the cache
+    """
+    path = os.path.join(cache_dir, cache_key(tracename, names) + ".npz")
+    if not os.path.exists(path):
+        return None
+    try:
+        columns = load_columns(path)
+    except (OSError, ValueError, KeyError):
+        return None  # corrupted entry, decode again
+    try:
+        os.utime(path)  # most recently used, see prune_cache
+    except OSError:
+        pass
+    return columns
+
+
+def iter_caching_trace_events(tracename, names, wanted=None, cache_dir=DEFAULT_CACHE_DIR,
+                              max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Lazily decodes a trace (see iter_trace_events) while writing its cache
+    entry, which is only saved once the whole trace was decoded
+
+    Events are packed into columns as they stream, so memory grows with
+    the compact columns rather than with Python objects.
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names cached (e.g. target_chain + power_chain)
+    :param: wanted: event names yielded, all of names if None
+    :param: cache_dir: directory of the cache
+    :param: max_bytes: size the cache is pruned down to, see prune_cache
+    """
+    names = tuple(sorted(set(names)))
+    wanted = set(names if wanted is None else wanted)
+    path = os.path.join(cache_dir, cache_key(tracename, names) + ".npz")
+    builder = ColumnBuilder(names)
+    for event in iter_trace_events(tracename, names):
+        builder.append(event)
+        if event.name in wanted:
+            yield event
+    save_columns(path, builder.columns())
+    prune_cache(cache_dir, max_bytes)
+
+
+def decode_columns(tracename, names, workers=1):
+    """
+    Decodes a trace through babeltrace into columns, serially or with
+    one worker process per stream file
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names to extract
+    :param: workers: number of worker processes, 1 decodes in this process,
+    None uses all CPUs
+    """
+    if workers == 1:
+        return events_to_columns(iter_trace_events(tracename, names), names)
+    # imported here, parallel depends on this module
+    from benchmark_utilities.analysis.parallel import parallel_trace_columns
+    return parallel_trace_columns(tracename, names, workers)
+
+
+def trace_columns(tracename, names, cache_dir=DEFAULT_CACHE_DIR, workers=1, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Returns the columns of the events with the given names in a trace
+
+    Decodes the trace through babeltrace only if no valid cache entry
+    exists for the trace (path and file mtimes) and event names,
+    otherwise loads it from cache_dir.
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names to extract
+    :param: cache_dir: directory of the cache, None disables caching
+    :param: workers: decoding worker processes (see decode_columns)
+    :param: max_bytes: size the cache is pruned down to, see prune_cache
+    """
+    if cache_dir is None:
+        return decode_columns(tracename, names, workers)
+
+    columns = cached_columns(tracename, names, cache_dir)
+    if columns is not None:
+        return columns
+
+    columns = decode_columns(tracename, names, workers)
+    save_columns(os.path.join(cache_dir, cache_key(tracename, names) + ".npz"), columns)
+    prune_cache(cache_dir, max_bytes)
+    return columns
@@ -0,0 +1,97 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Probe effect of the instrumentation: tracepoints run within the callbacks
+# they measure, and those of tracetools_benchmark compute the size of the
+# messages (a full serialization of each) right before tracing them. Their
+# cost, calibrated on the host by the probe_calibration executable of
+# a1_perception_2nodes, can be subtracted from the latencies of each hop.
+
+import numpy as np
+import yaml
+
+# where probe_calibration writes by default
+DEFAULT_PROBE_CALIBRATION = "/tmp/analysis/probe_calibration.yaml"
+
+# events not traced by the CPU (e.g. timestamps of FPGA kernels), free of probe effect
+UNPROBED_PREFIXES = ("ros2:vitis_profiler:",)
+
+
+def load_probe_calibration(calibration=DEFAULT_PROBE_CALIBRATION):
+    """
+    Probe costs out of the output of probe_calibration
+
+    :param: calibration: path of the YAML file written by probe_calibration,
+    or its contents as a dict
+    :returns: dict with "tracepoint_ns" (cost of a tracepoint call) and
+    "fixed_ns" and "per_byte_ns" (cost of computing the size of a message,
+    fixed_ns + per_byte_ns * bytes)
+    """
+    if not isinstance(calibration, dict):
+        with open(calibration, "r") as f:
+            calibration = yaml.safe_load(f)
+    msg_size = calibration.get("msg_size") or {}
+    costs = {
+        "tracepoint_ns": float(calibration.get("tracepoint_ns", 0.0)),
+        "fixed_ns": float(msg_size.get("fixed_ns", 0.0)),
+        "per_byte_ns": float(msg_size.get("per_byte_ns", 0.0)),
+    }
+    if any(not np.isfinite(cost) or cost < 0 for cost in costs.values()):
+        raise ValueError("Invalid probe calibration: " + str(costs))
+    return costs
+
+
+def probe_costs_ns(image_pipeline_msg_sets, calibration, probed=None):
+    """
+    Cost of each tracepoint of a list of message sets: its call and the
+    size computations of the messages it traces (one per msg_size field)
+
+    :param: image_pipeline_msg_sets: list of message sets (TraceEvent)
+    :param: calibration: probe costs, see load_probe_calibration
+    :param: probed: whether each tracepoint of the chain costs a call, all by default
+    :returns: int64 costs, sets x tracepoints
+    """
+    if probed is None:
+        probed = [True] * (len(image_pipeline_msg_sets[0]) if image_pipeline_msg_sets else 0)
+    calls = np.where(probed, calibration["tracepoint_ns"], 0.0)
+    sizes = np.array(
+        [[calibration["fixed_ns"] * len(msg.msg_sizes) + calibration["per_byte_ns"] * sum(msg.msg_sizes)
+          for msg in msg_set] for msg_set in image_pipeline_msg_sets],
+        dtype=np.float64).reshape(len(image_pipeline_msg_sets), -1)
+    return np.round(sizes + calls).astype(np.int64)
+
+
+def subtract_probe_costs(ns, costs, parents=None):
+    """
+    Timestamps as if the instrumentation cost nothing
+
+    The hop from a tracepoint to the next one is inflated by a tracepoint
+    call (the end of the call of the first and the start of the call of
+    the second) and by the size computations of the second, run before
+    its timestamp is taken, i.e. by the cost of the second (see
+    probe_costs_ns). Costs are subtracted from each hop, never below
+    zero, and accumulate along the chain; at joins along the parent
+    traced last.
+
+    :param: ns: int64 timestamps, sets x tracepoints (see ns_matrix)
+    :param: costs: int64 costs, sets x tracepoints (see probe_costs_ns)
+    :param: parents: parents of each tracepoint (positions, see
+    chain_parents), None for a linear chain
+    :returns: int64 corrected timestamps, sets x tracepoints
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    costs = np.asarray(costs, dtype=np.int64)
+    if parents is None:
+        parents = [(position - 1,) if position else () for position in range(ns.shape[1])]
+    rows = np.arange(len(ns))
+    subtracted = np.zeros(ns.shape, dtype=np.int64)
+    for position, parent in enumerate(parents):
+        if not parent:
+            continue
+        latest = np.asarray(parent)[np.argmax(ns[:, list(parent)], axis=1)]
+        hop = ns[:, position] - ns[rows, latest]
+        subtracted[:, position] = subtracted[rows, latest] + np.clip(costs[:, position], 0, np.maximum(hop, 0))
+    return ns - subtracted
@@ -0,0 +1,333 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+from collections import OrderedDict
+from wasabi import color
+
+# partial chains older than this (relative to the latest event) are considered lost
+DEFAULT_EVICTION_WINDOW_NS = 10 * 1000000000
+# partial chains kept per context by ChainMatcher, as many as the threads
+# of a multithreaded executor (component_container_mt uses one per core)
+DEFAULT_MAX_INFLIGHT = 8
+
+
+def chain_positions(chain):
+    """
+    Returns a dict mapping each event name to its positions in the chain
+
+    NOTE: a name may appear several times in a chain (e.g. two image inputs
+    or "ros2:callback_start"), positions are listed in chain order.
+    """
+    positions = {}
+    for position, name in enumerate(chain):
+        positions.setdefault(name, []).append(position)
+    return positions
+
+
+class ChainAssembler:
+    """
+    Assembles chains of events sharing a unique identifier (e.g. the header
+    stamp of the message flowing through the chain) in a single pass.
+
+    Progress of each chain is tracked with a bitmask over the positions of
+    the chain, so completion is detected in constant time per event and
+    completed chains are emitted right away. Partial chains that don't
+    complete within window_ns of their first event are evicted and
+    accounted as lost, which bounds memory by the number of chains in
+    flight rather than by the length of the trace. Ids of chains completed
+    or evicted are remembered for another window, so that late events of
+    theirs are discarded instead of starting chains lost all over again.
+
+    Chains shaped as graphs (see chain_parents) are joined the same way,
+    events of a name appearing in several branches taking the position
+    whose parents are all present, on the thread of one of them if any.
+    """
+
+    def __init__(self, chain, window_ns=DEFAULT_EVICTION_WINDOW_NS, debug=False, parents=None):
+        """
+        :param: chain: list of event names, in order
+        :param: window_ns: eviction window of partial chains, None never evicts
+        :param: debug: print discarded events and lost chains
+        :param: parents: parents of each event of the chain (positions, see
+        chain_parents), None for a linear chain
+        """
+        self.chain = list(chain)
+        self.positions = chain_positions(self.chain)
+        self.complete_mask = (1 << len(self.chain)) - 1
+        self.parents = None
+        self.parent_masks = None
+        if parents is not None:
+            self.parents = [tuple(parent) for parent in parents]
+            self.parent_masks = [sum(1 << index for index in parent) for parent in self.parents]
+        self.window_ns = window_ns
+        self.debug = debug
+
+        self.inflight = OrderedDict()  # id -> [mask, first ns, events by position, last position added]
+        self.retired = OrderedDict()  # id -> ns, chains recently completed or evicted
+        self.lost = 0  # number of chains evicted or left incomplete
+        self.dropped = []  # (first ns, last position reached) of each chain lost
+
+    def add(self, id, event):
+        """
+        Adds an event to the chain with the given id
+
+        :returns: the list of events of the chain, in chain order, if the event
+        completed it, None otherwise
+        """
+        entry = self.inflight.get(id)
+        if entry is None:
+            if id in self.retired:
+                if self.debug:
+                    print(color("Message with id: " + str(id) + " already fully propagated or lost, discarding - " + str(event.name), fg="yellow"))
+                return None
+            entry = [0, event.ns, [None] * len(self.chain), -1]
+            self.inflight[id] = entry
+
+        # take the first position of this name still missing in the chain
+        mask = entry[0]
+        if self.parents is None:
+            position = next(
+                (position for position in self.positions[event.name] if not mask & (1 << position)), None)
+        else:
+            position = self.graph_position(entry, event)
+        if position is None:
+            if self.debug:
+                print(color("Message with id: " + str(id) + " already has " + str(event.name) + ", discarding", fg="yellow"))
+            return None
+
+        entry[0] = mask | (1 << position)
+        entry[2][position] = event
+        entry[3] = position
+        if entry[0] == self.complete_mask:
+            del self.inflight[id]
+            self.retired[id] = event.ns
+            return entry[2]
+        return None
+
+    def graph_position(self, entry, event):
+        """
+        Position of an event in a chain shaped as a graph: among those of
+        its name still missing, the first one whose parents are all
+        present, preferably on the thread of one of its parents
+
+        NOTE: branches running the same tracepoints (e.g. two image inputs)
+        are told apart by the order in which their events arrive.
+        """
+        mask = entry[0]
+        missing = [position for position in self.positions[event.name] if not mask & (1 << position)]
+        ready = [position for position in missing
+                 if mask & self.parent_masks[position] == self.parent_masks[position]]
+        for position in ready:
+            if any(entry[2][index].vtid == event.vtid for index in self.parents[position]):
+                return position
+        if ready:
+            return ready[0]
+        return missing[0] if missing else None
+
+    def evict(self, now_ns):
+        """
+        Evicts partial chains whose first event is older than the window,
+        and forgets the ids retired longer than the window ago
+
+        :param: now_ns: timestamp of the latest event seen
+        """
+        if self.window_ns is None:
+            return
+        deadline = now_ns - self.window_ns
+        # entries are kept in order of first appearance
+        while self.inflight:
+            id, entry = next(iter(self.inflight.items()))
+            if entry[1] >= deadline:
+                break
+            del self.inflight[id]
+            self.drop(id, entry)
+            self.retired[id] = now_ns
+        # ids are retired in time order, completed or evicted
+        while self.retired:
+            id, ns = next(iter(self.retired.items()))
+            if ns >= deadline:
+                break
+            del self.retired[id]
+
+    def flush(self):
+        """
+        Accounts all partial chains left as lost, e.g. at the end of a trace
+        """
+        while self.inflight:
+            id, entry = self.inflight.popitem(last=False)
+            self.drop(id, entry)
+        self.retired.clear()
+
+    def drop(self, id, entry):
+        self.lost += 1
+        self.dropped.append((entry[1], entry[3]))
+        if self.debug:
+            names = [event.name for event in entry[2] if event is not None]
+            print(color("Message with id: " + str(id) + " not fully propagated, discarding chain - " + str(names), fg="red"))
+
+    def assemble(self, events, unique_funq):
+        """
+        Yields complete chains (lists of events in chain order) out of a
+        time-ordered stream of events
+
+        :param: events: iterable of events, ordered by timestamp
+        :param: unique_funq: function returning the chain identifier of an event
+        """
+        for event in events:
+            completed = self.add(unique_funq(event), event)
+            if completed is not None:
+                yield completed
+            self.evict(event.ns)
+        self.flush()
+
+
+class ChainMatcher:
+    """
+    Matches chains of events by the order in which their events appear,
+    for traces whose events carry no chain identifier.
+
+    The chain is compiled once into integer ids, so that matching an event
+    costs a couple of dict lookups. Several chains can be in flight at once
+    within each context (e.g. each process, see context), which is what
+    multithreaded executors (e.g. component_container_mt) produce: each
+    event advances the oldest chain in its context expecting it, while
+    a first event of the chain that no chain expects starts a new one.
+
+    Events that no chain in flight expects ("altered order") discard the
+    oldest chain of their context, and a "ros2:callback_end" following
+    a "ros2:callback_start" of the same thread cancels it, as callbacks
+    not involved in the chain are traced with the same events.
+    """
+
+    CALLBACK_START = "ros2:callback_start"
+    CALLBACK_END = "ros2:callback_end"
+
+    def __init__(
+        self,
+        chain,
+        context="vpid",
+        max_inflight=DEFAULT_MAX_INFLIGHT,
+        window_ns=DEFAULT_EVICTION_WINDOW_NS,
+        debug=False,
+    ):
+        """
+        :param: chain: list of event names, in order
+        :param: context: event attribute chains are kept apart by ("vpid" or
+        "vtid"), None to match all events together (e.g. VTF events, which
+        carry no context)
+        :param: max_inflight: maximum number of partial chains per context,
+        the oldest one is discarded when exceeded
+        :param: window_ns: discard partial chains whose first event is older
+        than this, None never discards them
+        :param: debug: print matched, cancelled and discarded events
+        """
+        self.chain = list(chain)
+        self.name_ids = {}
+        for name in self.chain:
+            self.name_ids.setdefault(name, len(self.name_ids))
+        self.chain_ids = [self.name_ids[name] for name in self.chain]
+        self.first_id = self.chain_ids[0]
+        self.callback_start_id = self.name_ids.get(self.CALLBACK_START)
+        self.callback_end_id = self.name_ids.get(self.CALLBACK_END)
+
+        self.context = context
+        self.max_inflight = max_inflight
+        self.window_ns = window_ns
+        self.debug = debug
+
+        self.inflight = {}  # context -> list of partial chains, oldest first
+        self.lost = 0  # number of chains discarded
+        self.dropped = []  # (first ns, last position reached) of each chain discarded
+
+    def context_of(self, event):
+        if self.context is None:
+            return None
+        return getattr(event, self.context)
+
+    def add(self, event):
+        """
+        Adds an event to the chains in flight
+
+        :returns: the list of events of a chain, in chain order, if the event
+        completed it, None otherwise
+        """
+        name_id = self.name_ids.get(event.name)
+        if name_id is None:
+            return None
+        chains = self.inflight.setdefault(self.context_of(event), [])
+        if self.window_ns is not None:
+            self.evict(chains, event.ns - self.window_ns)
+
+        # match, the oldest chain expecting this event
+        for new_set in chains:
+            if self.chain_ids[len(new_set)] == name_id:
+                new_set.append(event)
+                if len(new_set) == len(self.chain_ids):
+                    chains.remove(new_set)
+                    if self.debug:
+                        print(color("Found last: " + str(event.name) + " - " + str([x.name for x in new_set]), fg="blue"))
+                    return new_set
+                if self.debug:
+                    print(color("Found: " + str(event.name) + " - " + str([x.name for x in new_set]), fg="green"))
+                return None
+
+        # first one
+        if name_id == self.first_id:
+            if len(chains) >= self.max_inflight:
+                self.drop(chains.pop(0), "too many chains in flight")
+            new_set = [event]
+            if len(self.chain_ids) == 1:
+                return new_set
+            chains.append(new_set)
+            if self.debug:
+                print(color("Found first: " + str(event.name), fg="blue"))
+            return None
+
+        # cancel the last "ros2:callback_start" of the same thread
+        if name_id == self.callback_end_id:
+            for new_set in reversed(chains):
+                last = new_set[-1]
+                if (self.name_ids[last.name] == self.callback_start_id
+                        and (last.vtid is None or event.vtid is None or last.vtid == event.vtid)):
+                    new_set.pop()
+                    if not new_set:
+                        chains.remove(new_set)
+                    return None
+
+        # altered order
+        if chains:
+            self.drop(chains.pop(0), "altered order by " + str(event.name))
+        return None
+
+    def evict(self, chains, deadline):
+        while chains and chains[0][0].ns < deadline:
+            self.drop(chains.pop(0), "not completed in time")
+
+    def drop(self, new_set, reason):
+        self.lost += 1
+        self.dropped.append((new_set[0].ns, len(new_set) - 1))
+        if self.debug:
+            print(color("Discarding " + str([x.name for x in new_set]) + ", " + reason, fg="red"))
+
+    def match(self, events):
+        """
+        Yields complete chains (lists of events in chain order) out of a
+        time-ordered stream of events
+        """
+        for event in events:
+            completed = self.add(event)
+            if completed is not None:
+                yield completed
+        self.flush()
+
+    def flush(self):
+        """
+        Accounts all partial chains left as lost, e.g. at the end of a trace
+        """
+        for chains in self.inflight.values():
+            for new_set in chains:
+                self.drop(new_set, "not completed by the end of the trace")
+        self.inflight = {}
@@ -0,0 +1,1365 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Written by Alejandra Martínez Fariña <alex@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import os
+import time
+import subprocess
+import yaml
+import numpy as np
+from wasabi import color
+from benchmark_utilities.analysis.events import iter_trace_events, merge_events
+from benchmark_utilities.analysis.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_BYTES,
+    cached_columns,
+    iter_caching_trace_events,
+    iter_column_events,
+    trace_columns,
+)
+from benchmark_utilities.analysis.calibration import (
+    DEFAULT_PROBE_CALIBRATION,
+    UNPROBED_PREFIXES,
+    load_probe_calibration,
+    probe_costs_ns,
+    subtract_probe_costs,
+)
+from benchmark_utilities.analysis.chains import DEFAULT_EVICTION_WINDOW_NS, DEFAULT_MAX_INFLIGHT, ChainAssembler, ChainMatcher
+from benchmark_utilities.analysis.dag import chain_parents, dag_breakdown, is_linear
+from benchmark_utilities.analysis.drops import drop_funnel, drop_rates
+from benchmark_utilities.analysis.histogram import LatencyHistogram
+from benchmark_utilities.analysis.live import DEFAULT_ROLLING_WINDOW_NS, RollingMetrics, TraceFollower, iter_live_events
+from benchmark_utilities.analysis.plotting import PlottingMixin
+from benchmark_utilities.analysis.power import energy_metrics, power_series, power_summary, sets_window
+from benchmark_utilities.analysis.reporting import ReportingMixin
+from benchmark_utilities.analysis.segments import chain_segments, hop_stages, ns_matrix, relative_ns, segment_breakdown
+from benchmark_utilities.analysis.statistics import (
+    DEFAULT_PERCENTILES,
+    chain_statistics,
+    chain_totals,
+    describe,
+    latency_array,
+    ns_to_ms,
+)
+from benchmark_utilities.analysis.throughput import (
+    DEFAULT_THROUGHPUT_WINDOW_NS,
+    DEFAULT_TIME_CONSTANT_NS,
+    NS_PER_S,
+    output_series,
+    size_index,
+    throughput_summary,
+    windowed_rates,
+)
+
+# color("{:02x}".format(x), fg=16, bg="green")
+# debug = True  # debug flag, set to True if desired
+
+
+class BenchmarkAnalyzer(PlottingMixin, ReportingMixin):
+    """
+    Analyzes LTTng traces of a benchmark: forms sets of the target chain
+    (and power chain) events and computes latency, throughput and power
+
+    NOTE: core ingest and statistics live here, plots in PlottingMixin
+    and reports in ReportingMixin.
+    """
+
+    def __init__(self, benchmark_name, hardware_device_type="cpu"):
+        self.benchmark_name = benchmark_name
+        self.hardware_device_type = hardware_device_type
+
+        # initialize arrays where tracing configuration will be stored
+        self.target_chain = []
+        self.target_chain_dissambiguous = []
+        self.target_chain_colors_fg = []
+        self.target_chain_colors_fg_bokeh = []
+        self.target_chain_layer = []
+        self.target_chain_label_layer = []
+        self.target_chain_marker = []
+        self.target_chain_parents = []  # labels of the parents of each target, None for the previous one
+        self.lost_msgs = 0  # lost messages counter, target_chain not fully met
+        self.dropped_msgs = []  # (first ns, last position reached) of each lost message, see drop_funnel
+        self.chain_eviction_window_ns = DEFAULT_EVICTION_WINDOW_NS
+        self.chain_max_inflight = DEFAULT_MAX_INFLIGHT  # partial sets per process when filtering by name
+        self.throughput_window_ns = DEFAULT_THROUGHPUT_WINDOW_NS
+        self.throughput_time_constant_ns = DEFAULT_TIME_CONSTANT_NS
+        self.latency_histogram = LatencyHistogram()  # benchmark latency (ms) of target sets
+        self.latency_histogram_sets = None  # message sets latency_histogram accounts for
+        self.latency_histogram_latencies = None  # and their latencies, see bar_charts_latency
+        self.probe_calibration = None  # probe costs subtracted from latencies, see set_probe_calibration
+
+        # initialize arrays where tracing configuration will be stored
+        self.power_chain = []
+        self.power_chain_dissambiguous = []
+        self.power_chain_colors_fg = []
+        self.power_chain_colors_fg_bokeh = []
+        self.power_chain_layer = []
+        self.power_chain_label_layer = []
+        self.power_chain_marker = []
+        self.power_lost_msgs = 0  # lost messages counter, target_chain not fully met
+        self.power_msg_sets = []  # events of the power chain, see get_power_chain_traces
+
+        # columnar cache of decoded trace events, on disk and in memory
+        self.trace_cache_dir = DEFAULT_CACHE_DIR
+        self.trace_cache_max_bytes = DEFAULT_CACHE_MAX_BYTES
+        self.trace_columns = {}
+        self.decode_workers = 1
+        self.target_chain_sets = {}  # message sets of the target chain, per trace
+
+    def add_target(self, target_dict):
+        # targeted chain of messages for tracing
+        # NOTE: there're not "publish" tracepoints because
+        # graph's using inter-process communications
+
+        self.target_chain.append(target_dict["name"])
+        self.target_chain_dissambiguous.append(target_dict["name_disambiguous"])
+        self.target_chain_colors_fg.append(target_dict["colors_fg"])
+        self.target_chain_colors_fg_bokeh.append(target_dict["colors_fg_bokeh"])
+        self.target_chain_layer.append(target_dict["layer"])
+        self.target_chain_label_layer.append(target_dict["label_layer"])
+        self.target_chain_marker.append(target_dict["marker"])
+        # fan-in/fan-out pipelines, see chain_parents
+        self.target_chain_parents.append(target_dict.get("parents"))
+
+    def add_power(self, power_dict):
+        # targeted chain of messages for tracing
+        # NOTE: there're not "publish" tracepoints because
+        # graph's using inter-process communications
+
+        self.power_chain.append(power_dict["name"])
+        self.power_chain_dissambiguous.append(power_dict["name_disambiguous"])
+        self.power_chain_colors_fg.append(power_dict["colors_fg"])
+        self.power_chain_colors_fg_bokeh.append(power_dict["colors_fg_bokeh"])
+        self.power_chain_layer.append(power_dict["layer"])
+        self.power_chain_label_layer.append(power_dict["label_layer"])
+        self.power_chain_marker.append(power_dict["marker"])
+
+    @classmethod
+    def from_benchmark_yaml(cls, yaml_file, hardware_device_type="cpu", integrated=False):
+        """
+        Instantiates an analyzer out of the "analysis" section of a benchmark.yaml
+
+        The section declares the target chain of each hardware variant
+        (e.g. "cpu", "fpga" or "fpga_integrated"), the power chain and,
+        optionally, how trace sets are filtered:
+
+            analysis:
+              trace_sets_filter_type: name
+              chains:
+                cpu:
+                - name: robotperf_benchmarks:robotperf_image_input_cb_init
+                  name_disambiguous: robotperf_benchmarks:robotperf_image_input_cb_init
+                  ...
+                - name: robotperf_benchmarks:robotperf_image_output_cb_init
+                  name_disambiguous: robotperf_benchmarks:robotperf_image_output_cb_init
+                  parents:  # optional, joins several branches (see chain_parents)
+                  - robotperf_benchmarks:robotperf_image_input_cb_fini
+                  - robotperf_benchmarks:robotperf_image_input_cb_fini (2)
+                  ...
+              power:
+              - name: robotcore_power:robotcore_power_output_cb_fini
+                ...
+
+        Args:
+            yaml_file (string): path of the benchmark.yaml file
+            hardware_device_type (string, optional): hardware device type (e.g. cpu or fpga)
+            integrated (bool, optional): integrated version of the nodes (only for fpga now)
+        """
+        with open(yaml_file, "r") as f:
+            yaml_data = yaml.safe_load(f)
+        analysis = yaml_data.get("analysis")
+        if not analysis:
+            raise ValueError("No analysis section in " + yaml_file)
+
+        ba = cls(yaml_data["name"], hardware_device_type)
+        if "trace_sets_filter_type" in analysis:
+            ba.set_trace_sets_filter_type(analysis["trace_sets_filter_type"])
+
+        # integrated nodes have their own chain (only fpga now), the
+        # separated one applies otherwise (e.g. cpu launch files passing it)
+        chains = analysis.get("chains", {})
+        variant = hardware_device_type
+        if integrated and variant + "_integrated" in chains:
+            variant += "_integrated"
+        if variant in chains:
+            for target_dict in chains[variant]:
+                ba.add_target(target_dict)
+        else:
+            print('The hardware device type ' + variant + ' is not yet implemented\n')
+        for power_dict in analysis.get("power", []):
+            ba.add_power(power_dict)
+        return ba
+
+    def analyze(self, metrics, tracepath=None):
+        """
+        Analyze the requested metrics of the image pipeline, in this process
+        and over the same decoded trace events
+
+        Args:
+            metrics (list): metrics to analyze (latency, throughput and/or power)
+            tracepath (string, optional):
+                Path of the CTF tracefiles. Defaults to None.
+        """
+        add_power = "power" in metrics
+        num_metrics = len([metric for metric in metrics if metric != "power"])
+
+        for metric in metrics:
+            if metric == 'latency':
+                self.analyze_latency(tracepath, add_power)
+            elif metric == 'throughput':
+                self.analyze_throughput(tracepath, add_power)
+            elif metric == 'power':
+                if num_metrics == 0:  # launch independently iff no other metric is requested
+                    total_consumption = self.analyze_power(tracepath)
+                    if total_consumption is not None:
+                        print("The average consumption is {} W".format(total_consumption))
+            else:
+                print('The metric ' + metric + ' is not yet implemented\n')
+
+    def trace_events(self, tracename, target=True):
+        """
+        Lazily yields the compact events of a trace that belong to the
+        target chain (or to the power chain if target is False).
+
+        Unless caching is disabled (see set_trace_cache) and decoding is
+        serial (see set_parallel_decoding), events are served from the
+        columns of the trace. Traces not cached yet are streamed through
+        babeltrace while serial decoding fills in their cache entry.
+
+        Args:
+            tracename (string): path for the trace file
+            target (bool, optional): to specify the traces to be selected (target or power)
+        """
+        if target:
+            chain = self.target_chain
+        else:
+            chain = self.power_chain
+
+        if self.decode_workers == 1:
+            if self.trace_cache_dir is None:
+                return iter_trace_events(tracename, chain)
+            names = tuple(sorted(set(self.target_chain + self.power_chain)))
+            key = (os.path.abspath(tracename), names)
+            if key not in self.trace_columns:
+                columns = cached_columns(tracename, names, self.trace_cache_dir)
+                if columns is None:
+                    return iter_caching_trace_events(
+                        tracename, names, chain, self.trace_cache_dir, self.trace_cache_max_bytes
+                    )
+                self.trace_columns[key] = columns
+        return iter_column_events(self.get_trace_columns(tracename), chain)
+
+    def get_trace_columns(self, tracename):
+        """
+        Returns the columns of the target and power chain events of a trace
+
+        Traces are decoded at most once per analyzer and chain definition, and
+        at most once overall while the trace (path and mtimes) and chains
+        don't change, since results are kept in self.trace_cache_dir.
+
+        Args:
+            tracename (string): path for the trace file
+        """
+        names = tuple(sorted(set(self.target_chain + self.power_chain)))
+        key = (os.path.abspath(tracename), names)
+        if key not in self.trace_columns:
+            self.trace_columns[key] = trace_columns(
+                tracename, names, self.trace_cache_dir, self.decode_workers, self.trace_cache_max_bytes
+            )
+        return self.trace_columns[key]
+
+    def set_trace_cache(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        """
+        Select the directory of the columnar cache of decoded traces
+
+        :param: cache_dir: path of the cache, None to always decode traces
+        through babeltrace while streaming events
+        :param: max_bytes: size the cache is pruned down to, least recently
+        used traces first, None to let it grow
+        """
+        self.trace_cache_dir = cache_dir
+        self.trace_cache_max_bytes = max_bytes
+        self.trace_columns = {}
+
+    def set_parallel_decoding(self, workers=None):
+        """
+        Decode traces with a pool of processes, one task per CTF stream file
+        (LTTng writes one per channel and CPU), filtering the target and
+        power chain events in the workers and merging them in time order
+
+        :param: workers: number of worker processes, None for all CPUs,
+        1 to decode serially in this process
+        """
+        self.decode_workers = workers
+
+    def get_change(self, first, second):
+        """
+        Get change in percentage between two values
+        """
+        if first == second:
+            return 0
+        try:
+            return (abs(first - second) / second) * 100.0
+        except ZeroDivisionError:
+            return float("inf")
+
+    def msgsets_from_ctf_vtf_traces(self, ctf_trace, vtf_trace, debug=False, target=True):
+        """
+        Returns a list of message sets ready to be used
+        for plotting them in various forms. Takes two inputs,
+        corresponding with the absolute paths to a CTF and and 
+        VTF (CTF format).
+
+        NOTE: VTF events carry no process/thread context, so chains are
+        matched across all events regardless of the process.
+        Classification expects events in the corresponding order.
+        """
+        return self.msgsets_from_traces([ctf_trace, vtf_trace], debug, target)
+
+    def msgsets_from_traces(self, tracenames, debug=False, target=True):
+        """
+        Returns a list of message sets ready to be used
+        for plotting them in various forms, out of events from several
+        traces (e.g. CPU CTF, FPGA VTF and power traces)
+
+        Events of each trace are decoded lazily and merged in time order
+        as sets are formed (see merge_events). Chains are matched across
+        all events regardless of the process, as in
+        msgsets_from_ctf_vtf_traces.
+
+        Args:
+            tracenames (list): paths of the trace files
+            debug (bool, optional): print matching progress
+            target (bool, optional): to specify the traces to be selected (target or power)
+        """
+        all_msgs_sorted = merge_events(
+            *[self.trace_events(tracename, target) for tracename in tracenames])
+
+        return self.match_chains(all_msgs_sorted, None, debug, target)
+
+    def match_chains(self, msgs, context="vpid", debug=False, target=True):
+        """
+        Forms message sets out of time-ordered events following the order
+        of the target chain (or power chain if target is False)
+
+        Chains not completed are accounted in self.lost_msgs
+        (self.power_lost_msgs for the power chain).
+
+        Args:
+            msgs (iterable): compact events, ordered by timestamp
+            context (string, optional): event attribute chains are kept apart by
+                ("vpid", "vtid" or None), see ChainMatcher
+            debug (bool, optional): print matching progress
+            target (bool, optional): to specify the chain to match (target or power)
+        """
+        if target:
+            chain = self.target_chain
+        else:
+            chain = self.power_chain
+
+        matcher = ChainMatcher(
+            chain, context, self.chain_max_inflight, self.chain_eviction_window_ns, debug
+        )
+        if target:
+            image_pipeline_msg_sets = list(self.record_latencies(matcher.match(msgs)))
+            self.latency_histogram_sets = image_pipeline_msg_sets
+            self.lost_msgs += matcher.lost
+            self.dropped_msgs += matcher.dropped
+        else:
+            image_pipeline_msg_sets = list(matcher.match(msgs))
+            self.power_lost_msgs += matcher.lost
+        return image_pipeline_msg_sets
+
+
+    def timestamp_identifier(self, msg):
+        """
+        Returns ROS message header timestamp as unique identifier
+        from a trace event, as exact integer nanoseconds
+
+        NOTE: events without header stamp (e.g. power) are identified
+        by their own timestamp.
+        """
+        # header_sec and header_nsec are extracted from the payload
+        # fields (e.g. "image_input_header_sec") while decoding
+        if msg.header_sec is None or msg.header_nsec is None:
+            return msg.ns
+        id = msg.header_sec * 1000000000 + msg.header_nsec
+        return id
+
+    def msgsets_from_trace_identifier(
+        self, 
+        tracename, 
+        unique_funq=None, 
+        debug=False,
+        target=True
+    ):
+        """
+        Returns a list of message sets ready to be used
+        for plotting them in various forms. Uses unique identifer
+        function to group the events of each set.
+
+        NOTE: A different implementation than msgsets_from_trace and which
+        allows determining messages dropped or not propagated appropriately.
+
+        Sets are assembled in a single pass (see ChainAssembler). Sets not
+        completed within self.chain_eviction_window_ns of their first event
+        are discarded and accounted in self.lost_msgs.
+
+        Args:
+            tracename (string): path for the trace file
+            debug (bool, optional): [description]. Defaults to False.
+            target (bool, optional): to specify the traces to be selected (target or power)
+
+        """
+        if unique_funq is None:
+            unique_funq = self.timestamp_identifier
+
+        if target:
+            chain = self.target_chain
+        else:
+            chain = self.power_chain
+
+        if target:
+            assembler = self.chain_assembler(debug)
+        else:
+            assembler = ChainAssembler(chain, self.chain_eviction_window_ns, debug)
+        image_pipeline_msg_sets = assembler.assemble(self.trace_events(tracename, target), unique_funq)
+        if target:
+            image_pipeline_msg_sets = self.record_latencies(image_pipeline_msg_sets)
+        image_pipeline_msg_sets = list(image_pipeline_msg_sets)
+        if target:
+            self.latency_histogram_sets = image_pipeline_msg_sets
+            self.lost_msgs += assembler.lost
+            self.dropped_msgs += assembler.dropped
+        else:
+            self.power_lost_msgs += assembler.lost
+
+        # survivors
+        return image_pipeline_msg_sets
+
+    def chain_assembler(self, debug=False):
+        """
+        ChainAssembler of the target chain, joining its branches if it's
+        shaped as a graph (see chain_parents)
+        """
+        parents = self.chain_parents()
+        return ChainAssembler(
+            self.target_chain, self.chain_eviction_window_ns, debug,
+            None if is_linear(parents) else parents)
+
+    def record_latencies(self, image_pipeline_msg_sets):
+        """
+        Records the benchmark latency of each target set into
+        self.latency_histogram as sets complete, yielding them through
+
+        The histogram is started over, it accounts for the sets of a single
+        analysis (see latency_histogram_sets). The benchmark latency of a
+        set matches the sum of its relative latencies (see
+        barchart_data_latency) over benchmark_indices().
+        """
+        self.latency_histogram = LatencyHistogram()
+        self.latency_histogram_sets = None
+        indices = self.benchmark_indices()
+        first = max(indices[0] - 1, 0)
+        last = indices[-1]
+        for new_set in image_pipeline_msg_sets:
+            self.latency_histogram.record(ns_to_ms(self.set_latency_ns(new_set, first, last)))
+            yield new_set
+
+    def set_latency_ns(self, new_set, first, last):
+        """
+        Latency of a set between two of its tracepoints, int64 ns, less the
+        calibrated probe cost if set (see set_probe_calibration)
+        """
+        if self.probe_calibration is None:
+            return new_set[last].ns - new_set[first].ns
+        ns = self.msg_sets_ns([new_set])[0]
+        return int(ns[last] - ns[first])
+
+    def msg_sets_ns(self, image_pipeline_msg_sets):
+        """
+        Timestamps of a list of target sets as an int64 array (sets x
+        tracepoints), less the calibrated probe cost accumulated up to each
+        tracepoint if set (see set_probe_calibration)
+        """
+        ns = ns_matrix(image_pipeline_msg_sets)
+        if self.probe_calibration is None:
+            return ns
+        probed = [not name.startswith(UNPROBED_PREFIXES) for name in self.target_chain]
+        costs = probe_costs_ns(image_pipeline_msg_sets, self.probe_calibration, probed)
+        return subtract_probe_costs(ns, costs, self.chain_parents())
+
+    def live_metrics(self, events, interval=5.0, window_ns=DEFAULT_ROLLING_WINDOW_NS, debug=False):
+        """
+        Forms sets of the target chain incrementally out of a live stream of
+        events, yielding rolling metrics every interval seconds (trace time)
+        and once more when the stream ends
+
+        Sets are told apart by header stamp (see msgsets_from_trace_identifier)
+        or by the order of events (see msgsets_from_trace), depending on
+        set_trace_sets_filter_type. Partial sets are evicted after
+        self.chain_eviction_window_ns and only the latest window_ns of sets
+        is kept (see RollingMetrics), so memory doesn't grow with the session.
+
+        Args:
+            events (iterable): compact events of the target and power chains,
+                ordered by timestamp (e.g. iter_live_events, TraceFollower.events
+                or replay_events)
+            interval (float, optional): seconds between metrics
+            window_ns (int, optional): window metrics are computed over
+            debug (bool, optional): print discarded events and lost chains
+
+        Returns:
+            generator of dicts, see RollingMetrics.snapshot
+        """
+        target_names = set(self.target_chain)
+        power_names = set(self.power_chain)
+        if getattr(self, "trace_sets_filter_type", "ID") == "ID":
+            assembler = self.chain_assembler(debug)
+            matcher = None
+        else:
+            assembler = None
+            matcher = ChainMatcher(
+                self.target_chain, "vpid", self.chain_max_inflight, self.chain_eviction_window_ns, debug)
+
+        indices = self.benchmark_indices()
+        first = max(indices[0] - 1, 0)
+        last = indices[-1]
+        interval_ns = int(interval * 1e9)
+        metrics = RollingMetrics(window_ns)
+        next_report = None
+
+        for event in events:
+            if event.name in target_names:
+                if assembler is not None:
+                    new_set = assembler.add(self.timestamp_identifier(event), event)
+                    assembler.evict(event.ns)
+                else:
+                    new_set = matcher.add(event)
+                if new_set is not None:
+                    sizes = [msg.msg_sizes for msg in new_set if msg.msg_sizes]
+                    metrics.add_set(new_set[-1].ns, self.set_latency_ns(new_set, first, last),
+                                    sum(sizes[-1]) if sizes else 0)
+            if event.name in power_names and event.power is not None:
+                metrics.add_power(event.ns, event.power)
+
+            metrics.advance(event.ns)
+            if next_report is None:
+                next_report = event.ns + interval_ns
+            elif event.ns >= next_report:
+                metrics.lost = (assembler or matcher).lost
+                yield metrics.snapshot()
+                next_report += ((event.ns - next_report) // interval_ns + 1) * interval_ns
+
+        (assembler or matcher).flush()
+        metrics.lost = (assembler or matcher).lost
+        self.lost_msgs += metrics.lost
+        self.dropped_msgs += (assembler or matcher).dropped
+        yield metrics.snapshot()
+
+    def analyze_live(self, tracepath=None, url=None, interval=5.0, window=10.0, idle_timeout=30.0):
+        """Analyze latency, throughput and power while the benchmark runs
+
+        Prints rolling metrics every interval seconds, following an LTTng live
+        session if url is given, the CTF trace being written at tracepath
+        otherwise (see TraceFollower).
+
+        Args:
+            tracepath (string, optional):
+                Path of the CTF tracefiles being written. Defaults to None.
+            url (string, optional):
+                lttng-live URL, e.g. net://localhost/host/<hostname>/<session>
+            interval (float, optional): seconds between metrics
+            window (float, optional): seconds metrics are computed over
+            idle_timeout (float, optional): stop following a trace after this
+                many seconds without changes
+
+        Returns:
+            dict: metrics of the last window, see RollingMetrics.snapshot
+        """
+        names = self.target_chain + self.power_chain
+        if url:
+            events = iter_live_events(url, names)
+        else:
+            if not tracepath:
+                tracepath = "/tmp/analysis/trace"
+            events = TraceFollower(tracepath, names, idle_timeout=idle_timeout).events()
+
+        metrics = None
+        for metrics in self.live_metrics(events, interval, int(window * 1e9)):
+            self.print_live_metrics(metrics)
+        return metrics
+
+    def msgsets_from_trace(self, tracename, debug=False, target=True):
+        """
+        Returns a list of message sets ready to be used
+        for plotting them in various forms.
+
+        NOTE: Matches sets by the order of events within each process
+        (see match_chains), several sets may be in flight at once (e.g.
+        multithreaded executors).
+        """
+        # Compact events of interest, decoded lazily while sets are formed
+        image_pipeline_msgs = self.trace_events(tracename, target)
+
+        if not target:
+            # NOTE: Modify this logic if more power traces are added in the future (currently there's only one)
+            return list(image_pipeline_msgs)
+
+        return self.match_chains(image_pipeline_msgs, "vpid", debug, target)
+
+    def barchart_data_power(self, image_pipeline_msg_sets):
+        """
+        Converts a tracing message list of the power chain into its
+        average power, in watts.
+
+        Samples are integrated over time (see power_summary), so each one
+        weighs as much as the time it spans.
+
+        Args:
+            image_pipeline_msg_sets ([type]): message sets of the power chain
+
+        Returns:
+            float: average power, in W
+        """
+        ns, watts = power_series(image_pipeline_msg_sets)
+        return power_summary(ns, watts)["mean"]
+
+    def power_summary(self, power_sets, target_sets=None):
+        """
+        Power and energy of a run over the window covered by its completed
+        target chains, see power_summary, along with the energy per frame
+        and energy-delay product of those chains (see energy_metrics)
+
+        :param: power_sets: message sets of the power chain
+        :param: target_sets: message sets of the target chain, None (or no
+        sets) to use the whole span of the power samples instead
+        """
+        ns, watts = power_series(power_sets)
+        summary = power_summary(ns, watts, sets_window(target_sets))
+        if target_sets:
+            latencies = self.sets_totals(self.barchart_data_latency_ns(target_sets), self.benchmark_indices())
+            summary["latency"] = float(ns_to_ms(np.mean(latencies)))
+            summary.update(energy_metrics(summary, len(target_sets), summary["latency"]))
+        return summary
+
+    def barchart_data_throughput(self, image_pipeline_msg_sets, option):
+        """
+        Converts a tracing message list into its corresponding
+        throughput lists, in MB/s and fps.
+        - 'potential': throughput each set would sustain if sets were
+        processed back to back, out of its latency (first to last
+        tracepoint) and the bytes of its output tracepoint (see size_index).
+        - 'real': rates over a sliding window (see set_throughput_window)
+        trailing each output of the chain, see windowed_rates.
+
+        Benchmarks tracing an update_rate report it as fps instead.
+
+        Args:
+            image_pipeline_msg_sets: list of message sets, or a single
+            message set
+            option (str): 'potential' or 'real'
+
+        Returns:
+            tuple: list of throughput in MB/s and list of throughput in fps
+        """
+        # if not multidimensional:
+        if type(image_pipeline_msg_sets[0]) != list:
+            image_pipeline_msg_sets = [image_pipeline_msg_sets]
+
+        # update rate of the output, if traced
+        update_rates = [msg_set[-1].update_rate for msg_set in image_pipeline_msg_sets]
+        use_size = all(update_rate is None for update_rate in update_rates)
+
+        if option == 'potential':
+            ns = self.msg_sets_ns(image_pipeline_msg_sets)
+            durations = ns[:, -1] - ns[:, 0]
+            valid = durations > 0  # sets whose tracepoints share a timestamp can't tell a rate
+            seconds = durations[valid] / NS_PER_S
+            index = size_index(image_pipeline_msg_sets)
+            if index is None:
+                sizes = np.zeros(len(seconds))
+            else:
+                sizes = np.array([sum(msg_set[index].msg_sizes) for msg_set in image_pipeline_msg_sets])[valid]
+            megabyps = sizes / seconds / 1e6
+            fps = (1.0 if index is not None else 0.0) / seconds
+
+        elif option == 'real':
+            output_ns, sizes = output_series(image_pipeline_msg_sets)
+            _, megabyps = windowed_rates(output_ns, sizes, self.throughput_window_ns)
+            _, fps = windowed_rates(output_ns, None, self.throughput_window_ns)
+            megabyps = megabyps / 1e6
+
+        else:
+            raise ValueError("Unknown throughput option: " + str(option))
+
+        if not use_size:
+            fps = np.array([update_rate or 0.0 for update_rate in update_rates])
+        return megabyps.tolist(), np.asarray(fps, dtype=np.float64).tolist()
+
+    def throughput_summary(self, image_pipeline_msg_sets=None):
+        """
+        Sustained, peak and minimum throughput of the outputs of the target
+        chain, in fps and MB/s, and their time series, see throughput_summary
+
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        output_ns, sizes = output_series(image_pipeline_msg_sets)
+        return throughput_summary(
+            output_ns, sizes, self.throughput_window_ns, self.throughput_time_constant_ns)
+
+    def barchart_data_latency_ns(self, image_pipeline_msg_sets):
+        """
+        Converts a tracing message list into its corresponding
+        relative (to the previous tracepoint) latencies, in int64
+        nanoseconds
+
+        Args:
+            image_pipeline_msg_sets: list of message sets, or a single
+            message set
+
+        Returns:
+            np.ndarray: int64 relative latencies, sets x tracepoints
+        """
+        # if multidimensional:list
+        if type(image_pipeline_msg_sets[0]) == list:
+            return relative_ns(self.msg_sets_ns(image_pipeline_msg_sets))
+        else:  # not multidimensional
+            return relative_ns(self.msg_sets_ns([image_pipeline_msg_sets]))
+
+    def barchart_data_latency(self, image_pipeline_msg_sets):
+        """
+        Converts a tracing message list into its corresponding
+        relative (to the previous tracepoint) latency list in
+        millisecond units.
+
+        NOTE: latencies are computed in nanoseconds (see
+        barchart_data_latency_ns) and only converted afterwards.
+
+        Args:
+            image_pipeline_msg_sets ([type]): [description]
+
+        Returns:
+            np.ndarray: relative latencies, in ms, sets x tracepoints
+        """
+        return ns_to_ms(self.barchart_data_latency_ns(image_pipeline_msg_sets))
+
+    def rms(self, list):
+        return np.sqrt(np.mean(np.array(list) ** 2))
+
+
+    def mean(self, list):
+        return np.mean(np.array(list))
+
+
+    def max(self, list):
+        return np.max(np.array(list))
+
+
+    def min(self, list):
+        return np.min(np.array(list))
+    
+    def median(self, list):
+        return np.median(np.array(list))
+
+
+    def sets_totals(self, image_pipeline_msg_sets, indices=None):
+        """
+        Per-set sums (in the units provided), vectorized
+
+        :param: image_pipeline_msg_sets, list of lists (or 2-D array), each containing the time traces
+        :param: indices, list of indices to consider on each set which will be summed.
+        By default, sum of all values on each set.
+        """
+        if indices:
+            return chain_totals(image_pipeline_msg_sets, [indices])[0]
+        else:
+            return chain_totals(image_pipeline_msg_sets)[0]
+
+    def rms_sets(self, image_pipeline_msg_sets, indices=None):
+        """
+        Root-Mean-Square (RMS) (in the units provided) for a
+        given number of time trace sets.
+
+        NOTE: last value of the lists should not include the total
+
+        :param: image_pipeline_msg_sets, list of lists, each containing the time traces
+        :param: indices, list of indices to consider on each set which will be summed
+        for rms. By default, sum of all values on each set.
+        """
+        return self.rms(self.sets_totals(image_pipeline_msg_sets, indices))
+
+    def mean_sets(self, image_pipeline_msg_sets, indices=None):
+        return self.mean(self.sets_totals(image_pipeline_msg_sets, indices))
+
+    def max_sets(self, image_pipeline_msg_sets, indices=None):
+        return self.max(self.sets_totals(image_pipeline_msg_sets, indices))
+
+    def min_sets(self, image_pipeline_msg_sets, indices=None):
+        return self.min(self.sets_totals(image_pipeline_msg_sets, indices))
+
+    def median_sets(self, image_pipeline_msg_sets, indices=None):
+        return self.median(self.sets_totals(image_pipeline_msg_sets, indices))
+
+
+    def lost_percentage(self, image_pipeline_msg_sets=None):
+        """
+        Messages lost, in % of the messages that entered the target chain
+        (completed and lost)
+
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        total = len(image_pipeline_msg_sets) + self.lost_msgs
+        return self.lost_msgs / total * 100 if total else 0.0
+
+    def hop_stages(self):
+        """
+        Stage (node or transport) of each hop of the target chain, see hop_stages
+        """
+        return hop_stages(self.target_chain, self.target_chain_dissambiguous)
+
+    def drop_funnel(self, image_pipeline_msg_sets=None):
+        """
+        Messages reaching and dropped at each stage of the target chain (see
+        drop_funnel), out of the last tracepoint each lost message reached
+
+        Chains shaped as graphs have no funnel, None: the last tracepoint a
+        lost message reached doesn't tell which branches it went through.
+
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if self.is_dag():
+            return None
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        return drop_funnel(self.dropped_msgs, len(image_pipeline_msg_sets), self.hop_stages())
+
+    def drop_rates(self, window=1.0, image_pipeline_msg_sets=None):
+        """
+        Drop rate of each stage of the target chain over time, see drop_rates,
+        None for chains shaped as graphs (see drop_funnel)
+
+        :param: window: seconds of each window
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if self.is_dag():
+            return None
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        completed_ns = [msg_set[0].ns for msg_set in image_pipeline_msg_sets]
+        return drop_rates(self.dropped_msgs, completed_ns, self.hop_stages(), int(window * 1e9))
+
+    def benchmark_indices(self):
+        """
+        Indices of the target chain delimiting the benchmark, from the
+        first to the last target
+        """
+        first_target = self.target_chain[0]
+        last_target = self.target_chain[-1]
+
+        indices = [i for i in range(
+                    self.target_chain_dissambiguous.index(first_target),
+                    1 + self.target_chain_dissambiguous.index(last_target),
+                    )
+                ]
+        return indices
+
+    def statistics_summary(self, image_pipeline_msg_sets_ms, percentiles=DEFAULT_PERCENTILES):
+        """
+        Statistics of a series of latency sets, computed in one vectorized pass
+
+        :param: image_pipeline_msg_sets_ms: list of lists (or 2-D array), chains x tracepoints
+        :param: percentiles: percentiles to compute, besides mean, rms, max, min and std
+        :returns: dict with "benchmark" and "total" entries, each a dict of
+        statistics (e.g. "mean", "rms", "max", "min", "std", "p50", "p99")
+        """
+        return chain_statistics(
+            image_pipeline_msg_sets_ms, self.benchmark_indices(), percentiles)
+
+    def statistics(self, image_pipeline_msg_sets_ms, verbose=False):
+
+        summary = self.statistics_summary(image_pipeline_msg_sets_ms)
+        benchmark = summary["benchmark"]
+        total = summary["total"]
+
+        mean_ = total["mean"]
+        rms_ = total["rms"]
+        min_ = total["min"]
+        max_ = total["max"]
+        #median_ = total["p50"]
+
+        mean_benchmark = benchmark["mean"]
+        rms_benchmark = benchmark["rms"]
+        max_benchmark = benchmark["max"]
+        min_benchmark = benchmark["min"]
+        #median_benchmark = benchmark["p50"]
+        
+        if verbose:
+            print(color("mean: " + str(mean_), fg="yellow"))
+            print("rms: " + str(rms_))
+            print("min: " + str(min_))
+            print(color("max: " + str(max_), fg="red"))
+            #print(color("median: " + str(max_), fg="yellow"))
+
+            print(color("mean benchmark: " + str(mean_benchmark), fg="yellow"))
+            print("rms benchmark: " + str(rms_benchmark))
+            print("min benchmark: " + str(min_benchmark))
+            print(color("max benchmark: " + str(max_benchmark), fg="red"))
+            #print(color("median benchmark: " + str(max_benchmark), fg="yellow"))
+
+        return [
+            mean_benchmark,
+            rms_benchmark,
+            max_benchmark,
+            min_benchmark,
+            #median_benchmark,
+            mean_,
+            rms_,
+            max_,
+            min_,
+            #median_,
+        ]
+    
+    def statistics_1d(self, image_pipeline_msg_sets_ms, verbose=False):
+
+        summary = describe(image_pipeline_msg_sets_ms, percentiles=None)
+        mean_benchmark = round(summary["mean"],2)
+        rms_benchmark = round(summary["rms"],2)
+        max_benchmark = round(summary["max"],2)
+        min_benchmark = round(summary["min"],2)
+        #median_benchmark = self.median(image_pipeline_msg_sets_ms)
+
+        if verbose:
+            print(color("mean benchmark: " + str(mean_benchmark), fg="yellow"))
+            print("rms benchmark: " + str(rms_benchmark))
+            print("min benchmark: " + str(min_benchmark))
+            print(color("max benchmark: " + str(max_benchmark), fg="red"))
+            #print(color("median benchmark: " + str(median_benchmark), fg="yellow"))
+
+        return [
+            mean_benchmark,
+            rms_benchmark,
+            max_benchmark,
+            min_benchmark,
+            #median_benchmark,
+            '-',
+            '-',
+            '-',
+            #'-',
+            '-'
+        ]
+
+
+    def run(self, cmd, shell=False, timeout=1):
+        """
+        Spawns a new processe launching cmd, connect to their input/output/error pipes, and obtain their return codes.
+        :param cmd: command split in the form of a list
+        :returns: stdout
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=shell)
+        try:
+            outs, errs = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            outs, errs = proc.communicate()
+
+        # decode, or None
+        if outs:
+            outs = outs.decode("utf-8").strip()
+        else:
+            outs = None
+
+        if errs:
+            errs = errs.decode("utf-8").strip()
+        else:
+            errs = None
+        return outs, errs
+
+    def get_target_chain_traces(self, trace_path):
+        if not trace_path:
+            trace_path = "/tmp/analysis/trace"
+
+        # sets are formed once per trace, e.g. when analyzing latency and throughput
+        key = (trace_path, self.hardware_device_type, getattr(self, "trace_sets_filter_type", None))
+        if key in self.target_chain_sets:
+            self.image_pipeline_msg_sets = self.target_chain_sets[key]
+            return
+
+        if self.hardware_device_type == "cpu" and self.trace_sets_filter_type == "name" and self.is_dag():
+            # the order of events of parallel branches isn't known beforehand
+            print(color("Target chain has several branches, filtering trace sets by ID", fg="yellow"))
+            self.image_pipeline_msg_sets \
+                = self.msgsets_from_trace_identifier(trace_path, debug=True)
+        elif self.hardware_device_type == "cpu" and self.trace_sets_filter_type == "name":
+            self.image_pipeline_msg_sets \
+                = self.msgsets_from_trace(trace_path, True)
+        elif self.hardware_device_type == "cpu" and self.trace_sets_filter_type == "ID":
+            self.image_pipeline_msg_sets \
+                = self.msgsets_from_trace_identifier(trace_path, debug=True)
+        elif self.hardware_device_type == "fpga":
+            # NOTE: can't use msgsets_from_trace_identifier because vtf traces
+            # won't have the unique identifier
+            self.image_pipeline_msg_sets = self.msgsets_from_ctf_vtf_traces(
+                trace_path + "/trace_cpu_ctf",
+                trace_path + "/trace_fpga_vtf_ctf_fix",
+                True)
+        self.target_chain_sets[key] = self.image_pipeline_msg_sets
+
+    def get_power_chain_traces(self, trace_path):
+        """
+        Reads the events of the power chain into self.power_msg_sets,
+        leaving the sets of the target chain untouched
+        """
+        if not trace_path:
+            trace_path = "/tmp/analysis/trace"
+
+        # NOTE: since power only has one trace, there's no real difference between the two methods
+        # The distinction is considered for consistency reasons with the 'get_target_chain_traces' method
+        if self.hardware_device_type == "cpu" and self.trace_sets_filter_type == "name":
+            self.power_msg_sets \
+                = self.msgsets_from_trace(trace_path, debug=True, target=False)
+        elif self.hardware_device_type == "cpu" and self.trace_sets_filter_type == "ID":
+            self.power_msg_sets \
+                = self.msgsets_from_trace_identifier(trace_path, debug=True, target=False)
+        elif self.hardware_device_type == "fpga":
+            # NOTE: can't use msgsets_from_trace_identifier because vtf traces
+            # won't have the unique identifier
+            self.power_msg_sets = self.msgsets_from_ctf_vtf_traces(
+                trace_path + "/trace_cpu_ctf",
+                trace_path + "/trace_fpga_vtf_ctf_fix",
+                True,
+                target=False)
+
+
+    def get_index_to_plot_latency(self):
+        """ Obtain the index to plot given a series of sets
+
+        # Implementation 1
+        Obtains the Panda DataFrame of the corresponding sets,
+        calculates the sum of latencies, obtains the max and 
+        fetches the index.
+
+        # Implemetation 2
+        Index at the middle of the sets
+        """
+
+        # Implementation 1
+        # figure out the index of the set with the max value (longest, latency-wise)
+        index_to_plot = int(np.argmax(self.sets_totals(self.image_pipeline_msg_sets_barchart_ns)))
+
+        # # Implementation 2
+        # index_to_plot = len(self.image_pipeline_msg_sets)//2
+        # if len(self.image_pipeline_msg_sets) < 1:
+        #     print(color("No msg sets found", fg="red"))
+        #     sys.exit(1)
+
+        return index_to_plot
+
+    def segments(self):
+        """
+        Segments of the target chain (callbacks, operations, kernels and the
+        transports between nodes), see chain_segments
+        """
+        parents = self.chain_parents() if self.is_dag() else None
+        return chain_segments(self.target_chain, self.target_chain_dissambiguous, parents)
+
+    def segment_breakdown(self, image_pipeline_msg_sets=None, percentiles=DEFAULT_PERCENTILES):
+        """
+        Latency distribution of each segment of the target chain, its share
+        of the end-to-end latency and how often it's critical, see segment_breakdown
+
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        return segment_breakdown(
+            self.msg_sets_ns(image_pipeline_msg_sets), self.segments(), percentiles, self.chain_parents())
+
+    def chain_parents(self):
+        """
+        Parents of each tracepoint of the target chain, as positions, see chain_parents
+        """
+        return chain_parents(self.target_chain_dissambiguous, self.target_chain_parents)
+
+    def is_dag(self):
+        """
+        Whether the target chain fans in or out, rather than being linear
+        """
+        return not is_linear(self.chain_parents())
+
+    def dag_breakdown(self, image_pipeline_msg_sets=None, percentiles=DEFAULT_PERCENTILES):
+        """
+        Latency of each branch of the target chain and synchronization wait
+        at each of its joins, see dag_breakdown
+
+        :param: image_pipeline_msg_sets: message sets, defaults to self.image_pipeline_msg_sets
+        """
+        if image_pipeline_msg_sets is None:
+            image_pipeline_msg_sets = self.image_pipeline_msg_sets
+        return dag_breakdown(
+            self.msg_sets_ns(image_pipeline_msg_sets), self.chain_parents(),
+            self.target_chain_dissambiguous, percentiles)
+
+    def bar_charts_latency(self):
+        # int64 ns for statistics, ms for plots
+        self.image_pipeline_msg_sets_barchart_ns = latency_array(
+            self.barchart_data_latency_ns(self.image_pipeline_msg_sets))
+        self.image_pipeline_msg_sets_barchart = ns_to_ms(self.image_pipeline_msg_sets_barchart_ns)
+        # latency_histogram accounts for these latencies if recorded while forming their sets
+        if self.latency_histogram_sets is self.image_pipeline_msg_sets:
+            self.latency_histogram_latencies = self.image_pipeline_msg_sets_barchart_ns
+        else:
+            self.latency_histogram_latencies = None
+
+
+    def analyze_latency(self, tracepath=None, add_power=False):
+        """Analyze latency of the image pipeline
+
+        Args:
+            tracepath (string, optional):
+                Path of the CTF tracefiles. Defaults to None.
+        """        
+
+        if add_power:
+            power_consumption = self.analyze_power(tracepath)
+        else:
+            power_consumption = None
+        
+        if not hasattr(self, 'trace_sets_filter_type'):
+            self.set_trace_sets_filter_type()
+
+        self.get_target_chain_traces(tracepath)        
+        self.bar_charts_latency()
+        self.index_to_plot = self.get_index_to_plot_latency()
+        self.print_timing_pipeline()
+        self.print_segment_breakdown()
+        self.print_dag_breakdown()
+        self.print_drop_funnel()
+        # self.draw_tracepoints()
+                    
+        self.print_markdown_table(
+            [self.image_pipeline_msg_sets_barchart_ns],
+            ["grey-boxed"],
+            from_baseline=False,
+            units='ms',
+            add_power=add_power,
+            power_consumption=power_consumption
+        )
+
+        if os.environ.get('TYPE') == "black":
+            result = self.results_json(metric=os.environ.get('METRIC'))
+            self.add_result(result)
+        else:
+            # default to grey-box benchmarking
+            self.plot_latency_results()
+            # self.upload_results()  # performed in CI/CD pipelines instead
+
+
+    def analyze_throughput(self, tracepath=None, add_power=False):
+        """Analyze throughput of the image pipeline
+
+        Args:
+            tracepath (string, optional):
+                Path of the CTF tracefiles. Defaults to None.
+        """
+        if add_power:
+            power_consumption = self.analyze_power(tracepath)
+        else:
+            power_consumption = None
+
+        if not hasattr(self, 'trace_sets_filter_type'):
+            self.set_trace_sets_filter_type()
+        
+        self.get_target_chain_traces(tracepath)        
+        barcharts_through_megabys_pot, barcharts_through_fps_pot = self.barchart_data_throughput(self.image_pipeline_msg_sets, 'potential')
+        
+
+        self.print_markdown_table_1d(
+            [barcharts_through_megabys_pot],
+            ["RobotPerf potential throughput"],
+            from_baseline=False,
+            units='MB/s',
+            add_power=add_power,
+            power_consumption=power_consumption
+        )
+
+        self.print_markdown_table_1d(
+            [barcharts_through_fps_pot],
+            ["RobotPerf potential throughput"],
+            from_baseline=False,
+            units='fps',
+            add_power=add_power,
+            power_consumption=power_consumption
+        )
+        
+        barcharts_through_megabys_real, barcharts_through_fps_real = self.barchart_data_throughput(self.image_pipeline_msg_sets, 'real')
+        if not barcharts_through_fps_real:
+            print(color("Outputs of the target chain span no time, skipping real throughput", fg="red"))
+            return
+        self.print_throughput_summary()
+        
+        self.print_markdown_table_1d(
+            [barcharts_through_megabys_real],
+            ["RobotPerf real throughput"],
+            from_baseline=False,
+            units='MB/s',
+            add_power=add_power,
+            power_consumption=power_consumption
+        )
+
+
+        self.print_markdown_table_1d(
+            [barcharts_through_fps_real],
+            ["RobotPerf real throughput"],
+            from_baseline=False,
+            units='fps',
+            add_power=add_power,
+            power_consumption=power_consumption
+        )
+
+        if os.environ.get('TYPE') == "black":
+            result = self.results_json(metric=os.environ.get('METRIC'))
+            self.add_result(result)
+        else:
+            # default to grey-box benchmarking
+            metric_unit = os.environ.get('METRIC_UNIT')
+            if metric_unit == "fps":
+                result = self.results_1d(barcharts_through_fps_real)
+                self.add_result(result)
+            elif metric_unit == "MB/s":
+                result = self.results_1d(barcharts_through_megabys_real)
+                self.add_result(result)
+
+
+    def analyze_power(self, tracepath=None):
+        """Analyze power of the image pipeline
+
+        Args:
+            tracepath (string, optional):
+                Path of the CTF tracefiles. Defaults to None.
+
+        Returns:
+            float: average power, in W, None if the trace has no power samples
+        """
+        if os.environ.get('TYPE') == "black":
+            result = self.results_json(metric=os.environ.get('METRIC'))
+            self.add_result(result)
+            return result["value"]
+        else:
+            # default to grey-box benchmarking
+            if not hasattr(self, 'trace_sets_filter_type'):
+                self.set_trace_sets_filter_type()
+
+            # completed target chains delimit the window power is integrated over
+            self.get_target_chain_traces(tracepath)
+            self.get_power_chain_traces(tracepath)
+            if not len(power_series(self.power_msg_sets)[0]):
+                print(color("No power samples in the trace, skipping power and energy results", fg="red"))
+                return None
+            summary = self.power_summary(self.power_msg_sets, self.image_pipeline_msg_sets)
+            self.print_power_summary(summary)
+            total_watts = summary["mean"]
+
+            # add results to yaml
+            result = {
+                    "hardware": os.environ.get('HARDWARE'),
+                    "category": os.environ.get('CATEGORY'),
+                    "metric": os.environ.get('METRIC'),
+                    "metric_unit": os.environ.get('METRIC_UNIT'),
+                    "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                    "value": float(total_watts),
+                    "datasource": os.environ.get('ROSBAG'),
+                    "type": os.environ.get('TYPE'),
+                    "note": "peak {:.2f} W, {:.2f} J over {:.2f} s".format(
+                        summary["peak"], summary["joules"], summary["seconds"]),
+                    "energy": {
+                        key: round(float(summary[key]), 6)
+                        for key in ("joules", "seconds", "peak", "joules_per_frame", "edp")
+                        if key in summary
+                    },
+            }
+            self.add_result(result)
+            return total_watts
+
+    def set_trace_sets_filter_type(self, filter_type="ID"):
+        """
+        Select weather trace sets will be filtered using msgsets_from_trace_identifier or msgsets_from_trace method
+
+        :param: filter_type: string defining which method to use
+        """
+
+        if self.hardware_device_type == "fpga":
+            print("FPGA trace sets can only be filtered by name because vtf traces won't have a unique identifier")
+            # No need to set the analysis_type property since it is not evaluated down the road with FPGA hardware
+            return
+
+        if filter_type == "name" or filter_type == "ID":
+            print("Setting {} method for filtering trace sets".format(filter_type))
+            self.trace_sets_filter_type = filter_type
+        else:
+            print("Type {} for filtering trace sets does not exist, setting message ID analysis type".format(filter_type))
+            self.trace_sets_filter_type = "ID"
+
+    def set_chain_eviction_window(self, seconds):
+        """
+        Select after how long (trace time) a partially propagated message is
+        considered lost while filtering trace sets by ID
+
+        :param: seconds: eviction window, None to keep partial sets until the end of the trace
+        """
+        if seconds is None:
+            self.chain_eviction_window_ns = None
+        else:
+            self.chain_eviction_window_ns = int(seconds * 1e9)
+
+    def set_chain_max_inflight(self, count):
+        """
+        Select how many partially propagated messages of a process are
+        matched at once while filtering trace sets by name, the oldest one
+        being considered lost when exceeded (see ChainMatcher)
+
+        :param: count: partial sets per process, at least the number of
+        threads of the executor running the chain
+        """
+        self.chain_max_inflight = int(count)
+
+    def set_probe_calibration(self, calibration=DEFAULT_PROBE_CALIBRATION):
+        """
+        Subtract the cost of the instrumentation (tracepoint calls and
+        message size computations) from latencies, as calibrated on the
+        host by the probe_calibration executable of a1_perception_2nodes
+
+        NOTE: call it before forming the sets of a trace, the latency
+        histogram is recorded as sets are formed.
+
+        :param: calibration: path of the YAML file written by
+        probe_calibration, its contents as a dict, or None to stop
+        subtracting probe costs
+        """
+        if calibration is None:
+            self.probe_calibration = None
+            return
+        self.probe_calibration = load_probe_calibration(calibration)
+        print("Subtracting probe costs: {:.0f} ns per tracepoint, {:.0f} ns + {:.3f} ns/byte per message size".format(
+            self.probe_calibration["tracepoint_ns"], self.probe_calibration["fixed_ns"],
+            self.probe_calibration["per_byte_ns"]))
+
+    def set_throughput_window(self, seconds=1.0, time_constant=None):
+        """
+        Select the windows real throughput is measured over
+
+        :param: seconds: length of the sliding window of real throughput
+        :param: time_constant: time constant of the exponentially decayed
+        rates (seconds), same as the window if None
+        """
+        self.throughput_window_ns = int(seconds * 1e9)
+        if time_constant is None:
+            time_constant = seconds
+        self.throughput_time_constant_ns = int(time_constant * 1e9)
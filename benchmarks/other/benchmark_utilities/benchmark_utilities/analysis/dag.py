@@ -0,0 +1,186 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Chains shaped as directed acyclic graphs of tracepoints, for pipelines
+# that fan in (e.g. left and right images joined into a disparity map) or
+# fan out. Tracepoints are still listed in a flat chain, in topological
+# order, each naming its parents:
+#
+#   - name: robotperf_benchmarks:robotperf_image_output_cb_init
+#     name_disambiguous: robotperf_benchmarks:robotperf_image_output_cb_init
+#     parents:
+#     - robotperf_benchmarks:robotperf_image_input_cb_fini
+#     - robotperf_benchmarks:robotperf_image_input_cb_fini (2)
+#
+# Tracepoints without "parents" follow the previous one (linear chains),
+# an empty list makes them a source. Instances of the graph are joined
+# on the header stamp of their messages (see ChainAssembler).
+
+import numpy as np
+
+from benchmark_utilities.analysis.segments import segment_label
+from benchmark_utilities.analysis.statistics import DEFAULT_PERCENTILES, describe, ns_to_ms
+
+
+def chain_parents(labels, parents=None):
+    """
+    Parents of each tracepoint of a chain, as positions
+
+    :param: labels: disambiguated names of the tracepoints, in topological order
+    :param: parents: per tracepoint, list of the labels of its parents, or
+    None for the previous tracepoint, None for a linear chain
+    :returns: list of tuples of positions, one per tracepoint
+    """
+    if parents is None:
+        parents = [None] * len(labels)
+    if len(parents) != len(labels):
+        raise ValueError("Expected parents for each of the " + str(len(labels)) + " tracepoints")
+
+    positions = []
+    for position, (label, names) in enumerate(zip(labels, parents)):
+        if names is None:
+            positions.append((position - 1,) if position else ())
+            continue
+        resolved = []
+        for name in names:
+            if name not in labels[:position]:
+                raise ValueError(
+                    "Parent " + str(name) + " of " + str(label) + " isn't a previous tracepoint of the chain")
+            resolved.append(labels.index(name))
+        positions.append(tuple(resolved))
+    return positions
+
+
+def is_linear(parents):
+    """
+    Whether each tracepoint follows the previous one
+    """
+    return all(tuple(parent) == ((position - 1,) if position else ())
+               for position, parent in enumerate(parents))
+
+
+def chain_children(parents):
+    """
+    Children of each tracepoint, as positions
+    """
+    children = [[] for _ in parents]
+    for position, parent in enumerate(parents):
+        for index in parent:
+            children[index].append(position)
+    return children
+
+
+def chain_branches(parents):
+    """
+    Splits a chain into branches, paths of tracepoints each one following
+    the previous one alone
+
+    A branch starts at a source, a join (several parents) or a child of a
+    fork (several children), and ends before the next one.
+
+    :param: parents: parents of each tracepoint, see chain_parents
+    :returns: list of lists of positions, ordered by their first position
+    """
+    children = chain_children(parents)
+    branches = []
+    branch_of = {}
+    for position, parent in enumerate(parents):
+        if len(parent) == 1 and len(children[parent[0]]) == 1:
+            index = branch_of[parent[0]]
+            branches[index].append(position)
+        else:
+            index = len(branches)
+            branches.append([position])
+        branch_of[position] = index
+    return branches
+
+
+def chain_joins(parents):
+    """
+    Tracepoints waiting for several parents, as (position, parents)
+    """
+    return [(position, parent) for position, parent in enumerate(parents) if len(parent) > 1]
+
+
+def critical_mask(ns, parents, sink=None):
+    """
+    Tracepoints on the critical path of each instance: walking back from
+    the sink, the parent traced last at each join
+
+    :param: ns: int64 timestamps, instances x tracepoints (see ns_matrix)
+    :param: parents: parents of each tracepoint, see chain_parents
+    :param: sink: position the path ends at, the last tracepoint by default
+    :returns: boolean array, instances x tracepoints
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    mask = np.zeros(ns.shape, dtype=bool)
+    if not ns.size:
+        return mask
+    sink = ns.shape[1] - 1 if sink is None else sink
+    mask[:, sink] = True
+    rows = np.arange(len(ns))
+    # parents precede their children, a single pass backwards visits the whole path
+    for position in range(sink, -1, -1):
+        parent = parents[position]
+        if not parent:
+            continue
+        on_path = mask[:, position]
+        latest = np.asarray(parent)[np.argmax(ns[:, list(parent)], axis=1)]
+        mask[rows[on_path], latest[on_path]] = True
+    return mask
+
+
+def dag_breakdown(ns, parents, labels, percentiles=DEFAULT_PERCENTILES):
+    """
+    Latency of each branch of a DAG chain and synchronization wait at each
+    of its joins
+
+    The wait of a join is the time its first parent waited for the last
+    one, from the earliest to the latest parent timestamp of each instance.
+
+    :param: ns: int64 timestamps, instances x tracepoints (see ns_matrix)
+    :param: parents: parents of each tracepoint, see chain_parents
+    :param: labels: disambiguated names of the tracepoints
+    :param: percentiles: percentiles to compute
+    :returns: dict with "branches", a list of dicts (one per branch) with
+    "name", "positions", the statistics of its latency in ms (see describe)
+    and "critical" (fraction of instances it's in the critical path of),
+    "joins", a list of dicts with "name", "position", "inputs" (names of
+    the branches joined), the statistics of the wait in ms and "last"
+    (fraction of instances each input arrived last, by input), and
+    "end_to_end", the statistics of the latency from the earliest source
+    to the last tracepoint
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    branches = chain_branches(parents)
+    branch_names = [segment_label(labels[branch[0]]) for branch in branches]
+    branch_of = {position: index for index, branch in enumerate(branches) for position in branch}
+    if not len(ns):
+        return {"branches": [], "joins": [], "end_to_end": {}}
+
+    def statistics(durations_ns):
+        return describe(ns_to_ms(durations_ns), percentiles)
+
+    critical = critical_mask(ns, parents)
+    breakdown = {"branches": [], "joins": []}
+    for name, branch in zip(branch_names, branches):
+        entry = {"name": name, "positions": branch}
+        entry.update(statistics(ns[:, branch[-1]] - ns[:, branch[0]]))
+        entry["critical"] = float(np.mean(critical[:, branch[-1]]))
+        breakdown["branches"].append(entry)
+
+    for position, parent in chain_joins(parents):
+        arrivals = ns[:, list(parent)]
+        inputs = [branch_names[branch_of[index]] for index in parent]
+        last = np.argmax(arrivals, axis=1)
+        entry = {"name": segment_label(labels[position]), "position": position, "inputs": inputs}
+        entry.update(statistics(arrivals.max(axis=1) - arrivals.min(axis=1)))
+        entry["last"] = {name: float(np.mean(last == index)) for index, name in enumerate(inputs)}
+        breakdown["joins"].append(entry)
+
+    sources = [position for position, parent in enumerate(parents) if not parent]
+    breakdown["end_to_end"] = statistics(ns[:, -1] - ns[:, sources].min(axis=1))
+    return breakdown
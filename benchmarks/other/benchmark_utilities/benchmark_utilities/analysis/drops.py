@@ -0,0 +1,92 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import numpy as np
+
+from benchmark_utilities.analysis.throughput import NS_PER_S
+
+
+def dropped_hops(dropped, hops):
+    """
+    Hop each dropped chain was lost at, the one leaving the last tracepoint
+    it reached
+
+    :param: dropped: list of (first ns, last position reached), see
+    ChainAssembler.dropped and ChainMatcher.dropped
+    :param: hops: number of hops of the chain (len(chain) - 1)
+    :returns: (int64 first ns, int64 hop) arrays
+    """
+    dropped = np.array(dropped, dtype=np.int64).reshape(-1, 2)
+    # chains missing a tracepoint but the last one (e.g. an event not traced) count in the last hop
+    return dropped[:, 0], np.clip(dropped[:, 1], 0, max(hops - 1, 0))
+
+
+def drop_funnel(dropped, completed, stages):
+    """
+    How many chains reached each stage and how many were dropped within it
+
+    :param: dropped: list of (first ns, last position reached) of the chains lost
+    :param: completed: number of chains completed
+    :param: stages: stage of each hop, see hop_stages
+    :returns: list of dicts, one per stage in chain order, with "stage",
+    "reached" (chains entering it), "dropped" and "rate" (dropped / reached)
+    """
+    if not stages:
+        return []
+    _, hops = dropped_hops(dropped, len(stages))
+    per_hop = np.bincount(hops, minlength=len(stages))
+    # chains reaching each hop: completed ones and those dropped at it or later
+    reached = completed + np.cumsum(per_hop[::-1])[::-1]
+
+    funnel = []
+    for hop, stage in enumerate(stages):
+        if funnel and funnel[-1]["stage"] == stage:
+            funnel[-1]["dropped"] += int(per_hop[hop])
+            continue
+        funnel.append({"stage": stage, "reached": int(reached[hop]), "dropped": int(per_hop[hop])})
+    for entry in funnel:
+        entry["rate"] = entry["dropped"] / entry["reached"] if entry["reached"] else 0.0
+    return funnel
+
+
+def drop_rates(dropped, completed_ns, stages, window_ns=NS_PER_S):
+    """
+    Drop rate of each stage over time, in windows of window_ns
+
+    Chains are binned by their first event, so the rate of each window is
+    the fraction of the chains started within it that each stage dropped.
+
+    :param: dropped: list of (first ns, last position reached) of the chains lost
+    :param: completed_ns: timestamps of the first event of the completed chains
+    :param: stages: stage of each hop, see hop_stages
+    :param: window_ns: length of the windows
+    :returns: dict with "stages" (names, in chain order), "time" (s of the
+    start of each window since the first chain), "started" (chains started
+    per window), "dropped" and "rate" (windows x stages)
+    """
+    names = list(dict.fromkeys(stages))
+    stage_of_hop = np.array([names.index(stage) for stage in stages], dtype=np.int64)
+    dropped_ns, hops = dropped_hops(dropped, len(stages))
+    completed_ns = np.asarray(completed_ns, dtype=np.int64)
+
+    all_ns = np.concatenate((dropped_ns, completed_ns))
+    if not len(all_ns) or not names:
+        empty = np.zeros((0, len(names)))
+        return {"stages": names, "time": np.zeros(0), "started": np.zeros(0, dtype=np.int64),
+                "dropped": empty.astype(np.int64), "rate": empty}
+    origin = all_ns.min()
+    windows = int((all_ns.max() - origin) // window_ns) + 1
+
+    started = np.bincount((all_ns - origin) // window_ns, minlength=windows)
+    counts = np.zeros((windows, len(names)), dtype=np.int64)
+    np.add.at(counts, ((dropped_ns - origin) // window_ns, stage_of_hop[hops]), 1)
+    return {
+        "stages": names,
+        "time": np.arange(windows) * (window_ns / NS_PER_S),
+        "started": started,
+        "dropped": counts,
+        "rate": counts / np.maximum(started, 1)[:, None],
+    }
@@ -0,0 +1,195 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import heapq
+from operator import attrgetter
+
+
+class TraceEvent:
+    """
+    Compact view of a single trace event.
+
+    Only the fields used while matching and analyzing chains are kept
+    (name, timestamp, context ids, header stamp, sizes, update rate and
+    power), so the underlying bt2 message can be released right after
+    decoding it.
+
+    NOTE: mimics the subset of the bt2 message API used by the analysis
+    (msg.event.name, msg.event.payload_field,
+    msg.event.common_context_field and
+    msg.default_clock_snapshot.ns_from_origin) so that events can be
+    used wherever bt2 messages were used before.
+    """
+
+    __slots__ = (
+        "name",
+        "ns",
+        "vpid",
+        "vtid",
+        "header_sec",
+        "header_nsec",
+        "msg_sizes",
+        "update_rate",
+        "power",
+    )
+
+    def __init__(
+        self,
+        name,
+        ns,
+        vpid=None,
+        vtid=None,
+        header_sec=None,
+        header_nsec=None,
+        msg_sizes=(),
+        update_rate=None,
+        power=None,
+    ):
+        self.name = name
+        self.ns = ns
+        self.vpid = vpid
+        self.vtid = vtid
+        self.header_sec = header_sec
+        self.header_nsec = header_nsec
+        self.msg_sizes = msg_sizes
+        self.update_rate = update_rate
+        self.power = power
+
+    @classmethod
+    def from_bt2(cls, name, msg):
+        """
+        Builds a compact event out of a bt2 event message
+
+        :param: name: event name, shared between events of the same kind
+        :param: msg: bt2._EventMessageConst
+        """
+        event = msg.event
+        header_sec = None
+        header_nsec = None
+        msg_sizes = []
+        update_rate = None
+        power = None
+        for field_name, field_value in event.payload_field.items():
+            if "header_nsec" in field_name:
+                header_nsec = int(field_value)
+            elif "header_sec" in field_name:
+                header_sec = int(field_value)
+            elif "msg_size" in field_name:
+                msg_sizes.append(int(field_value))
+            elif "update_rate" in field_name:
+                update_rate = float(field_value)
+            elif "msg_power" in field_name:
+                power = float(field_value)
+
+        # VTF (FPGA) events carry no common context
+        vpid = None
+        vtid = None
+        context = event.common_context_field
+        if context is not None:
+            if "vpid" in context:
+                vpid = int(context["vpid"])
+            if "vtid" in context:
+                vtid = int(context["vtid"])
+
+        return cls(
+            name,
+            msg.default_clock_snapshot.ns_from_origin,
+            vpid,
+            vtid,
+            header_sec,
+            header_nsec,
+            tuple(msg_sizes),
+            update_rate,
+            power,
+        )
+
+    # bt2 message compatibility
+    @property
+    def event(self):
+        return self
+
+    @property
+    def default_clock_snapshot(self):
+        return self
+
+    @property
+    def ns_from_origin(self):
+        return self.ns
+
+    @property
+    def common_context_field(self):
+        return {"vpid": self.vpid, "vtid": self.vtid}
+
+    @property
+    def payload_field(self):
+        fields = {}
+        if self.header_sec is not None:
+            fields["header_sec"] = self.header_sec
+        if self.header_nsec is not None:
+            fields["header_nsec"] = self.header_nsec
+        for index, size in enumerate(self.msg_sizes):
+            fields["msg_size_" + str(index)] = size
+        if self.update_rate is not None:
+            fields["update_rate"] = self.update_rate
+        if self.power is not None:
+            fields["msg_power"] = self.power
+        return fields
+
+    def __repr__(self):
+        return "TraceEvent({}, {})".format(self.name, self.ns)
+
+
+def iter_trace_events(tracename, names, begin_s=None):
+    """
+    Lazily decodes a CTF trace, yielding compact events for the given names
+
+    Events are produced one at a time, in trace order, so callers can match
+    chains as the trace is decoded instead of materializing every bt2
+    message first.
+
+    :param: tracename: path to the CTF trace
+    :param: names: iterable of event names of interest (e.g. the target_chain)
+    :param: begin_s: skip the events before this time (seconds from origin),
+    the packets before it are sought past without decoding them
+    """
+    import bt2  # imported here, decoding is the only user of babeltrace2
+
+    msg_it = bt2.TraceCollectionMessageIterator(tracename, begin=begin_s)
+    yield from iter_message_events(msg_it, names)
+
+
+def iter_message_events(msg_it, names):
+    """
+    Yields compact events for the given names out of a bt2 message iterator
+
+    :param: msg_it: bt2.TraceCollectionMessageIterator (CTF trace, lttng-live session, ...)
+    :param: names: iterable of event names of interest
+    """
+    import bt2
+
+    # map each name to a single str instance, shared by all events
+    shared_names = {name: name for name in names}
+
+    for msg in msg_it:
+        # `bt2._EventMessageConst` is the Python type of an event message.
+        if type(msg) is bt2._EventMessageConst:
+            name = shared_names.get(msg.event.name)
+            if name is not None:
+                yield TraceEvent.from_bt2(name, msg)
+
+
+def merge_events(*streams):
+    """
+    Lazily merges several time-ordered streams of events (e.g. the CPU CTF
+    and FPGA VTF traces) into a single time-ordered stream
+
+    Only the head of each stream is held at a time, in a heap, so merging n
+    events out of k streams takes O(n log k) time and O(k) memory. Events
+    with equal timestamps keep the order of the streams.
+
+    :param: streams: iterables of events, each ordered by timestamp
+    """
+    return heapq.merge(*streams, key=attrgetter("ns"))
@@ -0,0 +1,173 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import math
+import numpy as np
+
+from benchmark_utilities.analysis.statistics import percentile_label
+
+# percentiles reported out of histograms, tail latency first
+HISTOGRAM_PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram with logarithmic buckets.
+
+    Each bucket spans a constant relative range (precision) of values, so
+    percentiles are reported within that relative error regardless of the
+    magnitude of the values, with a small and bounded number of buckets
+    (e.g. ~700 buckets for 1 % precision between 1 us and 1000 s).
+    Buckets are sparse, exact count, min, max and sums are kept on the side.
+
+    Histograms built with the same precision and lowest value can be
+    merged (e.g. results of several runs) and serialized (see to_dict)
+    without keeping the samples they were built from.
+    """
+
+    def __init__(self, precision=0.01, lowest=0.001):
+        """
+        :param: precision: relative width of each bucket (e.g. 0.01 for 1 %)
+        :param: lowest: lowest value discerned, smaller values fall in the first bucket
+        """
+        self.precision = precision
+        self.lowest = lowest
+        self.log_base = math.log1p(precision)
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.sum_squares = 0.0
+
+    def bucket(self, value):
+        """
+        Index of the bucket of a value
+        """
+        if value <= self.lowest:
+            return 0
+        return int(math.log(value / self.lowest) / self.log_base)
+
+    def bucket_upper(self, index):
+        """
+        Highest value of a bucket
+        """
+        return self.lowest * math.exp((index + 1) * self.log_base)
+
+    def record(self, value, count=1):
+        """
+        Records a value, count times
+        """
+        index = self.bucket(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sum += value * count
+        self.sum_squares += value * value * count
+
+    def record_values(self, values):
+        """
+        Records an array of values at once
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        indices = np.zeros(len(values), dtype=np.int64)
+        above = values > self.lowest
+        indices[above] = (np.log(values[above] / self.lowest) / self.log_base).astype(np.int64)
+        for index, count in zip(*np.unique(indices, return_counts=True)):
+            self.buckets[int(index)] = self.buckets.get(int(index), 0) + int(count)
+        self.count += len(values)
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+        self.sum += float(np.sum(values))
+        self.sum_squares += float(np.sum(np.square(values)))
+
+    def merge(self, other):
+        """
+        Adds the values of another histogram to this one
+        """
+        if (other.precision, other.lowest) != (self.precision, self.lowest):
+            raise ValueError(
+                "can't merge histograms of different precision/lowest value: {} vs {}".format(
+                    (self.precision, self.lowest), (other.precision, other.lowest)))
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        return self
+
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def std(self):
+        if not self.count:
+            return math.nan
+        mean = self.mean()
+        return math.sqrt(max(self.sum_squares / self.count - mean * mean, 0.0))
+
+    def percentile(self, percentile):
+        """
+        Value below which percentile % of the recorded values fall, within
+        the precision of the histogram
+
+        :param: percentile: 0-100
+        """
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(percentile / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self.bucket_upper(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles=HISTOGRAM_PERCENTILES):
+        """
+        Returns a dict of percentiles, e.g. {"p50": ..., "p99.9": ...}
+        """
+        return {percentile_label(p): self.percentile(p) for p in percentiles}
+
+    def jitter(self):
+        """
+        Spread of the tail with respect to the typical value (p99 - p50)
+        """
+        return self.percentile(99) - self.percentile(50)
+
+    def to_dict(self):
+        """
+        Plain representation of the histogram, e.g. to store it in benchmark.yaml
+        """
+        return {
+            "precision": self.precision,
+            "lowest": self.lowest,
+            "count": self.count,
+            "min": float(self.min) if self.count else None,
+            "max": float(self.max) if self.count else None,
+            "sum": float(self.sum),
+            "sum_squares": float(self.sum_squares),
+            "buckets": {index: self.buckets[index] for index in sorted(self.buckets)},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a histogram out of its to_dict representation
+        """
+        histogram = cls(data["precision"], data["lowest"])
+        histogram.buckets = {int(index): int(count) for index, count in data["buckets"].items()}
+        histogram.count = int(data["count"])
+        if histogram.count:
+            histogram.min = float(data["min"])
+            histogram.max = float(data["max"])
+        histogram.sum = float(data["sum"])
+        histogram.sum_squares = float(data["sum_squares"])
+        return histogram
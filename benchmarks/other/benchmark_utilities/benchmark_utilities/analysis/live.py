@@ -0,0 +1,285 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import os
+import time
+from collections import deque
+import numpy as np
+from wasabi import color
+
+from benchmark_utilities.analysis.cache import trace_fingerprint
+from benchmark_utilities.analysis.events import iter_message_events, iter_trace_events
+from benchmark_utilities.analysis.histogram import LatencyHistogram
+from benchmark_utilities.analysis.parallel import stream_trace, trace_stream_files
+from benchmark_utilities.analysis.statistics import DEFAULT_PERCENTILES, describe, ns_to_ms
+from benchmark_utilities.analysis.throughput import NS_PER_S
+
+# metrics of live analyses are computed over this window, trailing the latest event
+DEFAULT_ROLLING_WINDOW_NS = 10 * NS_PER_S
+
+# events held back while following a trace, LTTng flushes the stream of each CPU on its own
+DEFAULT_LATENESS_NS = 2 * NS_PER_S
+
+# streams are sought this much before the latest event decoded out of them
+SEEK_MARGIN_NS = 1000
+
+
+def iter_live_events(url, names, retry_interval=0.1):
+    """
+    Yields compact events of an LTTng live session as they are traced
+
+    :param: url: lttng-live URL, e.g. net://localhost/host/<hostname>/<session>
+    :param: names: iterable of event names of interest (e.g. the target_chain)
+    :param: retry_interval: seconds to wait when the relay daemon has no data yet
+    """
+    import bt2  # imported here, decoding is the only user of babeltrace2
+
+    spec = bt2.ComponentSpec.from_named_plugin_and_component_class(
+        "ctf", "lttng-live", {"inputs": [url], "session-not-found-action": "continue"})
+    msg_it = bt2.TraceCollectionMessageIterator(spec)
+    while True:
+        try:
+            yield from iter_message_events(msg_it, names)
+            return
+        except bt2.TryAgain:
+            time.sleep(retry_interval)
+
+
+def replay_events(events, speed=1.0, clock=time.monotonic, sleep=time.sleep):
+    """
+    Yields recorded events paced as a live session would deliver them,
+    e.g. to exercise live analyses with a trace on disk
+
+    :param: events: iterable of events, ordered by timestamp
+    :param: speed: replay speed (2.0 twice as fast), 0 for no pacing
+    :param: clock: monotonic clock, in seconds
+    :param: sleep: function sleeping for a number of seconds
+    """
+    start = None
+    for event in events:
+        if speed:
+            if start is None:
+                start = (clock(), event.ns)
+            delay = start[0] + (event.ns - start[1]) / NS_PER_S / speed - clock()
+            if delay > 0:
+                sleep(delay)
+        yield event
+
+
+def iter_stream_events(trace_dir, stream_file, names, begin_ns=None):
+    """
+    Decodes the events of a single stream file of a trace, see stream_trace
+
+    :param: trace_dir: directory of the CTF trace holding the stream
+    :param: stream_file: name of the stream file
+    :param: names: iterable of event names of interest
+    :param: begin_ns: skip (most of) the events before this time, from origin
+    """
+    # seconds as float lose precision, begin a bit earlier and filter here
+    begin_s = None if begin_ns is None else max(0, begin_ns - SEEK_MARGIN_NS) / NS_PER_S
+    with stream_trace(trace_dir, stream_file) as tracename:
+        for event in iter_trace_events(tracename, names, begin_s):
+            if begin_ns is None or event.ns >= begin_ns:
+                yield event
+
+
+class TraceFollower:
+    """
+    Follows a CTF trace while it's being written, by polling its stream files
+
+    Each poll decodes the stream files (one per channel and CPU) that grew
+    since the last one, each from the latest event decoded out of it on, so
+    the packets already decoded are sought past rather than decoded again.
+    New events are yielded in time order, except for the ones within
+    lateness_ns of the latest event, held back until a later poll since the
+    stream of each CPU is flushed independently. Events showing up older
+    than those already yielded are counted in self.late and skipped.
+    """
+
+    def __init__(self, tracename, names, interval=1.0, lateness_ns=DEFAULT_LATENESS_NS,
+                 idle_timeout=30.0, decode=iter_stream_events, sleep=time.sleep, debug=False):
+        """
+        :param: tracename: path to the CTF trace being written
+        :param: names: event names of interest (e.g. target_chain + power_chain)
+        :param: interval: seconds between polls
+        :param: lateness_ns: events within this time of the latest one are held back
+        :param: idle_timeout: stop following after this many seconds without
+        changes in the trace, None to follow until finished() (see events)
+        :param: decode: function yielding the events of a stream file from a
+        time on, see iter_stream_events
+        :param: sleep: function sleeping for a number of seconds
+        :param: debug: print decoding errors of partially written traces
+        """
+        self.tracename = tracename
+        self.names = list(names)
+        self.interval = interval
+        self.lateness_ns = lateness_ns
+        self.idle_timeout = idle_timeout
+        self.decode = decode
+        self.sleep = sleep
+        self.debug = debug
+
+        # per stream file: size when last decoded, timestamp of the latest
+        # event decoded and how many were decoded with that timestamp
+        self.streams = {}
+        self.pending = []  # events decoded and held back, see release
+        self.emitted_ns = None  # timestamp of the latest event yielded
+        self.yielded = 0
+        self.decoded = 0
+        self.late = 0  # events skipped, older than those already yielded
+        self.polls = 0
+
+    def poll(self, final=False):
+        """
+        Decodes the events not decoded yet, and returns them along with
+        those held back, ordered by timestamp
+
+        :param: final: decode every stream, grown or not
+        """
+        self.polls += 1
+        for trace_dir, stream_file in trace_stream_files(self.tracename):
+            path = os.path.join(trace_dir, stream_file)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            size_decoded, last_ns, ties = self.streams.get(path, (None, None, 0))
+            if size == size_decoded and not final:
+                continue
+            skip = ties  # events at last_ns decoded already
+            try:
+                for event in self.decode(trace_dir, stream_file, self.names, last_ns):
+                    if event.ns == last_ns and skip:
+                        skip -= 1
+                        continue
+                    ties = ties + 1 if event.ns == last_ns else 1
+                    last_ns = event.ns
+                    self.decoded += 1
+                    if self.emitted_ns is not None and event.ns < self.emitted_ns:
+                        # arrived after the window it belonged to was released
+                        self.late += 1
+                    else:
+                        self.pending.append(event)
+                self.streams[path] = (size, last_ns, ties)
+            except Exception as e:
+                # the last packets of a trace being written may be incomplete,
+                # the stream is decoded again from last_ns on next poll
+                self.streams[path] = (None, last_ns, ties)
+                if self.debug:
+                    print(color("Decoding stopped at a partially written packet: " + str(e), fg="yellow"))
+        self.pending.sort(key=lambda event: event.ns)
+        return self.pending
+
+    def release(self, pending, final=False):
+        """
+        Splits pending events into those to yield and those to hold back
+        """
+        if final or not pending:
+            return pending, []
+        horizon = pending[-1].ns - self.lateness_ns
+        count = int(np.searchsorted([event.ns for event in pending], horizon, side="right"))
+        return pending[:count], pending[count:]
+
+    def events(self, finished=None):
+        """
+        Yields the events of the trace as they are written
+
+        :param: finished: function returning True once the trace is complete
+        (e.g. the tracing session was stopped), a last poll yields then all
+        the events left
+        """
+        fingerprint = None
+        idle_since = time.monotonic()
+        known_late = 0
+        while True:
+            final = finished is not None and finished()
+            if self.idle_timeout is not None and time.monotonic() - idle_since > self.idle_timeout:
+                final = True
+            current = trace_fingerprint(self.tracename)
+            if current != fingerprint or final:
+                fingerprint = current
+                idle_since = time.monotonic()
+                released, self.pending = self.release(self.poll(final), final)
+                for event in released:
+                    self.emitted_ns = event.ns
+                    self.yielded += 1
+                    yield event
+            if final:
+                return
+            if self.late != known_late and self.debug:
+                known_late = self.late
+                print(color(str(self.late) + " events arrived too late and were skipped", fg="yellow"))
+            self.sleep(self.interval)
+
+
+class RollingMetrics:
+    """
+    Latency, throughput and power of a live analysis over a window trailing
+    the latest event
+
+    Only the sets completed within the window are kept (output timestamp,
+    benchmark latency and bytes of each), along with the power samples of
+    the window, so memory is bounded by the rate times the window rather
+    than by the length of the session. Latency percentiles of the whole
+    session are kept in a LatencyHistogram.
+    """
+
+    def __init__(self, window_ns=DEFAULT_ROLLING_WINDOW_NS, percentiles=DEFAULT_PERCENTILES):
+        self.window_ns = window_ns
+        self.percentiles = percentiles
+        self.outputs = deque()  # (output ns, benchmark latency ns, bytes), by output
+        self.power = deque()  # (ns, watts)
+        self.histogram = LatencyHistogram()  # benchmark latency (ms) of the whole session
+        self.first_ns = None
+        self.now_ns = None
+        self.sets = 0
+        self.lost = 0
+
+    def add_set(self, output_ns, latency_ns, size=0):
+        self.outputs.append((output_ns, latency_ns, size))
+        self.histogram.record(ns_to_ms(latency_ns))
+        self.sets += 1
+
+    def add_power(self, ns, watts):
+        self.power.append((ns, watts))
+
+    def advance(self, now_ns):
+        """
+        Moves the window to end at now_ns, dropping what falls out of it
+        """
+        if self.first_ns is None:
+            self.first_ns = now_ns
+        self.now_ns = now_ns
+        deadline = now_ns - self.window_ns
+        while self.outputs and self.outputs[0][0] <= deadline:
+            self.outputs.popleft()
+        while self.power and self.power[0][0] <= deadline:
+            self.power.popleft()
+
+    def snapshot(self):
+        """
+        Metrics of the current window
+
+        :returns: dict with "time" (s since the first event), "window" (s),
+        "sets" and "lost" (whole session), "latency" (statistics of the
+        window in ms, see describe), "percentiles" (whole session, ms),
+        "fps", "MB/s" and "power" (mean W of the window, None if no samples)
+        """
+        elapsed_ns = 0 if self.now_ns is None else self.now_ns - self.first_ns
+        seconds = min(self.window_ns, elapsed_ns) / NS_PER_S
+        outputs = np.array(self.outputs, dtype=np.int64).reshape(-1, 3)
+        latency = describe(ns_to_ms(outputs[:, 1]), self.percentiles) if len(outputs) else {}
+        return {
+            "time": elapsed_ns / NS_PER_S,
+            "window": self.window_ns / NS_PER_S,
+            "sets": self.sets,
+            "lost": self.lost,
+            "latency": latency,
+            "percentiles": self.histogram.percentiles() if self.histogram.count else {},
+            "fps": len(outputs) / seconds if seconds else float("nan"),
+            "MB/s": float(np.sum(outputs[:, 2])) / seconds / 1e6 if seconds else float("nan"),
+            "power": float(np.mean([watts for _, watts in self.power])) if self.power else None,
+        }
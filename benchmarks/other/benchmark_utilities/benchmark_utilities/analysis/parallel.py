@@ -0,0 +1,135 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from benchmark_utilities.analysis.cache import events_to_columns
+from benchmark_utilities.analysis.events import iter_trace_events
+
+
+def trace_stream_files(tracename):
+    """
+    Returns a list of (trace directory, stream file) with every CTF data
+    stream of a trace
+
+    LTTng writes one CTF trace (a directory holding a "metadata" file) per
+    domain/uid/bitness, and one stream file per channel and CPU within it.
+    """
+    streams = []
+    for root, dirs, files in os.walk(tracename):
+        dirs.sort()
+        if "metadata" not in files:
+            continue
+        for file in sorted(files):
+            if file == "metadata" or file.startswith("."):
+                continue
+            streams.append((root, file))
+    return streams
+
+
+@contextmanager
+def stream_trace(trace_dir, stream_file):
+    """
+    Exposes a single stream file as a trace of its own
+
+    babeltrace2 decodes a directory as a trace, so the stream file is
+    linked, together with the metadata it depends on, in a temporary
+    directory, yielded and removed afterwards.
+
+    :param: trace_dir: directory of the CTF trace holding the stream
+    :param: stream_file: name of the stream file
+    """
+    tmpdir = tempfile.mkdtemp(prefix="robotperf-stream-")
+    try:
+        os.symlink(os.path.join(trace_dir, "metadata"), os.path.join(tmpdir, "metadata"))
+        os.symlink(os.path.join(trace_dir, stream_file), os.path.join(tmpdir, stream_file))
+        yield tmpdir
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def decode_stream_file(task):
+    """
+    Decodes a single stream file, returning the columns of the events of interest
+
+    Runs in a worker process, see stream_trace.
+
+    :param: task: tuple (trace directory, stream file, event names)
+    """
+    trace_dir, stream_file, names = task
+    with stream_trace(trace_dir, stream_file) as tracename:
+        return events_to_columns(iter_trace_events(tracename, names), names)
+
+
+def merge_columns(columns_list):
+    """
+    Merges the columns of several time-ordered sources into a single
+    time-ordered set of columns
+
+    NOTE: all columns must have been extracted for the same event names,
+    so that name ids match across them.
+    """
+    if len(columns_list) == 1:
+        return columns_list[0]
+
+    merged = {"names": columns_list[0]["names"]}
+    per_event = [key for key in columns_list[0] if key not in ("names", "msg_sizes", "msg_sizes_offsets")]
+    for key in per_event:
+        merged[key] = np.concatenate([columns[key] for columns in columns_list])
+
+    # message sizes: rebase each source's offsets into the concatenated sizes
+    starts = []
+    lengths = []
+    base = 0
+    for columns in columns_list:
+        offsets = columns["msg_sizes_offsets"]
+        starts.append(offsets[:-1] + base)
+        lengths.append(np.diff(offsets))
+        base += len(columns["msg_sizes"])
+    starts = np.concatenate(starts)
+    lengths = np.concatenate(lengths)
+    msg_sizes = np.concatenate([columns["msg_sizes"] for columns in columns_list])
+
+    # stable sort keeps the order of events with equal timestamps within a source
+    order = np.argsort(merged["ns"], kind="stable")
+    for key in per_event:
+        merged[key] = merged[key][order]
+
+    starts = starts[order]
+    lengths = lengths[order]
+    offsets = np.zeros(len(order) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+    merged["msg_sizes"] = msg_sizes[gather]
+    merged["msg_sizes_offsets"] = offsets
+    return merged
+
+
+def parallel_trace_columns(tracename, names, workers=None):
+    """
+    Decodes the stream files of a trace in a pool of processes and merges
+    the events of interest, in time order
+
+    :param: tracename: path to the CTF trace
+    :param: names: event names to extract (e.g. target_chain + power_chain)
+    :param: workers: number of worker processes, defaults to the number of CPUs
+    """
+    names = sorted(set(names))
+    streams = trace_stream_files(tracename)
+    if len(streams) <= 1:
+        return events_to_columns(iter_trace_events(tracename, names), names)
+
+    if workers is None:
+        workers = os.cpu_count()
+    tasks = [(trace_dir, stream_file, names) for trace_dir, stream_file in streams]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        columns_list = list(pool.map(decode_stream_file, tasks))
+    return merge_columns(columns_list)
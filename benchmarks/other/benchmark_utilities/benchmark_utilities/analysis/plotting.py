@@ -0,0 +1,736 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Written by Alejandra Martínez Fariña <alex@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import datetime
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+from benchmark_utilities.analysis.segments import SEGMENT_COLORS, ns_matrix, offsets_ns
+from benchmark_utilities.analysis.statistics import ns_to_ms
+
+if TYPE_CHECKING:
+    from bokeh.plotting import figure as Figure
+
+
+class PlottingMixin:
+    """
+    Plots of BenchmarkAnalyzer results (bokeh, plotly, pandas)
+
+    NOTE: plotting libraries are imported within each method, so that
+    analyses that don't plot (e.g. power) don't pay for importing them.
+    """
+
+    def add_durations_to_figure(
+        self, 
+        figure: "Figure",
+        segment_type: str,
+        durations: List[Union[Tuple[datetime.datetime, datetime.datetime]]],
+        color: str,
+        line_width: int = 60,
+        legend_label: Optional[str] = None,
+    ) -> None:
+        for duration in durations:
+            duration_begin, duration_end, _ = duration
+            base_kwargs = dict()
+            if legend_label:
+                base_kwargs["legend_label"] = legend_label
+            figure.line(
+                x=[duration_begin, duration_end],
+                y=[segment_type, segment_type],
+                color=color,
+                line_width=line_width,
+                **base_kwargs,
+            )
+
+    def add_markers_to_figure(
+        self, 
+        figure: "Figure",
+        segment_type: str,
+        times: List[datetime.datetime],
+        color: str,
+        line_width: int = 60,
+        legend_label: Optional[str] = None,
+        size: int = 30,
+        marker_type: str = "diamond",
+    ) -> None:
+        for time in times:
+            base_kwargs = dict()
+            if legend_label:
+                base_kwargs["legend_label"] = legend_label
+            if marker_type == "diamond":
+                figure.diamond(
+                    x=[time],
+                    y=[segment_type],
+                    fill_color=color,
+                    line_color=color,
+                    size=size,
+                    **base_kwargs,
+                )
+            elif marker_type == "plus":
+                figure.plus(
+                    x=[time],
+                    y=[segment_type],
+                    fill_color=color,
+                    line_color=color,
+                    size=size,
+                    **base_kwargs,
+                )
+            else:
+                assert False, "invalid marker_type value"
+
+    def barplot_all(self, image_pipeline_msg_sets, title="Barplot"):
+        import pandas as pd
+
+
+        # time since the first tracepoint of each set, in ms
+        image_pipeline_msg_sets_ms = ns_to_ms(offsets_ns(ns_matrix(image_pipeline_msg_sets)))
+
+        df = pd.DataFrame(image_pipeline_msg_sets_ms)
+        df.columns = self.target_chain_dissambiguous
+        import plotly.express as px
+
+        # pd.set_option("display.max_rows", None, "display.max_columns", None)
+        # print(df)
+
+        fig = px.box(
+            df,
+            points="all",
+            template="plotly_white",
+            title=title,
+        )
+        fig.update_xaxes(title_text="Trace event")
+        fig.update_yaxes(title_text="Milliseconds")
+        # fig.show()
+        fig.write_image("/tmp/analysis/plot_barplot.png", width=1400, height=1000)    
+
+    def traces_id(self, msg_set):
+        from bokeh.io import export_png
+        from bokeh.models import PrintfTickFormatter
+        from bokeh.models.annotations import Label
+        from bokeh.plotting.figure import figure
+
+        # segments are derived from the tracepoint pairs of the target chain (see chain_segments)
+
+        # For some reason it seems to be displayed in the reverse order on the Y axis
+        if self.hardware_device_type == "cpu":
+            segment_types = ["rmw", "rcl", "rclcpp", "userland", "benchmark"]
+        elif self.hardware_device_type == "fpga":
+            segment_types = ["kernel", "rmw", "rcl", "rclcpp", "userland", "benchmark"]
+        for layer in self.target_chain_layer:
+            if layer not in segment_types:
+                segment_types.insert(0, layer)
+
+        fig = figure(
+            title="RobotPerf benchmark:" + self.benchmark_name,
+            x_axis_label=f"Milliseconds",
+            y_range=segment_types,
+            plot_width=2000,
+            plot_height=600,
+        )
+        fig.title.align = "center"
+        fig.title.text_font_size = "20px"
+        # fig.xaxis[0].formatter = DatetimeTickFormatter(milliseconds = ['%3Nms'])
+        fig.xaxis[0].formatter = PrintfTickFormatter(format="%f ms")
+        fig.xaxis[0].ticker.desired_num_ticks = 20
+        fig.xaxis[0].axis_label_text_font_size = "30px"
+        fig.yaxis[0].major_label_text_font_size = "25px"
+
+        # time since the first tracepoint of the set, in ms
+        target_chain_ms = ns_to_ms(offsets_ns(ns_matrix([msg_set])))[0].tolist()
+
+        # draw durations, outer segments first so that nested ones show on top
+        segments = sorted(self.segments(), key=lambda segment: segment.start - segment.end)
+        for segment in segments:
+            callback_start = target_chain_ms[segment.start]
+            callback_end = target_chain_ms[segment.end]
+            duration = callback_end - callback_start
+            self.add_durations_to_figure(
+                fig,
+                self.target_chain_layer[segment.start],  # drawn on the layer of
+                                                         # the segment's first tracepoint
+                [(callback_start, callback_start + duration, duration)],
+                SEGMENT_COLORS[segment.kind],
+            )
+
+        for msg_index in range(len(msg_set)):
+            #     self.add_markers_to_figure(fig, msg_set[msg_index].event.name, [target_chain_ms[msg_index]], 'blue', marker_type='plus', legend_label='timing')
+            # print("marker ms: " + str(target_chain_ms[msg_index]))
+            self.add_markers_to_figure(
+                fig,
+                self.target_chain_layer[msg_index],
+                [target_chain_ms[msg_index]],
+                self.target_chain_colors_fg_bokeh[msg_index],
+                marker_type=self.target_chain_marker[msg_index],
+                # legend_label=msg_set[msg_index].event.name,
+                legend_label=self.target_chain_dissambiguous[msg_index],
+                size=10,
+            )        
+            if "robotperf_image_input_cb_fini" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-40,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+
+            elif "robotperf_image_output_cb_init" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-200,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+            else:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-30,
+                    y_offset=-30,
+                    # text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                    text="",
+                )
+            fig.add_layout(label)
+
+        # hack legend to the right
+        fig.legend.location = "right"
+        new_legend = fig.legend[0]
+        fig.legend[0] = None
+        fig.add_layout(new_legend, "right")
+        
+        ## output
+        # show(fig)  # show in browser    
+        export_png(fig, filename="/tmp/analysis/plot_trace.png")
+
+    def traces(self, msg_set):
+        from bokeh.io import export_png
+        from bokeh.models import PrintfTickFormatter
+        from bokeh.models.annotations import Label
+        from bokeh.plotting.figure import figure
+
+        # this method only works for hardcoded traces, specifically for the a1 benchmark
+        # TODO: make this function generic so other benchmarks can also be plotted 
+
+        # For some reason it seems to be displayed in the reverse order on the Y axis
+        if self.hardware_device_type == "cpu":
+            segment_types = ["rmw", "rcl", "rclcpp", "userland", "benchmark"]
+        elif self.hardware_device_type == "fpga":
+            segment_types = ["kernel", "rmw", "rcl", "rclcpp", "userland", "benchmark"]
+
+        fig = figure(
+            title="RobotPerf benchmark:" + self.benchmark_name,
+            x_axis_label=f"Milliseconds",
+            y_range=segment_types,
+            plot_width=2000,
+            plot_height=600,
+        )
+        fig.title.align = "center"
+        fig.title.text_font_size = "20px"
+        # fig.xaxis[0].formatter = DatetimeTickFormatter(milliseconds = ['%3Nms'])
+        fig.xaxis[0].formatter = PrintfTickFormatter(format="%f ms")
+        fig.xaxis[0].ticker.desired_num_ticks = 20
+        fig.xaxis[0].axis_label_text_font_size = "30px"
+        fig.yaxis[0].major_label_text_font_size = "25px"
+
+        # time since the first tracepoint of the set, in ms
+        target_chain_ms = ns_to_ms(offsets_ns(ns_matrix([msg_set])))[0].tolist()
+
+        # print("1")
+
+        # draw durations
+        ## robotperf_image_input_cb_fini-robotperf_image_output_cb_init duration
+        callback_start = target_chain_ms[2]
+        callback_end = target_chain_ms[17]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[2],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "khaki",
+        )
+
+        ## rclcpp callbacks - robotperf_image_input_cb_init
+        callback_start = target_chain_ms[0]
+        callback_end = target_chain_ms[3]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[0],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - rectify
+        callback_start = target_chain_ms[4]
+        callback_end = target_chain_ms[9]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[0],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - resize
+        callback_start = target_chain_ms[10]
+        callback_end = target_chain_ms[15]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[10],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - robotperf_image_output_cb_init
+        callback_start = target_chain_ms[16]
+        callback_end = target_chain_ms[19]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[16],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rectify callback
+        callback_start = target_chain_ms[5]
+        callback_end = target_chain_ms[8]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[5],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+
+        ## rectify op
+        callback_start = target_chain_ms[6]
+        callback_end = target_chain_ms[7]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[6],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "seashell",
+        )
+
+        ## resize callback
+        callback_start = target_chain_ms[11]
+        callback_end = target_chain_ms[14]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[11],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+        ## resize op
+        callback_start = target_chain_ms[12]
+        callback_end = target_chain_ms[13]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[12],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "seashell",
+        )
+
+        ## robotperf_image_input_cb_init callback
+        callback_start = target_chain_ms[1]
+        callback_end = target_chain_ms[2]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[1],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+
+        ## robotperf_image_output_cb_init callback
+        callback_start = target_chain_ms[17]
+        callback_end = target_chain_ms[18]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[17],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+        
+        for msg_index in range(len(msg_set)):
+            #     self.add_markers_to_figure(fig, msg_set[msg_index].event.name, [target_chain_ms[msg_index]], 'blue', marker_type='plus', legend_label='timing')
+            # print("marker ms: " + str(target_chain_ms[msg_index]))
+            self.add_markers_to_figure(
+                fig,
+                self.target_chain_layer[msg_index],
+                [target_chain_ms[msg_index]],
+                self.target_chain_colors_fg_bokeh[msg_index],
+                marker_type=self.target_chain_marker[msg_index],
+                # legend_label=msg_set[msg_index].event.name,
+                legend_label=self.target_chain_dissambiguous[msg_index],
+                size=10,
+            )        
+            if "robotperf_image_input_cb_fini" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-40,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+
+            elif "robotperf_image_output_cb_init" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-200,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+            else:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-30,
+                    y_offset=-30,
+                    # text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                    text="",
+                )
+            fig.add_layout(label)
+
+        # hack legend to the right
+        fig.legend.location = "right"
+        new_legend = fig.legend[0]
+        fig.legend[0] = None
+        fig.add_layout(new_legend, "right")
+        
+        ## output
+        # show(fig)  # show in browser    
+        export_png(fig, filename="/tmp/analysis/plot_trace.png")
+
+    def traces_fpga(self, msg_set):        
+        from bokeh.io import export_png
+        from bokeh.models import PrintfTickFormatter
+        from bokeh.models.annotations import Label
+        from bokeh.plotting.figure import figure
+
+        # this method only works for hardcoded traces, specifically for the a1 fpga benchmark
+        # TODO: make this function generic so other benchmarks can also be plotted         
+
+        # For some reason it seems to be displayed in the reverse order on the Y axis
+        if self.hardware_device_type == "cpu":
+            segment_types = ["rmw", "rcl", "rclcpp", "userland", "benchmark"]
+        elif self.hardware_device_type == "fpga":
+            segment_types = ["kernel", "rmw", "rcl", "rclcpp", "userland", "benchmark"]
+
+        fig = figure(
+            title="RobotPerf benchmark: a1_perception_2nodes",
+            x_axis_label=f"Milliseconds",
+            y_range=segment_types,
+            plot_width=2000,
+            plot_height=600,
+        )
+        fig.title.align = "center"
+        fig.title.text_font_size = "20px"
+        # fig.xaxis[0].formatter = DatetimeTickFormatter(milliseconds = ['%3Nms'])
+        fig.xaxis[0].formatter = PrintfTickFormatter(format="%f ms")
+        fig.xaxis[0].ticker.desired_num_ticks = 20
+        fig.xaxis[0].axis_label_text_font_size = "30px"
+        fig.yaxis[0].major_label_text_font_size = "25px"
+
+        # time since the first tracepoint of the set, in ms
+        target_chain_ms = ns_to_ms(offsets_ns(ns_matrix([msg_set])))[0].tolist()
+
+        # draw durations
+        ## robotperf_image_input_cb_fini-robotperf_image_output_cb_init duration
+        callback_start = target_chain_ms[2]
+        callback_end = target_chain_ms[21]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[2],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "khaki",
+        )
+
+        ## rclcpp callbacks - robotperf_image_input_cb_init
+        callback_start = target_chain_ms[0]
+        callback_end = target_chain_ms[3]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[0],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - rectify
+        callback_start = target_chain_ms[4]
+        callback_end = target_chain_ms[11]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[4],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - resize
+        callback_start = target_chain_ms[12]
+        callback_end = target_chain_ms[19]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[12],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rclcpp callbacks - robotperf_image_output_cb_init
+        callback_start = target_chain_ms[20]
+        callback_end = target_chain_ms[23]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[20], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "lightgray",
+        )
+
+        ## rectify callback
+        callback_start = target_chain_ms[5]
+        callback_end = target_chain_ms[10]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[5],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+
+        ## rectify op
+        callback_start = target_chain_ms[6]
+        callback_end = target_chain_ms[9]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[6],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "seashell",
+        )
+
+        ## resize callback
+        callback_start = target_chain_ms[13]
+        callback_end = target_chain_ms[18]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[13], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+        ## resize op
+        callback_start = target_chain_ms[14]
+        callback_end = target_chain_ms[17]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[14], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "seashell",
+        )
+
+        ## robotperf_image_input_cb_init callback
+        callback_start = target_chain_ms[1]
+        callback_end = target_chain_ms[2]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[1],  # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+
+        ## robotperf_image_output_cb_init callback
+        callback_start = target_chain_ms[21]
+        callback_end = target_chain_ms[22]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[21], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "whitesmoke",
+        )
+
+        ## kernel_enqueue (rectify)
+        callback_start = target_chain_ms[7]
+        callback_end = target_chain_ms[8]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[7], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "palegreen",
+        )
+
+        ## kernel_enqueue (resize)
+        callback_start = target_chain_ms[15]
+        callback_end = target_chain_ms[16]
+        duration = callback_end - callback_start
+        self.add_durations_to_figure(
+            fig,
+            self.target_chain_layer[15], # index used in here
+                                    # should match with the
+                                    # one from the callback_start
+            [(callback_start, callback_start + duration, duration)],
+            "palegreen",
+        )
+
+
+        for msg_index in range(len(msg_set)):
+            #     add_markers_to_figure(fig, msg_set[msg_index].event.name, [target_chain_ms[msg_index]], 'blue', marker_type='plus', legend_label='timing')
+            # print("marker ms: " + str(target_chain_ms[msg_index]))
+            self.add_markers_to_figure(
+                fig,
+                self.target_chain_layer[msg_index],
+                [target_chain_ms[msg_index]],
+                self.target_chain_colors_fg_bokeh[msg_index],
+                marker_type=self.target_chain_marker[msg_index],
+                # legend_label=msg_set[msg_index].event.name,
+                legend_label=self.target_chain_dissambiguous[msg_index],
+                size=10,
+            )        
+            if "robotperf_image_input_cb_fini" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-40,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+
+            elif "robotperf_image_output_cb_init" in msg_set[msg_index].event.name:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-200,
+                    y_offset=-40,
+                    text=self.target_chain_dissambiguous[msg_index].split(":")[-1],
+                )
+            else:
+                label = Label(
+                    x=target_chain_ms[msg_index],
+                    y=self.target_chain_label_layer[msg_index],
+                    x_offset=-30,
+                    y_offset=-30,
+                    # text=target_chain_dissambiguous[msg_index].split(":")[-1],
+                    text="",
+                )
+            fig.add_layout(label)
+
+        # hack legend to the right
+        fig.legend.location = "right"
+        new_legend = fig.legend[0]
+        fig.legend[0] = None
+        fig.add_layout(new_legend, "right")
+        
+        ## output
+        # show(fig)  # show in browser    
+        export_png(fig, filename="/tmp/analysis/plot_trace.png")
+
+    def draw_tracepoints(self):        
+        msg_set = self.image_pipeline_msg_sets[self.index_to_plot]
+        self.traces_id(msg_set)
+
+    def plot_latency_results(self):
+        import pandas as pd
+
+        # Plot, either averages or latest, etc
+
+        image_pipeline_msg_sets_mean = pd.DataFrame(self.image_pipeline_msg_sets_barchart).mean()
+        image_pipeline_msg_sets_max = pd.DataFrame(self.image_pipeline_msg_sets_barchart).max()
+        image_pipeline_msg_sets_index = pd.DataFrame(self.barchart_data_latency(self.image_pipeline_msg_sets[self.index_to_plot])).transpose()[0]
+        image_pipeline_msg_sets_index = image_pipeline_msg_sets_index.rename(None)
+
+        df_mean = pd.concat(
+            [
+                image_pipeline_msg_sets_index,
+                image_pipeline_msg_sets_mean,
+                image_pipeline_msg_sets_max,
+            ], axis=1).transpose()
+        df_mean.columns = self.target_chain_dissambiguous
+        substrates = pd.DataFrame({'substrate':
+            [
+                "RobotPerf benchmark:" + self.benchmark_name + "(instance)",
+                "RobotPerf benchmark:" + self.benchmark_name + "(mean)",
+                "RobotPerf benchmark:" + self.benchmark_name + "(max)",
+            ]})
+        df_mean = df_mean.join(substrates)
+
+        import plotly.express as px
+        fig = px.bar(
+            df_mean,
+            template="plotly_white",
+            x="substrate",
+            y=self.target_chain_dissambiguous,
+            color_discrete_sequence=px.colors.sequential.Inferno + px.colors.diverging.BrBG,
+            # colors at https://plotly.com/python/discrete-color/
+        )
+        fig.update_xaxes(title_text = "")
+        fig.update_yaxes(title_text = "Milliseconds")
+        # fig.show()
+        fig.write_image("/tmp/analysis/plot_barchart.png", width=1400, height=1000)
+
+        result = self.results(self.image_pipeline_msg_sets_barchart_ns)
+        self.add_result(result)
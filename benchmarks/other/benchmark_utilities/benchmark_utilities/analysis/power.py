@@ -0,0 +1,99 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import numpy as np
+
+from benchmark_utilities.analysis.throughput import NS_PER_S
+
+
+def power_series(image_pipeline_msg_sets):
+    """
+    Power samples of the power chain as a time series
+
+    :param: image_pipeline_msg_sets: list of message sets of the power
+    chain (or a single list of events), events carrying msg_power
+    :returns: (int64 ns, float64 watts), ordered by timestamp
+    """
+    if image_pipeline_msg_sets and type(image_pipeline_msg_sets[0]) != list:
+        image_pipeline_msg_sets = [image_pipeline_msg_sets]
+    samples = [(msg.ns, msg.power) for msg_set in image_pipeline_msg_sets
+               for msg in msg_set if msg.power is not None]
+    ns = np.array([sample[0] for sample in samples], dtype=np.int64)
+    watts = np.array([sample[1] for sample in samples], dtype=np.float64)
+    order = np.argsort(ns, kind="stable")
+    return ns[order], watts[order]
+
+
+def sets_window(image_pipeline_msg_sets):
+    """
+    Time window covered by a list of message sets, from the first event of
+    the earliest set to the last event of the latest one
+
+    :returns: (start ns, end ns), None if there are no sets
+    """
+    if not image_pipeline_msg_sets:
+        return None
+    return (min(msg_set[0].ns for msg_set in image_pipeline_msg_sets),
+            max(msg_set[-1].ns for msg_set in image_pipeline_msg_sets))
+
+
+def power_summary(ns, watts, window=None):
+    """
+    Energy and power over a window, integrating the power samples
+    trapezoidally between their timestamps
+
+    Power at the boundaries of the window is interpolated between the
+    samples around them, and held constant before the first and after the
+    last sample, so that the energy covers the exact window.
+
+    :param: ns: int64 timestamps of the samples, ordered (see power_series)
+    :param: watts: power of each sample
+    :param: window: (start ns, end ns) to integrate over (see sets_window),
+    the span of the samples if None
+    :returns: dict with "joules", "seconds", "mean" (W, energy over time),
+    "peak" and "min" (W), "samples" (within the window) and "series", a
+    dict of arrays for plotting: "time" (s since the start of the window),
+    "watts" and "joules" (cumulative)
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    watts = np.asarray(watts, dtype=np.float64)
+    if not len(ns):
+        raise ValueError("No power samples")
+    start, end = (ns[0], ns[-1]) if window is None else window
+    inside = (ns > start) & (ns < end)
+
+    times = np.concatenate(([start], ns[inside], [end])) if end > start else np.array([start])
+    power = np.interp(times, ns, watts)
+    seconds = (times - start) / NS_PER_S
+    joules = np.concatenate(([0.0], np.cumsum((power[1:] + power[:-1]) / 2 * np.diff(seconds))))
+    duration = (end - start) / NS_PER_S
+    return {
+        "joules": float(joules[-1]),
+        "seconds": duration,
+        "mean": float(joules[-1] / duration) if duration else float(power[0]),
+        "peak": float(np.max(power)),
+        "min": float(np.min(power)),
+        "samples": int(np.count_nonzero(inside)),
+        "series": {"time": seconds, "watts": power, "joules": joules},
+    }
+
+
+def energy_metrics(summary, frames, latency_ms):
+    """
+    Energy per frame and energy-delay product of a run
+
+    :param: summary: power over the window of the frames, see power_summary
+    :param: frames: number of frames (completed target chains) within the window
+    :param: latency_ms: mean latency of the frames
+    :returns: dict with "frames", "joules_per_frame" (J) and "edp" (J*s,
+    energy per frame times its latency, lower is better)
+    """
+    joules_per_frame = summary["joules"] / frames if frames else float("nan")
+    return {
+        "frames": frames,
+        "joules_per_frame": joules_per_frame,
+        "edp": joules_per_frame * latency_ms / 1e3,
+    }
@@ -0,0 +1,862 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Written by Alejandra Martínez Fariña <alex@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import json
+import os
+import time
+from wasabi import color
+
+from benchmark_utilities.analysis.histogram import LatencyHistogram
+from benchmark_utilities.analysis.statistics import latency_ms
+
+
+class ReportingMixin:
+    """
+    Textual reports of BenchmarkAnalyzer results: timelines, markdown
+    tables and result dicts added to benchmark.yaml files
+    """
+
+    def print_timeline(self, image_pipeline_msg_sets):
+
+        for msg_set in image_pipeline_msg_sets:
+            if len(msg_set) != len(self.target_chain):
+                print(
+                    color(
+                        "Not a complete set: " + str([x.event.name for x in msg_set]),
+                        fg="red",
+                    )
+                )
+                pass
+            else:
+                target_chain_ns = []
+                for msg_index in range(len(msg_set)):
+                    target_chain_ns.append(
+                        msg_set[msg_index].default_clock_snapshot.ns_from_origin
+                    )
+
+                init_ns = target_chain_ns[0]
+                fixed_target_chain_ns = [init_ns] + target_chain_ns
+                # stringout = color("raw image → " + msg_set[0].event.name + " → ")
+                stringout = color("raw image ")
+                for msg_index in range(len(msg_set)):
+                    stringout += " → " + color(
+                        msg_set[msg_index].event.name
+                        + " ({} ms) ".format(
+                            (
+                                fixed_target_chain_ns[msg_index + 1]
+                                - fixed_target_chain_ns[msg_index]
+                            )
+                            / 1e6
+                        ),
+                        fg=self.target_chain_colors_fg[msg_index],
+                        bg="black",
+                    )
+                    # stringout += " → " + msg_set[msg_index].event.name + \
+                    #     " ({} ms) ".format((fixed_target_chain_ns[msg_index + 1] - fixed_target_chain_ns[msg_index])/1e6)
+
+                stringout += color(
+                    "total "
+                    + " ({} ms) ".format((target_chain_ns[-1] - target_chain_ns[0]) / 1e6),
+                    fg="black",
+                    bg="white",
+                )
+                print(stringout)
+
+    def print_timeline_average(self, image_pipeline_msg_sets):
+        """
+        Doing averages may lead to negative numbers while substracting the previous average.
+        This is only useful to get an intuition of the totals.
+        """
+
+        image_pipeline_msg_sets_ns = []
+        for msg_set in image_pipeline_msg_sets:
+            if len(msg_set) != len(self.target_chain):
+                print(
+                    color(
+                        "Not a complete set: " + str([x.event.name for x in msg_set]),
+                        fg="red",
+                    )
+                )
+                pass
+            else:
+                target_chain_ns = []
+                final_target_chain_ns = []
+                for msg_index in range(len(msg_set)):
+                    target_chain_ns.append(
+                        msg_set[msg_index].default_clock_snapshot.ns_from_origin
+                    )
+                init_ns = target_chain_ns[0]
+                fixed_target_chain_ns = [init_ns] + target_chain_ns
+
+                for msg_index in range(len(msg_set)):
+                    final_target_chain_ns.append(
+                        (
+                            fixed_target_chain_ns[msg_index + 1]
+                            - fixed_target_chain_ns[msg_index]
+                        )
+                    )
+                final_target_chain_ns.append(
+                    (fixed_target_chain_ns[-1] - fixed_target_chain_ns[0])
+                )  # total
+                image_pipeline_msg_sets_ns.append(final_target_chain_ns)
+
+        image_pipeline_msg_ns_average = [
+            sum(x) / len(x) for x in zip(*image_pipeline_msg_sets_ns)
+        ]
+        # print(image_pipeline_msg_ns_average)
+        stringout = color("raw image ")
+        for msg_index in range(len(image_pipeline_msg_ns_average[:-1])):
+            stringout += " → " + color(
+                image_pipeline_msg_sets[0][msg_index].event.name
+                + " ({} ms) ".format(
+                    (
+                        image_pipeline_msg_ns_average[msg_index + 1]
+                        - image_pipeline_msg_ns_average[msg_index]
+                    )
+                    / 1e6
+                ),
+                fg=self.target_chain_colors_fg[msg_index],
+                bg="black",
+            )
+
+        stringout += color(
+            "total "
+            + " ({} ms) ".format(
+                (image_pipeline_msg_ns_average[-1] - image_pipeline_msg_ns_average[0]) / 1e6
+            ),
+            fg="black",
+            bg="white",
+        )
+        print(stringout)
+
+    def print_markdown_table(self, list_sets, list_sets_names, from_baseline=True, units='ms', add_power=False, power_consumption=0.0):
+        """
+        Creates a markdown table from a list of sets
+
+        :param: list_sets: list of processed data (resulting from barchart_data_latency) to display
+        :param: list_sets_names: list of names to display
+        :param: from_baseline: whether to show % from baseline
+
+        NOTE: assumes base is always the first set in list_sets, which
+        is then used to calculate % of change.
+        """
+
+        list_statistics = []
+        # generate statistics
+        for sets in list_sets:
+            list_statistics.append(self.statistics(sets))
+
+        if not add_power:
+            # Add name to each statistics list
+            for stat_list_index in range(len(list_statistics)):
+                list_statistics[stat_list_index].insert(0, list_sets_names[stat_list_index])
+
+            # add headers
+            list_statistics.insert(
+                0,
+                [
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    #"---",
+                    #"---",
+                    "---",
+                ],
+            )
+            list_statistics.insert(
+                0,
+                [
+                    " ",
+                    "Benchmark Mean",
+                    "Benchmark RMS",
+                    "Benchmark Max ",
+                    "Benchmark Min",
+                    #"Benchmark Median",
+                    "Mean",
+                    "RMS",
+                    "Max",
+                    "Min",
+                    #"Median",
+                ],
+            )
+        else:
+            # Add name to each statistics list
+            for stat_list_index in range(len(list_statistics)):
+                list_statistics[stat_list_index].insert(0, list_sets_names[stat_list_index])
+                
+            # add headers
+            list_statistics.insert(
+                0,
+                [
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    #"---",
+                    #"---",
+                    "---",
+                ],
+            )
+            list_statistics.insert(
+                0,
+                [
+                    " ",
+                    "Benchmark Mean",
+                    "Benchmark RMS",
+                    "Benchmark Max ",
+                    "Benchmark Min",
+                    #"Benchmark Median",
+                    "Mean",
+                    "RMS",
+                    "Max",
+                    "Min",
+                    #"Median",
+                ],
+            )
+        baseline = list_statistics[2]  # baseline for %
+
+        # add missing messages at the end
+        # NOTE: programmed for only 1 initial list_statistics, if more provided
+        # consider extending the self.lost_msgs to a list
+        if len(list_statistics) == 3:  # 1 initial, +2 headers            
+            list_statistics[0].append("Lost Messages")
+            list_statistics[1].append("---")
+            list_statistics[2].append("{:.2f} %".format(self.lost_percentage()))
+
+            if add_power:
+                list_statistics[0].append("Average Power (W)")
+                list_statistics[1].append("---")
+                list_statistics[2].append("-" if power_consumption is None else str(power_consumption))
+        
+        length_list = [len(row) for row in list_statistics]
+        column_width = max(length_list)
+        count = 0
+        for row in list_statistics:
+            row_str = " | "
+            if count == 2:
+                for element_index in range(len(row)):
+                    if type(row[element_index]) != str:
+                        if from_baseline:
+                            if row[element_index] > baseline[element_index]:
+                                row_str += (
+                                    "**{:.2f} {}**".format(row[element_index], units)
+                                    + " (:small_red_triangle_down: `"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                            else:
+                                row_str += (
+                                    "**{:.2f} {}**".format(row[element_index], units)
+                                    + "{}**".format(units) 
+                                    + " (`"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                        else:
+                            row_str += ("**{:.2f} {}**".format(row[element_index], units) + " | ")
+                    else:
+                        row_str += row[element_index] + " | "
+
+            else:
+                for element_index in range(len(row)):
+                    if type(row[element_index]) != str:
+                        if from_baseline:
+                            if row[element_index] > baseline[element_index]:
+                                row_str += (
+                                    "{:.2f} {}".format(row[element_index], units) 
+                                    + " (:small_red_triangle_down: `"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                            else:
+                                row_str += (
+                                    "{:.2f} {}".format(row[element_index], units) 
+                                    + " (`"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                        else:
+                            row_str += ("{:.2f} {}".format(row[element_index], units) + " | ")
+
+                    else:
+                        row_str += row[element_index] + " | "
+            count += 1
+            print(row_str)
+
+            # if count == 2:
+            #     row = "|" + "|".join("**{:.2f}**".format(row[element_index]) + " (`"
+            #             + "{:.2f}".format(self.get_change(row[element_index], baseline[element_index])) + "`%)"
+            #         if type(row[element_index]) != str
+            #         else row[element_index]
+            #             for element_index in range(len(row))) + "|"
+            # else:
+            #     row = "|" + "|".join("{:.2f}".format(row[element_index]) + " (`"
+            #             + "{:.2f}".format(self.get_change(row[element_index], baseline[element_index])) + "`%)"
+            #         if type(row[element_index]) != str else row[element_index]
+            #             for element_index in range(len(row))) + "|"
+            # count += 1
+            # print(row)
+
+    def print_markdown_table_1d(self, list_sets, list_sets_names, from_baseline=True, units='ms', add_power=False, power_consumption=None):
+        """
+        Creates a markdown table from a list of sets
+
+        :param: list_sets: list of processed data (resulting from barchart_data_latency) to display
+        :param: list_sets_names: list of names to display
+        :param: from_baseline: whether to show % from baseline
+
+        NOTE: assumes base is always the first set in list_sets, which
+        is then used to calculate % of change.
+        """
+
+        list_statistics = []
+        # generate statistics
+        for sets in list_sets:
+            list_statistics.append(self.statistics_1d(sets))
+
+        if not add_power:
+            # Add name to each statistics list
+            for stat_list_index in range(len(list_statistics)):
+                list_statistics[stat_list_index].insert(0, list_sets_names[stat_list_index])
+
+            # add headers
+            list_statistics.insert(
+                0,
+                [
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    #"---",
+                    #"---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                ],
+            )
+            list_statistics.insert(
+                0,
+                [
+                    " ",
+                    "Benchmark Mean",
+                    "Benchmark RMS",
+                    "Benchmark Max ",
+                    "Benchmark Min",
+                    #"Benchmark Median",
+                    #" ",
+                    " ",
+                    " ",
+                    " ",
+                    " ",
+                ],
+            )
+        else:
+            # Add name to each statistics list
+            for stat_list_index in range(len(list_statistics)):
+                list_statistics[stat_list_index].insert(0, list_sets_names[stat_list_index])
+            
+            # add headers
+            list_statistics.insert(
+                0,
+                [
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                    #"---",
+                    #"---",
+                    "---",
+                    "---",
+                    "---",
+                    "---",
+                ],
+            )
+            list_statistics.insert(
+                0,
+                [
+                    " ",
+                    "Benchmark Mean",
+                    "Benchmark RMS",
+                    "Benchmark Max ",
+                    "Benchmark Min",
+                    #"Benchmark Median",
+                    #" ",
+                    " ",
+                    " ",
+                    " ",
+                    " ",
+                ],
+            )
+
+        baseline = list_statistics[2]  # baseline for %
+
+        # add missing messages at the end
+        # NOTE: programmed for only 1 initial list_statistics, if more provided
+        # consider extending the self.lost_msgs to a list
+        if len(list_statistics) == 3:  # 1 initial, +2 headers
+            list_statistics[0].append("Lost Messages")
+            list_statistics[1].append("---")
+            list_statistics[2].append("{:.2f} %".format(self.lost_percentage()))
+
+            if add_power:
+                list_statistics[0].append("Average Power (W)")
+                list_statistics[1].append("---")
+                list_statistics[2].append("-" if power_consumption is None else str(power_consumption))
+
+
+        length_list = [len(row) for row in list_statistics]
+        column_width = max(length_list)
+        count = 0
+        for row in list_statistics:
+            row_str = " | "
+            if count == 2:
+                for element_index in range(len(row)):
+                    if type(row[element_index]) != str:
+                        if from_baseline:
+                            if row[element_index] > baseline[element_index]:
+                                row_str += (
+                                    "**{:.2f} {}**".format(row[element_index], units)
+                                    + " (:small_red_triangle_down: `"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                            else:
+                                row_str += (
+                                    "**{:.2f} {}**".format(row[element_index], units)
+                                    + "{}**".format(units) 
+                                    + " (`"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                        else:
+                            row_str += ("**{:.2f} {}**".format(row[element_index], units) + " | ")
+                    else:
+                        row_str += row[element_index] + " | "
+
+            else:
+                for element_index in range(len(row)):
+                    if type(row[element_index]) != str:
+                        if from_baseline:
+                            if row[element_index] > baseline[element_index]:
+                                row_str += (
+                                    "{:.2f} {}".format(row[element_index], units) 
+                                    + " (:small_red_triangle_down: `"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                            else:
+                                row_str += (
+                                    "{:.2f} {}".format(row[element_index], units) 
+                                    + " (`"
+                                    + "{:.2f}".format(
+                                        self.get_change(row[element_index], baseline[element_index])
+                                    )
+                                    + "`%) | "
+                                )
+                        else:
+                            row_str += ("{:.2f} {}".format(row[element_index], units) + " | ")
+
+                    else:
+                        row_str += row[element_index] + " | "
+            count += 1
+            print(row_str)
+
+            # if count == 2:
+            #     row = "|" + "|".join("**{:.2f}**".format(row[element_index]) + " (`"
+            #             + "{:.2f}".format(self.get_change(row[element_index], baseline[element_index])) + "`%)"
+            #         if type(row[element_index]) != str
+            #         else row[element_index]
+            #             for element_index in range(len(row))) + "|"
+            # else:
+            #     row = "|" + "|".join("{:.2f}".format(row[element_index]) + " (`"
+            #             + "{:.2f}".format(self.get_change(row[element_index], baseline[element_index])) + "`%)"
+            #         if type(row[element_index]) != str else row[element_index]
+            #             for element_index in range(len(row))) + "|"
+            # count += 1
+            # print(row)
+
+    def results(self, sets, metric="latency"):
+        """
+        Builds a dictionary result from a list of sets.
+
+        :param: sets: list of processed data
+
+        NOTE: Syntax should follow the following format:
+            {
+                "hardware": "kr260",
+                "category": "perception",
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": 15.2,
+                "metric": "latency",
+                "metric_unit": "ms",
+                "note": "Note",
+                "datasource": "perception/image"
+            }    
+
+        NOTE 2: "value" stays the maximum benchmark latency, as in the
+        results already published, so that they remain comparable. Tail
+        latency is stored under "percentiles" along with the "histogram",
+        and regression detection reads p99 out of them (see
+        ros2benchmark.api.regression.result_p99).
+        """
+
+        # mean_benchmark, rms_benchmark, max_benchmark, min_benchmark, mean_, rms_, max_, min_
+        # 0,                1,                  2,          3,          4,      5,   6,    7
+        statistics_data = self.statistics(sets)
+        histogram = self.benchmark_histogram(sets)
+
+        # print(statistics_data[2])
+        return {
+                "hardware": os.environ.get('HARDWARE'),
+                "category": os.environ.get('CATEGORY'),
+                "metric": os.environ.get('METRIC'),
+                "metric_unit": os.environ.get('METRIC_UNIT'),
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": float(statistics_data[2]),  # max, see NOTE 2
+                "note": "mean_benchmark {}, rms_benchmark {}, max_benchmark {}, min_benchmark {}, lost messages {:.2f} %".format(statistics_data[0], statistics_data[1], statistics_data[2], statistics_data[3], self.lost_percentage()),
+                "datasource": os.environ.get('ROSBAG'),
+                "type": os.environ.get('TYPE'),
+                "percentiles": {key: round(value, 4) for key, value in histogram.percentiles().items()},
+                "jitter": round(histogram.jitter(), 4),
+                "histogram": histogram.to_dict(),
+            }
+
+    def benchmark_histogram(self, sets):
+        """
+        Histogram of the benchmark latency of a series of latency sets
+
+        Returns self.latency_histogram, filled while sets were formed, if
+        the given sets are the latencies of those (see bar_charts_latency),
+        builds it out of them otherwise.
+
+        :param: sets: list of lists (or 2-D array), chains x tracepoints
+        """
+        if sets is not None and sets is self.latency_histogram_latencies:
+            return self.latency_histogram
+        histogram = LatencyHistogram()
+        histogram.record_values(latency_ms(self.sets_totals(sets, self.benchmark_indices())))
+        return histogram
+
+    def results_json(self, metric="latency", jsonfilepath="/tmp/json"):
+        """
+        Builds a dictionary result from a json file
+
+        :param: metric: metric to be used
+        :param: metric_unit: metric unit to be used
+        :param: jsonfilepath: path to json file
+
+        NOTE: Syntax should follow the following format:
+            {
+                "hardware": "kr260",
+                "category": "perception",
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": 15.2,
+                "metric": "latency",
+                "metric_unit": "ms",
+                "note": "Note",
+                "datasource": "perception/image"
+            }    
+        """
+        with open(jsonfilepath, 'r') as f:
+            data = json.load(f)
+
+            aux_value = ""
+            aux_note = ""
+
+            # Extract the desired fields
+            mean_latency = data.get("BasicPerformanceMetrics.MEAN_LATENCY")
+            max_latency = data.get("BasicPerformanceMetrics.MAX_LATENCY")
+            min_latency = data.get("BasicPerformanceMetrics.MIN_LATENCY")
+            rms_latency = data.get("BasicPerformanceMetrics.RMS_LATENCY")
+            frames_sent = int(data.get("BasicPerformanceMetrics.NUM_FRAMES_SENT"))
+            frames_missed = int(data.get("BasicPerformanceMetrics.NUM_MISSED_FRAMES"))  
+
+            if metric == "latency":
+                aux_value = max_latency
+                aux_note = "mean_latency {}, rms_latency {}, max_latency {}, min_latency {}, lost messages {:.2f} %".format(mean_latency, rms_latency, max_latency, min_latency, (frames_missed/frames_sent)*100)
+
+                str_out =  "| | Benchmark Mean | Benchmark RMS | Benchmark Max  | Benchmark Min | Lost Messages |\n"
+                str_out += "|----- | -------------- | ------------- | -------------- | ------------- | --------------|\n"
+                str_out += "| black-boxed | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | {:.2f} % |\n".format(
+                    mean_latency, rms_latency, max_latency, min_latency, (frames_missed/frames_sent)*100)
+                print(str_out)
+
+            elif metric == "throughput":
+                mean_framerate = data.get("BasicPerformanceMetrics.MEAN_FRAME_RATE")
+                aux_value = mean_framerate
+                aux_note = "lost messages {:.2f} %".format((frames_missed/frames_sent)*100)
+
+                str_out =  "|  | Benchmark Mean | Benchmark RMS | Benchmark Max  | Benchmark Min | Lost Messages | Throughput |\n"
+                str_out += "|------| -------------- | ------------- | -------------- | ------------- | --------------|--------|\n"
+                str_out += "| black-boxed | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | {:.2f} % | {:.2f}|\n".format(
+                    mean_latency, rms_latency, max_latency, min_latency, (frames_missed/frames_sent)*100, mean_framerate)
+                print(str_out)
+
+
+            elif metric == "power":                
+                average_power = data.get("BasicPerformanceMetrics.AVERAGE_POWER")
+                aux_value = average_power
+                aux_note = "lost messages {:.2f} %".format((frames_missed/frames_sent)*100)
+
+                str_out =  "|  | Benchmark Mean | Benchmark RMS | Benchmark Max  | Benchmark Min | Lost Messages | Power |\n"
+                str_out += "|----- | -------------- | ------------- | -------------- | ------------- | --------------|--------|\n"
+                str_out += "| black-boxed | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | **{:.2f}** ms | {:.2f} % | {:.2f} |\n".format(
+                    mean_latency, rms_latency, max_latency, min_latency, (frames_missed/frames_sent)*100, average_power)
+                print(str_out)
+
+
+            return {
+                    "hardware": os.environ.get('HARDWARE'),
+                    "category": os.environ.get('CATEGORY'),
+                    "metric": os.environ.get('METRIC'),
+                    "metric_unit": os.environ.get('METRIC_UNIT'),
+                    "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                    "value": float(aux_value),
+                    "note": aux_note,
+                    "datasource": os.environ.get('ROSBAG'),
+                    "type": os.environ.get('TYPE')
+                }
+
+    def results_1d(self, sets, metric="throughput"):
+        """
+        Builds a dictionary of results from a list of sets.
+
+        :param: sets: list of processed data
+
+        NOTE: Syntax should follow the following format:
+            {
+                "hardware": "kr260",
+                "category": "perception",
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": 15.2,
+                "metric": "latency",
+                "metric_unit": "ms",
+                "note": "Note",
+                "datasource": "perception/image"
+            }    
+        """
+
+        # mean_benchmark, rms_benchmark, max_benchmark, min_benchmark, mean_, rms_, max_, min_
+        # 0,                1,                  2,          3,          4,      5,   6,    7
+        statistics_data = self.statistics_1d(sets)
+
+        # print(statistics_data[2])
+        return {
+                "hardware": os.environ.get('HARDWARE'),
+                "category": os.environ.get('CATEGORY'),
+                "metric": os.environ.get('METRIC'),
+                "metric_unit": os.environ.get('METRIC_UNIT'),
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": float(statistics_data[2]),
+                "note": "mean_benchmark {}, rms_benchmark {}, max_benchmark {}, min_benchmark {}, lost messages {:.2f} %".format(statistics_data[0], statistics_data[1], statistics_data[2], statistics_data[3], self.lost_percentage()),
+                "datasource": os.environ.get('ROSBAG'),
+                "type": os.environ.get('TYPE')
+            }
+
+    def print_timing_pipeline(self):
+        if self.image_pipeline_msg_sets: 
+            self.print_timeline([self.image_pipeline_msg_sets[self.index_to_plot]])     # timeline of max
+            # self.print_timeline(self.image_pipeline_msg_sets)                         # all timelines
+            # self.print_timeline_average(self.image_pipeline_msg_sets)                 # timeline of averages, NOTE only totals are of interest
+
+    def print_segment_breakdown(self, image_pipeline_msg_sets=None):
+        """
+        Prints the per-segment breakdown of the target chain as a markdown
+        table, the segment most often the bottleneck in bold
+        """
+        breakdown = self.segment_breakdown(image_pipeline_msg_sets)
+        if not breakdown:
+            return
+        bottleneck = max(entry["bottleneck"] for entry in breakdown)
+        str_out = "| Segment | Kind | Mean | p50 | p99 | Max | Share | Critical | Bottleneck |\n"
+        str_out += "| --- | --- | --- | --- | --- | --- | --- | --- | --- |\n"
+        for entry in breakdown:
+            name = "**" + entry["name"] + "**" if bottleneck and entry["bottleneck"] == bottleneck else entry["name"]
+            str_out += "| {} | {} | {:.2f} ms | {:.2f} ms | {:.2f} ms | {:.2f} ms | {:.1f} % | {:.1f} % | {:.1f} % |\n".format(
+                name, entry["kind"], entry["mean"], entry["p50"], entry["p99"], entry["max"], entry["share"] * 100,
+                entry["critical"] * 100, entry["bottleneck"] * 100)
+        print(str_out)
+
+    def print_dag_breakdown(self, image_pipeline_msg_sets=None):
+        """
+        Prints the latency of each branch of a target chain shaped as a
+        graph and the synchronization wait at its joins as markdown tables,
+        nothing for linear chains
+        """
+        if not self.is_dag():
+            return
+        breakdown = self.dag_breakdown(image_pipeline_msg_sets)
+        if not breakdown["branches"]:
+            return
+        str_out = "| Branch | Mean | p50 | p99 | Max | Critical |\n"
+        str_out += "| --- | --- | --- | --- | --- | --- |\n"
+        for entry in breakdown["branches"]:
+            str_out += "| {} | {:.2f} ms | {:.2f} ms | {:.2f} ms | {:.2f} ms | {:.1f} % |\n".format(
+                entry["name"], entry["mean"], entry["p50"], entry["p99"], entry["max"], entry["critical"] * 100)
+        end_to_end = breakdown["end_to_end"]
+        str_out += "| **end to end** | **{:.2f} ms** | {:.2f} ms | {:.2f} ms | {:.2f} ms | |\n".format(
+            end_to_end["mean"], end_to_end["p50"], end_to_end["p99"], end_to_end["max"])
+        print(str_out)
+
+        str_out = "| Join | Inputs | Wait mean | Wait p99 | Wait max | Last input |\n"
+        str_out += "| --- | --- | --- | --- | --- | --- |\n"
+        for entry in breakdown["joins"]:
+            last = ", ".join("{} {:.1f} %".format(name, share * 100) for name, share in entry["last"].items())
+            str_out += "| {} | {} | **{:.2f} ms** | {:.2f} ms | {:.2f} ms | {} |\n".format(
+                entry["name"], len(entry["inputs"]), entry["mean"], entry["p99"], entry["max"], last)
+        print(str_out)
+
+    def print_live_metrics(self, metrics):
+        """
+        Prints a line of rolling metrics, see live_metrics
+        """
+        latency = metrics["latency"]
+        stringout = "[{:8.1f} s] sets {} (lost {})".format(metrics["time"], metrics["sets"], metrics["lost"])
+        if latency:
+            stringout += " | latency mean {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+                latency["mean"], latency["p99"], latency["max"])
+        stringout += " | {:.2f} fps, {:.2f} MB/s".format(metrics["fps"], metrics["MB/s"])
+        if metrics["power"] is not None:
+            stringout += " | {:.2f} W".format(metrics["power"])
+        print(color(stringout, fg="yellow" if metrics["lost"] else "green"))
+
+    def print_drop_funnel(self, image_pipeline_msg_sets=None):
+        """
+        Prints where messages of the target chain were dropped as a markdown
+        table, stages in chain order
+        """
+        if not self.lost_msgs:
+            return
+        funnel = self.drop_funnel(image_pipeline_msg_sets)
+        if funnel is None:
+            print(color("{} messages lost, no drop funnel for chains shaped as graphs".format(self.lost_msgs), fg="yellow"))
+            return
+        str_out = "| Stage | Reached | Dropped | Drop rate |\n"
+        str_out += "| --- | --- | --- | --- |\n"
+        for entry in funnel:
+            rate = "{:.2f} %".format(entry["rate"] * 100)
+            str_out += "| {} | {} | {} | {} |\n".format(
+                entry["stage"], entry["reached"], entry["dropped"],
+                "**" + rate + "**" if entry["dropped"] else rate)
+        print(str_out)
+
+    def print_power_summary(self, summary):
+        """
+        Prints power and energy of a run as a markdown table, see power_summary
+        """
+        str_out = "| Mean | Peak | Energy | Window | J/frame | EDP |\n"
+        str_out += "| --- | --- | --- | --- | --- | --- |\n"
+        str_out += "| **{:.2f}** W | {:.2f} W | {:.2f} J | {:.2f} s | {} | {} |\n".format(
+            summary["mean"], summary["peak"], summary["joules"], summary["seconds"],
+            "{:.4f} J ({} frames)".format(summary["joules_per_frame"], summary["frames"]) if "frames" in summary else "-",
+            "{:.6f} J*s".format(summary["edp"]) if "edp" in summary else "-")
+        print(str_out)
+
+    def print_throughput_summary(self, image_pipeline_msg_sets=None):
+        """
+        Prints the sustained, peak and minimum throughput of the target
+        chain outputs as a markdown table, see throughput_summary
+        """
+        summary = self.throughput_summary(image_pipeline_msg_sets)
+        str_out = "| Throughput | Sustained | Peak | Min | Mean |\n"
+        str_out += "| --- | --- | --- | --- | --- |\n"
+        for units in ("fps", "MB/s"):
+            entry = summary[units]
+            str_out += "| {} window ({:g} s) | **{:.2f}** | {:.2f} | {:.2f} | {:.2f} |\n".format(
+                units, self.throughput_window_ns / 1e9, entry["sustained"], entry["peak"], entry["min"], entry["mean"])
+        print(str_out)
+
+    def upload_results():
+        from ros2benchmark.verb import run
+
+        # commit and push in a new branch called "branch_name" and drop instructions to create a PR
+        # NOTE: conflicts with permissions
+        #   - fatal: could not read Username for 'https://github.com': No such device or address
+        #   - Try authenticating with:  gh auth login
+        run('cd /tmp/benchmarks && git checkout -b ' + branch_name + ' \
+            && git add . \
+            && git config --global user.email "victor@accelerationrobotics.com" \
+            && git config --global user.name "Víctor Mayoral-Vilches" \
+            && git commit -m "' + self.benchmark_name + ' results for ' + os.environ.get('HARDWARE') + ' (' + str(result["value"]) + ')\n \
+            - CI_PIPELINE_URL: ' + os.environ.get('CI_PIPELINE_URL') + '\n \
+            - CI_JOB_URL: ' + os.environ.get('CI_JOB_URL') + '"'
+            , shell=True)
+            # && git push origin ' + branch_name + ' \
+            # && gh pr create --title "Add result" --body "Add result"'
+
+        # show message of last git commit
+        outs, err = run('cd /tmp/benchmarks && git log -1', shell=True)
+        print(outs)
+
+    def add_result(self, result):
+        """        
+        Add results into robotperf/benchmarks repo
+
+        :param: result: dictionary of results
+
+        NOTE: Syntax should follow the following format, see results() method:
+            {
+                "hardware": "kr260",
+                "category": "perception",
+                "timestampt": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time())),
+                "value": 15.2,
+                "metric": "latency",
+                "metric_unit": "ms",
+                "note": "Note",
+                "datasource": "perception/image"
+            }            
+
+        NOTE 2: repo's assumed already cloned at /tmp/benchmarks.
+
+        NOTE 3: results are appended to the repo's results journal (see
+        ros2benchmark.api.journal), "ros2 benchmark compact" folds them into
+        each benchmark.yaml.
+        """
+        from ros2benchmark.api.journal import JOURNAL_FILENAME, append_result
+
+        # prepend special NOTE env. variable to result        
+        if "NOTE" in os.environ:
+            result["note"] = os.environ.get("NOTE") + result["note"]
+
+
+        path_repo = "/tmp/benchmarks"
+
+        # # fetch repo
+        # run('if [ -d "/tmp/benchmarks" ]; then cd ' + path_repo +  ' && git pull; \
+        #         else cd /tmp && git clone https://github.com/robotperf/benchmarks; fi',
+        #     shell=True)
+
+        if os.path.exists(path_repo):
+            append_result(os.path.join(path_repo, JOURNAL_FILENAME), self.benchmark_name, result)
+            print(color("Result added to " + self.benchmark_name + ": " + str(result), fg="green"))
+
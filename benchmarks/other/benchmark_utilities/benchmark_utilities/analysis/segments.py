@@ -0,0 +1,272 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import re
+from collections import namedtuple
+import numpy as np
+
+from benchmark_utilities.analysis.statistics import DEFAULT_PERCENTILES, describe, ns_to_ms
+
+# a span of a chain between two of its tracepoints (positions start and end)
+#   kind: "callback" (*_cb_init -> *_cb_fini), "op" (*_init -> *_fini),
+#         "rclcpp" (ros2:callback_start -> ros2:callback_end),
+#         "kernel" (pairs of ros2:vitis_profiler:kernel_enqueue) or
+#         "transport" (gap between two consecutive nodes)
+Segment = namedtuple("Segment", ["name", "kind", "start", "end"])
+
+# colors used to draw each kind of segment
+SEGMENT_COLORS = {
+    "callback": "lightgray",
+    "op": "seashell",
+    "rclcpp": "whitesmoke",
+    "kernel": "palegreen",
+    "transport": "khaki",
+}
+
+# segment kinds delimiting the work of a node
+NODE_KINDS = ("callback", "rclcpp")
+
+SUFFIXES = (
+    ("_cb_init", "callback", True),
+    ("_cb_fini", "callback", False),
+    ("_init", "op", True),
+    ("_fini", "op", False),
+)
+
+
+def classify(name):
+    """
+    Returns (key, kind, opens) of a tracepoint, where key identifies the
+    tracepoints delimiting the same segment, or None if the tracepoint
+    delimits no segment
+
+    :param: name: tracepoint name, e.g. "ros2_image_pipeline:image_proc_rectify_cb_init"
+    """
+    if name == "ros2:callback_start":
+        return "ros2:callback", "rclcpp", True
+    if name == "ros2:callback_end":
+        return "ros2:callback", "rclcpp", False
+    if name == "ros2:vitis_profiler:kernel_enqueue":
+        return name, "kernel", None  # opens or closes, alternately
+    for suffix, kind, opens in SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)], kind, opens
+    return None
+
+
+def segment_label(label):
+    """
+    Segment label out of the (disambiguated) label of its first tracepoint,
+    e.g. "robotperf_benchmarks:robotperf_image_input_cb_init (2)" -> "robotperf_image_input (2)"
+    """
+    if label.startswith("ros2:callback_start"):
+        return "rclcpp callback" + label[len("ros2:callback_start"):]
+    if label.startswith("ros2:vitis_profiler:kernel_enqueue"):
+        return "kernel" + label[len("ros2:vitis_profiler:kernel_enqueue"):]
+    return re.sub(r"_(cb_)?init\b", "", label.split(":")[-1], count=1)
+
+
+def chain_segments(chain, labels=None, parents=None):
+    """
+    Derives the segments of a chain out of its tracepoint pairs
+
+    Tracepoints are paired as nested spans (e.g. rectify_cb_init,
+    rectify_init, rectify_fini, rectify_cb_fini), each closing tracepoint
+    closing the innermost open span of the same key. Consecutive nodes
+    (outermost callback spans) are linked by "transport" segments; in
+    chains shaped as graphs, each node to those it's a parent of.
+
+    :param: chain: list of tracepoint names, in order
+    :param: labels: disambiguated names of the tracepoints, used to name segments
+    :param: parents: parents of each tracepoint (positions, see
+    chain_parents), None for a linear chain
+    :returns: list of Segment, ordered by start
+    """
+    if labels is None:
+        labels = chain
+    segments = []
+    stack = []  # open spans: (key, kind, position)
+    for position, name in enumerate(chain):
+        classified = classify(name)
+        if classified is None:
+            continue
+        key, kind, opens = classified
+        if opens is None:  # alternating tracepoints
+            opens = not any(entry[0] == key for entry in stack)
+        if opens:
+            stack.append((key, kind, position))
+            continue
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == key and stack[index][1] == kind:
+                start = stack.pop(index)[2]
+                segments.append(Segment(segment_label(labels[start]), kind, start, position))
+                break
+
+    # name rclcpp callbacks after the userland callback they run
+    for index, segment in enumerate(segments):
+        if segment.kind != "rclcpp":
+            continue
+        for nested in segments:
+            if nested.kind == "callback" and segment.start < nested.start and nested.end < segment.end:
+                segments[index] = segment._replace(name=nested.name + " (rclcpp)")
+                break
+
+    nodes = node_segments(segments)
+    if parents is None:
+        links = zip(nodes, nodes[1:])
+    else:
+        # the node holding each parent of the first tracepoint of a node
+        links = [(previous, following) for following in nodes for parent in parents[following.start]
+                 for previous in nodes if previous.start <= parent <= previous.end]
+    for previous, following in links:
+        if following.start > previous.end:
+            segments.append(Segment(
+                previous.name + " -> " + following.name, "transport", previous.end, following.start))
+
+    segments.sort(key=lambda segment: (segment.start, -segment.end))
+    return segments
+
+
+def node_segments(segments):
+    """
+    Outermost callback spans of a chain (the work of each node), ordered by start
+    """
+    candidates = sorted(
+        [segment for segment in segments if segment.kind in NODE_KINDS],
+        key=lambda segment: (segment.start, -segment.end))
+    nodes = []
+    for segment in candidates:
+        if nodes and segment.end <= nodes[-1].end:
+            continue  # nested in the previous node
+        nodes.append(segment)
+    return nodes
+
+
+def path_segments(segments):
+    """
+    Segments the latency of a chain adds up from, in order: the nodes and
+    the transports between them
+    """
+    nodes = node_segments(segments)
+    transports = [segment for segment in segments if segment.kind == "transport"]
+    return sorted(nodes + transports, key=lambda segment: segment.start)
+
+
+def hop_stages(chain, labels=None):
+    """
+    Names the stage each hop of a chain (from a tracepoint to the next one)
+    belongs to: the node (see node_segments) containing both tracepoints,
+    the transport between two nodes, or the next tracepoint if neither
+
+    :param: chain: list of tracepoint names, in order
+    :param: labels: disambiguated names of the tracepoints, used to name stages
+    :returns: list of stage names, one per hop (len(chain) - 1)
+    """
+    if labels is None:
+        labels = chain
+    segments = chain_segments(chain, labels)
+    nodes = node_segments(segments)
+    transports = [segment for segment in segments if segment.kind == "transport"]
+    stages = []
+    for position in range(len(chain) - 1):
+        for segment in nodes + transports:
+            if segment.start <= position and position + 1 <= segment.end:
+                stages.append(segment.name)
+                break
+        else:
+            stages.append(segment_label(labels[position + 1]))
+    return stages
+
+
+def ns_matrix(image_pipeline_msg_sets):
+    """
+    Timestamps of a list of message sets as an int64 array (sets x tracepoints)
+    """
+    return np.array(
+        [[msg.ns for msg in msg_set] for msg_set in image_pipeline_msg_sets],
+        dtype=np.int64).reshape(len(image_pipeline_msg_sets), -1)
+
+
+def relative_ns(ns):
+    """
+    Time elapsed since the previous tracepoint of each set, int64 (sets x
+    tracepoints), 0 for the first tracepoint
+
+    :param: ns: int64 timestamps, sets x tracepoints (see ns_matrix)
+    """
+    return np.diff(ns, axis=1, prepend=ns[:, :1])
+
+
+def offsets_ns(ns):
+    """
+    Time elapsed since the first tracepoint of each set, int64 (sets x tracepoints)
+
+    :param: ns: int64 timestamps, sets x tracepoints (see ns_matrix)
+    """
+    return ns - ns[:, :1]
+
+
+def segment_durations(ns, segments):
+    """
+    Durations of each segment for every set, in milliseconds (sets x segments)
+
+    :param: ns: int64 timestamps, sets x tracepoints (see ns_matrix)
+    :param: segments: list of Segment
+    """
+    starts = [segment.start for segment in segments]
+    ends = [segment.end for segment in segments]
+    return ns_to_ms(ns[:, ends] - ns[:, starts])
+
+
+def segment_breakdown(ns, segments, percentiles=DEFAULT_PERCENTILES, parents=None):
+    """
+    Latency distribution of each segment, its share of the end-to-end
+    latency of the chain and how often it's critical
+
+    The critical path of each set walks back from the last tracepoint
+    through the parent traced last (see critical_mask), segments are on it
+    when both their tracepoints are. The bottleneck of each set is the
+    longest node or transport (see path_segments) on its critical path.
+
+    :param: ns: int64 timestamps, sets x tracepoints (see ns_matrix)
+    :param: segments: list of Segment
+    :param: parents: parents of each tracepoint (positions, see
+    chain_parents), None for a linear chain
+    :returns: list of dicts, one per segment, with the segment fields, its
+    statistics (see describe), "share" (of the mean end-to-end latency),
+    "critical" (fraction of sets it's on the critical path of) and
+    "bottleneck" (fraction of sets it's the bottleneck of)
+    """
+    # imported here, dag depends on this module
+    from benchmark_utilities.analysis.dag import critical_mask
+
+    if not len(ns) or not segments:
+        return []
+    if parents is None:
+        parents = [(position - 1,) if position else () for position in range(ns.shape[1])]
+    durations = segment_durations(ns, segments)
+    summary = describe(durations.T, percentiles)
+    sources = [position for position, parent in enumerate(parents) if not parent]
+    end_to_end = float(ns_to_ms(np.mean(ns[:, -1] - ns[:, sources].min(axis=1))))
+
+    mask = critical_mask(ns, parents)
+    critical = mask[:, [segment.start for segment in segments]] & mask[:, [segment.end for segment in segments]]
+    path = set(path_segments(segments))
+    candidates = np.array([index for index, segment in enumerate(segments) if segment in path], dtype=np.int64)
+    bottlenecks = np.zeros(len(segments))
+    if len(candidates):
+        longest = np.argmax(np.where(critical[:, candidates], durations[:, candidates], -np.inf), axis=1)
+        bottlenecks = np.bincount(candidates[longest], minlength=len(segments)) / len(ns)
+
+    breakdown = []
+    for index, segment in enumerate(segments):
+        entry = segment._asdict()
+        entry.update({key: float(value[index]) for key, value in summary.items()})
+        entry["share"] = entry["mean"] / end_to_end if end_to_end else float("nan")
+        entry["critical"] = float(np.mean(critical[:, index]))
+        entry["bottleneck"] = float(bottlenecks[index])
+        breakdown.append(entry)
+    return breakdown
@@ -0,0 +1,124 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import numpy as np
+
+# percentiles reported by default, along with mean, rms, max and min
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+# timestamps are carried as int64 nanoseconds, milliseconds are only for presentation
+NS_PER_MS = 1000000
+
+
+def ns_to_ms(ns):
+    """
+    Milliseconds (float64) out of int64 nanoseconds
+
+    NOTE: meant for presentation, convert once results are computed
+    """
+    return np.asarray(ns) / NS_PER_MS
+
+
+def latency_ms(latencies):
+    """
+    Latencies in milliseconds, integer latencies being nanoseconds (see
+    barchart_data_latency_ns) and float latencies already milliseconds
+    """
+    latencies = np.asarray(latencies)
+    if np.issubdtype(latencies.dtype, np.integer):
+        return ns_to_ms(latencies)
+    return latencies.astype(np.float64)
+
+
+def latency_array(image_pipeline_msg_sets_ms):
+    """
+    Returns the latency sets as a 2-D array (chains x tracepoints), int64
+    if given integer nanoseconds, float64 (ms) otherwise
+
+    :param: image_pipeline_msg_sets_ms: list of lists (e.g. resulting from
+    barchart_data_latency) or 2-D array, each row containing the relative
+    latencies of a chain
+    """
+    latencies = np.asarray(image_pipeline_msg_sets_ms)
+    if np.issubdtype(latencies.dtype, np.integer):
+        latencies = latencies.astype(np.int64)
+    else:
+        latencies = latencies.astype(np.float64)
+    if latencies.ndim == 1:
+        latencies = latencies.reshape(-1, 1)
+    return latencies
+
+
+def chain_totals(latencies, indices_list=(None,)):
+    """
+    Per-chain sums of latencies, one row per entry in indices_list, exact
+    (int64) for nanoseconds
+
+    :param: latencies: 2-D array (chains x tracepoints)
+    :param: indices_list: list of tracepoint indices to sum on each chain,
+    None sums all tracepoints of the chain
+    """
+    latencies = latency_array(latencies)
+    totals = np.empty((len(indices_list), latencies.shape[0]), dtype=latencies.dtype)
+    for row, indices in enumerate(indices_list):
+        if indices is None:
+            np.sum(latencies, axis=1, out=totals[row])
+        else:
+            np.sum(latencies[:, list(indices)], axis=1, out=totals[row])
+    return totals
+
+
+def describe(values, percentiles=DEFAULT_PERCENTILES):
+    """
+    Mean, RMS, max, min, standard deviation and percentiles, computed
+    along the last axis of values
+
+    :param: values: 1-D array of samples or 2-D array with one series per row
+    :param: percentiles: percentiles to compute (0-100)
+    :returns: dict of floats (or of 1-D arrays, one entry per row, if values is 2-D)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    summary = {
+        "mean": np.mean(values, axis=-1),
+        "rms": np.sqrt(np.mean(np.square(values), axis=-1)),
+        "max": np.max(values, axis=-1),
+        "min": np.min(values, axis=-1),
+        "std": np.std(values, axis=-1),
+    }
+    if percentiles:
+        computed = np.percentile(values, percentiles, axis=-1)
+        for percentile, value in zip(percentiles, computed):
+            summary[percentile_label(percentile)] = value
+    if values.ndim == 1:
+        summary = {key: float(value) for key, value in summary.items()}
+    return summary
+
+
+def percentile_label(percentile):
+    """
+    Returns the label of a percentile, e.g. 99.9 -> "p99.9", 50 -> "p50"
+    """
+    return "p" + ("{:g}".format(percentile))
+
+
+def chain_statistics(image_pipeline_msg_sets_ms, indices=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    Statistics of the chain totals and of the totals over a subset of
+    tracepoints, computed in a single vectorized pass
+
+    :param: image_pipeline_msg_sets_ms: chains x tracepoints latencies, in
+    ms or int64 ns (see latency_ms)
+    :param: indices: tracepoint indices of the subset (e.g. the benchmark
+    boundaries), None to use the whole chain
+    :returns: dict with the "total" and "benchmark" (subset) statistics, in ms
+    """
+    totals = chain_totals(image_pipeline_msg_sets_ms, [None, indices])
+    summary = describe(latency_ms(totals), percentiles)
+    return {
+        "total": {key: float(value[0]) for key, value in summary.items()},
+        "benchmark": {key: float(value[1]) for key, value in summary.items()},
+        "count": int(totals.shape[1]),
+    }
@@ -0,0 +1,127 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import os
+import numpy as np
+
+from benchmark_utilities.analysis.cache import DEFAULT_CACHE_DIR, cache_key, events_to_columns, save_columns
+from benchmark_utilities.analysis.events import TraceEvent
+
+# file marking a directory as a synthetic trace, see write_synthetic_trace
+SYNTHETIC_MARKER = "synthetic"
+
+
+def synthesize_events(
+    chain,
+    rate=30.0,
+    duration=10.0,
+    drop_rate=0.0,
+    stage_ns=100000,
+    jitter_ns=20000,
+    threads=1,
+    vpid=1000,
+    start_ns=1000000000000,
+    seed=0,
+    parents=None,
+):
+    """
+    Generates the events of a chain as a pipeline processing frames would
+    trace them, in time order
+
+    Each frame goes through the chain, one event per tracepoint, spending
+    stage_ns plus a jitter (absolute value of a normal) between consecutive
+    tracepoints. Frames are processed by threads threads of the same
+    process in turn, so frames whose latency exceeds the period (1 / rate)
+    interleave, as with multithreaded executors. Dropped frames stop at a
+    random tracepoint. Events carry the header stamp of their frame (its
+    start time), see BenchmarkAnalyzer.timestamp_identifier.
+
+    Chains shaped as graphs (see chain_parents) trace each tracepoint
+    after the last of its parents, sources right as the frame starts.
+
+    :param: chain: list of tracepoint names (e.g. BenchmarkAnalyzer.target_chain)
+    :param: rate: frames per second
+    :param: duration: seconds of trace
+    :param: drop_rate: fraction of frames dropped before the end of the chain
+    :param: stage_ns: mean time between consecutive tracepoints of a frame
+    :param: jitter_ns: standard deviation of the time between tracepoints
+    :param: threads: number of threads processing frames
+    :param: vpid: process id of the events
+    :param: start_ns: timestamp of the first frame
+    :param: seed: seed of the random generator, same seed same events
+    :param: parents: parents of each tracepoint (positions), None for a linear chain
+    :returns: list of TraceEvent, ordered by timestamp
+    """
+    rng = np.random.default_rng(seed)
+    frames = int(rate * duration)
+    length = len(chain)
+
+    # timestamps, frames x tracepoints
+    starts = start_ns + np.round(np.arange(frames) * (1e9 / rate)).astype(np.int64)
+    gaps = np.abs(stage_ns + rng.normal(0.0, jitter_ns, size=(frames, length))).astype(np.int64) + 1
+    gaps[:, 0] = 0
+    if parents is None:
+        ns = starts[:, None] + np.cumsum(gaps, axis=1)
+    else:
+        ns = np.empty((frames, length), dtype=np.int64)
+        for position, parent in enumerate(parents):
+            previous = ns[:, list(parent)].max(axis=1) if parent else starts
+            ns[:, position] = previous + gaps[:, position]
+
+    # number of tracepoints traced for each frame
+    traced = np.full(frames, length, dtype=np.int64)
+    dropped = rng.random(frames) < drop_rate
+    if length > 1:
+        traced[dropped] = rng.integers(1, length, size=int(dropped.sum()))
+
+    frame_index, position = np.nonzero(np.arange(length)[None, :] < traced[:, None])
+    timestamps = ns[frame_index, position]
+    order = np.lexsort((position, frame_index, timestamps))
+
+    header_sec, header_nsec = np.divmod(starts, 1000000000)
+    vtids = vpid + 1 + frame_index % max(threads, 1)
+    frame_index = frame_index[order].tolist()
+    position = position[order].tolist()
+    timestamps = timestamps[order].tolist()
+    vtids = vtids[order].tolist()
+    header_sec = header_sec.tolist()
+    header_nsec = header_nsec.tolist()
+    names = list(chain)
+    return [
+        TraceEvent(
+            names[position[i]],
+            timestamps[i],
+            vpid,
+            vtids[i],
+            header_sec[frame_index[i]],
+            header_nsec[frame_index[i]],
+        )
+        for i in range(len(timestamps))
+    ]
+
+
+def write_synthetic_trace(tracename, events, names, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Writes synthetic events as a trace the analyzer can read without
+    babeltrace nor LTTng
+
+    The trace directory only holds a marker file, while its events are
+    stored as the columns of the trace in the columnar cache (see
+    trace_columns), where the analyzer looks for them before decoding.
+    Analyzers reading it must use the same cache_dir (see set_trace_cache)
+    and chains made of the given names.
+
+    :param: tracename: directory of the synthetic trace
+    :param: events: TraceEvent, ordered by timestamp (see synthesize_events)
+    :param: names: event names of the analyzer, target_chain + power_chain
+    :param: cache_dir: directory of the columnar cache
+    """
+    os.makedirs(tracename, exist_ok=True)
+    with open(os.path.join(tracename, SYNTHETIC_MARKER), "w") as f:
+        f.write("synthetic trace, events in " + os.path.abspath(cache_dir) + "\n")
+    names = tuple(sorted(set(names)))
+    save_columns(os.path.join(cache_dir, cache_key(tracename, names) + ".npz"), events_to_columns(events, names))
+    return tracename
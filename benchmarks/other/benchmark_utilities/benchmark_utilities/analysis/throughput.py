@@ -0,0 +1,183 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import numpy as np
+
+NS_PER_S = 1000000000
+
+# length of the windows throughput is measured over, and time constant of the decayed rates
+DEFAULT_THROUGHPUT_WINDOW_NS = 1 * NS_PER_S
+DEFAULT_TIME_CONSTANT_NS = 1 * NS_PER_S
+
+# largest exponent (in time constants) accumulated before rebasing decayed rates
+_MAX_EXPONENT = 500.0
+
+
+def size_index(image_pipeline_msg_sets):
+    """
+    Position of the output tracepoint carrying message sizes, the last
+    tracepoint of the chain with a msg_size field, None if none has it
+
+    :param: image_pipeline_msg_sets: list of message sets (TraceEvent)
+    """
+    for msg_set in image_pipeline_msg_sets:
+        positions = [index for index, msg in enumerate(msg_set) if msg.msg_sizes]
+        if positions:
+            return positions[-1]
+    return None
+
+
+def output_series(image_pipeline_msg_sets):
+    """
+    Timestamps of the output of each set and bytes delivered with it
+
+    The output is the last tracepoint of each set, its size the one traced
+    by the last tracepoint with a msg_size field (see size_index).
+
+    :param: image_pipeline_msg_sets: list of message sets (TraceEvent)
+    :returns: (int64 ns, int64 bytes), ordered by timestamp
+    """
+    index = size_index(image_pipeline_msg_sets)
+    ns = np.array([msg_set[-1].ns for msg_set in image_pipeline_msg_sets], dtype=np.int64)
+    if index is None:
+        sizes = np.zeros(len(ns), dtype=np.int64)
+    else:
+        sizes = np.array([sum(msg_set[index].msg_sizes) for msg_set in image_pipeline_msg_sets], dtype=np.int64)
+    order = np.argsort(ns, kind="stable")
+    return ns[order], sizes[order]
+
+
+def windowed_rates(ns, values=None, window_ns=DEFAULT_THROUGHPUT_WINDOW_NS, times_ns=None):
+    """
+    Rates over a fixed window trailing each time, with cumulative sums
+
+    The rate at time t counts the events (or sums their values) within
+    (t - window_ns, t]. Only times with a full window behind them (since
+    the first event) are evaluated, if the series is shorter than a
+    window the rate over the whole series is returned instead. Series
+    spanning no time (a single event, or all at once) have no rates.
+
+    :param: ns: int64 timestamps of the events, ordered
+    :param: values: per-event values (e.g. bytes), None to count events
+    :param: window_ns: length of the window
+    :param: times_ns: times to evaluate the rates at, the timestamps of the events by default
+    :returns: (int64 times, float64 rates per second)
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if not len(ns) or ns[-1] == ns[0]:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    values = np.ones(len(ns), dtype=np.int64) if values is None else np.asarray(values)
+    cumulative = np.concatenate(([0], np.cumsum(values)))
+
+    if ns[-1] - ns[0] < window_ns:
+        rate = (cumulative[-1] - cumulative[1]) * NS_PER_S / (ns[-1] - ns[0])
+        return ns[-1:], np.array([rate], dtype=np.float64)
+
+    times = ns if times_ns is None else np.asarray(times_ns, dtype=np.int64)
+    times = times[times >= ns[0] + window_ns]
+    upper = np.searchsorted(ns, times, side="right")
+    lower = np.searchsorted(ns, times - window_ns, side="right")
+    return times, (cumulative[upper] - cumulative[lower]) * (NS_PER_S / window_ns)
+
+
+def decayed_rates(ns, values=None, time_constant_ns=DEFAULT_TIME_CONSTANT_NS):
+    """
+    Exponentially decayed rates, evaluated at each event
+
+    Each event contributes its value decayed by exp(-age / time_constant),
+    the rate being the decayed sum over the time constant (which matches
+    the rate of a steady series once a few time constants elapsed). Sums
+    are vectorized with cumulative sums, rebased every _MAX_EXPONENT time
+    constants so that exponentials don't overflow. Series spanning no
+    time have no rates, as in windowed_rates.
+
+    :param: ns: int64 timestamps of the events, ordered
+    :param: values: per-event values (e.g. bytes), None to count events
+    :param: time_constant_ns: time constant of the decay
+    :returns: (int64 times, float64 rates per second)
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if not len(ns) or ns[-1] == ns[0]:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    values = np.ones(len(ns)) if values is None else np.asarray(values, dtype=np.float64)
+    ages = (ns - ns[:1]) / time_constant_ns
+    sums = np.empty(len(ns), dtype=np.float64)
+
+    carry = 0.0  # decayed sum at the last event of the previous block
+    carry_age = 0.0
+    start = 0
+    while start < len(ns):
+        end = max(int(np.searchsorted(ages, ages[start] + _MAX_EXPONENT, side="right")), start + 1)
+        relative = ages[start:end] - ages[start]
+        block = np.cumsum(values[start:end] * np.exp(relative))
+        sums[start:end] = np.exp(-relative) * (block + carry * np.exp(carry_age - ages[start]))
+        carry = sums[end - 1]
+        carry_age = ages[end - 1]
+        start = end
+    return ns, sums * (NS_PER_S / time_constant_ns)
+
+
+def sustained_rate(ns, values=None):
+    """
+    Rate between the first and the last event, per second (NaN if they coincide)
+
+    NOTE: the first event opens the interval, its value isn't counted
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if len(ns) < 2 or ns[-1] == ns[0]:
+        return float("nan")
+    total = len(ns) - 1 if values is None else float(np.sum(np.asarray(values)[1:]))
+    return float(total * NS_PER_S / (ns[-1] - ns[0]))
+
+
+def throughput_summary(ns, sizes, window_ns=DEFAULT_THROUGHPUT_WINDOW_NS,
+                       time_constant_ns=DEFAULT_TIME_CONSTANT_NS):
+    """
+    Sustained, peak and minimum throughput of a series of outputs, in fps
+    and MB/s, along with their time series
+
+    Peak and minimum are taken over the fixed windows (see windowed_rates),
+    so that a single burst or stall within a window doesn't dominate them.
+
+    :param: ns: int64 timestamps of the outputs, ordered (see output_series)
+    :param: sizes: bytes delivered with each output
+    :param: window_ns: length of the fixed windows
+    :param: time_constant_ns: time constant of the decayed rates
+    :returns: dict with "fps" and "MB/s" entries, each a dict with
+    "sustained", "peak", "min" and "mean" (of the windows), and "series",
+    a dict of arrays for plotting: "time" (s since the first output),
+    "fps", "MB/s" (fixed windows), "time_decayed", "fps_decayed" and
+    "MB/s_decayed"
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    times, fps = windowed_rates(ns, None, window_ns)
+    _, byps = windowed_rates(ns, sizes, window_ns)
+    times_decayed, fps_decayed = decayed_rates(ns, None, time_constant_ns)
+    _, byps_decayed = decayed_rates(ns, sizes, time_constant_ns)
+
+    def summarize(sustained, rates):
+        finite = rates[np.isfinite(rates)]
+        return {
+            "sustained": sustained,
+            "peak": float(np.max(finite)) if len(finite) else float("nan"),
+            "min": float(np.min(finite)) if len(finite) else float("nan"),
+            "mean": float(np.mean(finite)) if len(finite) else float("nan"),
+        }
+
+    origin = ns[0] if len(ns) else 0
+    return {
+        "fps": summarize(sustained_rate(ns), fps),
+        "MB/s": summarize(sustained_rate(ns, sizes) / 1e6, byps / 1e6),
+        "series": {
+            "time": (times - origin) / NS_PER_S,
+            "fps": fps,
+            "MB/s": byps / 1e6,
+            "time_decayed": (times_decayed - origin) / NS_PER_S,
+            "fps_decayed": fps_decayed,
+            "MB/s_decayed": byps_decayed / 1e6,
+        },
+    }
@@ -0,0 +1,90 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Fixtures shared by the tests of the analysis, which run over synthetic
+# traces (see benchmark_utilities.analysis.synthetic) out of the chains of
+# the benchmarks of this repository, without ROS 2, LTTng nor babeltrace2
+
+import glob
+import importlib.util
+import itertools
+import os
+
+import pytest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS_DIR = os.path.join(TEST_DIR, "..", "..", "..")
+
+# needed to import the analysis, its tests aren't collected without them
+ANALYSIS_DEPENDENCIES = ("numpy", "yaml", "wasabi")
+
+# tests that don't import the analysis
+STANDALONE_TESTS = ("test_copyright.py", "test_flake8.py", "test_pep257.py", "test_import_time.py")
+
+collect_ignore = []
+if any(importlib.util.find_spec(module) is None for module in ANALYSIS_DEPENDENCIES):
+    collect_ignore = [file for file in sorted(os.listdir(TEST_DIR))
+                      if file.startswith("test_") and file.endswith(".py") and file not in STANDALONE_TESTS]
+
+
+def find_benchmark_yaml(benchmark):
+    """
+    Path of the benchmark.yaml of a benchmark of this repository, e.g. "a1_perception_2nodes"
+    """
+    (path,) = glob.glob(os.path.join(BENCHMARKS_DIR, "*", benchmark, "benchmark.yaml"))
+    return path
+
+
+@pytest.fixture(scope="session")
+def benchmark_yaml():
+    return find_benchmark_yaml
+
+
+@pytest.fixture
+def make_analyzer(tmp_path):
+    """
+    Builds analyzers out of the benchmark.yaml of a benchmark, caching
+    traces in a temporary directory
+    """
+    from benchmark_utilities.analysis import BenchmarkAnalyzer
+
+    def make(benchmark="a1_perception_2nodes", hardware_device_type="cpu", integrated=False, cache_dir=None):
+        ba = BenchmarkAnalyzer.from_benchmark_yaml(find_benchmark_yaml(benchmark), hardware_device_type, integrated)
+        ba.set_trace_cache(str(tmp_path / "cache") if cache_dir is None else cache_dir)
+        return ba
+
+    return make
+
+
+@pytest.fixture
+def analyzer(make_analyzer):
+    return make_analyzer()
+
+
+@pytest.fixture
+def synthetic_trace(tmp_path):
+    """
+    Writes synthetic traces of the target chain of an analyzer into its
+    cache, returning their path
+
+    Events are synthesized out of the keyword arguments (see
+    synthesize_events) unless given, following the parents of the chain
+    if it's shaped as a graph.
+    """
+    from benchmark_utilities.analysis.synthetic import synthesize_events, write_synthetic_trace
+
+    traces = itertools.count()
+
+    def write(ba, events=None, **synthetic):
+        if events is None:
+            if ba.is_dag():
+                synthetic.setdefault("parents", ba.chain_parents())
+            events = synthesize_events(ba.target_chain, **synthetic)
+        return write_synthetic_trace(
+            str(tmp_path / "trace{}".format(next(traces))), events,
+            ba.target_chain + ba.power_chain, ba.trace_cache_dir)
+
+    return write
@@ -0,0 +1,111 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Throughput of the analyzer, e.g.:
+#   python3 -m pytest test/test_analysis_benchmark.py --benchmark-only
+
+import resource
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmark_utilities.analysis import BenchmarkAnalyzer  # noqa: E402
+from benchmark_utilities.analysis.synthetic import synthesize_events, write_synthetic_trace  # noqa: E402
+
+# benchmarks whose (cpu) target chain is analyzed
+CHAINS = {
+    "a1": "a1_perception_2nodes",
+    "d2": "d2_collision_checking_fcl",
+}
+
+# synthetic trace: 2 threads at 100 Hz, frames overlapping (latency > period), 2 % dropped
+SYNTHETIC = {
+    "rate": 100.0,
+    "duration": 60.0,
+    "drop_rate": 0.02,
+    "stage_ns": 1500000,
+    "jitter_ns": 300000,
+    "threads": 2,
+}
+
+ROUNDS = 5
+
+
+@pytest.fixture(scope="module")
+def analyzer(benchmark_yaml):
+    def make(chain_id, cache_dir):
+        ba = BenchmarkAnalyzer.from_benchmark_yaml(benchmark_yaml(CHAINS[chain_id]))
+        ba.set_trace_cache(cache_dir)
+        return ba
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def traces(tmp_path_factory, analyzer):
+    """
+    Synthetic traces of each chain: all the events in one trace, and split
+    in two (CTF and VTF) by tracepoint position
+    """
+    root = tmp_path_factory.mktemp("synthetic")
+    cache_dir = str(root / "cache")
+    traces = {}
+    for chain_id in CHAINS:
+        ba = analyzer(chain_id, cache_dir)
+        names = ba.target_chain + ba.power_chain
+        events = synthesize_events(ba.target_chain, **SYNTHETIC)
+        positions = {name: position for position, name in enumerate(ba.target_chain)}
+        ctf = [event for event in events if positions[event.name] % 2 == 0]
+        vtf = [event for event in events if positions[event.name] % 2 == 1]
+        traces[chain_id] = {
+            "events": len(events),
+            "trace": write_synthetic_trace(str(root / chain_id / "trace"), events, names, cache_dir),
+            "ctf": write_synthetic_trace(str(root / chain_id / "ctf"), ctf, names, cache_dir),
+            "vtf": write_synthetic_trace(str(root / chain_id / "vtf"), vtf, names, cache_dir),
+            "cache_dir": cache_dir,
+        }
+    return traces
+
+
+def msgsets(ba, path, trace):
+    if path == "trace":
+        return ba.msgsets_from_trace(trace["trace"])
+    if path == "identifier":
+        return ba.msgsets_from_trace_identifier(trace["trace"])
+    return ba.msgsets_from_ctf_vtf_traces(trace["ctf"], trace["vtf"])
+
+
+@pytest.mark.parametrize("path", ["trace", "identifier", "ctf_vtf"])
+@pytest.mark.parametrize("chain_id", sorted(CHAINS))
+def test_msgsets_throughput(benchmark, analyzer, traces, chain_id, path):
+    trace = traces[chain_id]
+
+    def setup():
+        # columns are loaded from the on-disk cache in each round, as in a new process
+        return (analyzer(chain_id, trace["cache_dir"]), path, trace), {}
+
+    sets = benchmark.pedantic(msgsets, setup=setup, rounds=ROUNDS)
+
+    tracemalloc.start()
+    ba = analyzer(chain_id, trace["cache_dir"])
+    assert len(msgsets(ba, path, trace)) == len(sets)
+    peak_traced = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # frames either form a set or are accounted as lost
+    frames = int(SYNTHETIC["rate"] * SYNTHETIC["duration"])
+    assert len(sets) + ba.lost_msgs == frames
+    assert all(len(new_set) == len(ba.target_chain) for new_set in sets)
+    if path == "identifier":
+        # sets are told apart by header stamp, only dropped frames are lost
+        assert ba.lost_msgs < frames * 3 * SYNTHETIC["drop_rate"]
+
+    benchmark.extra_info["events"] = trace["events"]
+    benchmark.extra_info["events_per_second"] = trace["events"] / benchmark.stats.stats.min
+    benchmark.extra_info["peak_traced_kb"] = peak_traced // 1024
+    benchmark.extra_info["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -0,0 +1,23 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Analyzers out of the benchmark.yaml files of the repository
+
+
+def test_cpu_integrated_uses_cpu_chain(make_analyzer):
+    # launch files forward --integrated whatever the hardware, cpu has a single chain
+    cpu = make_analyzer(hardware_device_type="cpu")
+    integrated = make_analyzer(hardware_device_type="cpu", integrated=True)
+    assert integrated.target_chain
+    assert integrated.target_chain == cpu.target_chain
+    assert integrated.benchmark_indices() == cpu.benchmark_indices()
+
+
+def test_fpga_integrated_chain(make_analyzer):
+    fpga = make_analyzer(hardware_device_type="fpga")
+    integrated = make_analyzer(hardware_device_type="fpga", integrated=True)
+    assert integrated.target_chain
+    assert integrated.target_chain != fpga.target_chain
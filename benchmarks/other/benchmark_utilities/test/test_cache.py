@@ -0,0 +1,83 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Columnar cache of decoded traces and merging of its columns (decoding is
+# replaced by synthetic events)
+
+import os
+
+from benchmark_utilities.analysis import cache
+from benchmark_utilities.analysis.events import TraceEvent, merge_events
+from benchmark_utilities.analysis.parallel import merge_columns
+
+NAMES = ["a", "b", "c"]
+
+
+def make_events(count):
+    return [
+        TraceEvent(NAMES[i % 3], 1000 * i, 1, 2, i, 10 * i,
+                   tuple(range(i % 4)), 30.0 if i % 3 == 2 else None, None)
+        for i in range(count)
+    ]
+
+
+def fields(events):
+    return [tuple(getattr(event, field) for field in TraceEvent.__slots__) for event in events]
+
+
+def test_chunked_iteration():
+    events = make_events(1000)
+    columns = cache.events_to_columns(events, NAMES)
+    assert fields(cache.iter_column_events(columns, chunk=7)) == fields(events)
+    assert fields(cache.iter_column_events(columns, ["b"], chunk=64)) == fields(e for e in events if e.name == "b")
+    assert fields(cache.iter_column_events(columns, ["d"], chunk=64)) == []
+
+
+def test_merge_columns_matches_merge_events():
+    # out of phase streams (e.g. one per CPU), every other timestamp shared
+    streams = [
+        [TraceEvent(NAMES[i % 3], phase + period * i, 1, stream, i, 0, tuple(range(stream + i % 3)))
+         for i in range(count)]
+        for stream, (phase, period, count) in enumerate(((0, 1000, 300), (500, 500, 500), (0, 2000, 100)))
+    ]
+    merged = merge_columns([cache.events_to_columns(events, NAMES) for events in streams])
+    # events with equal timestamps keep the order of the streams
+    assert fields(cache.iter_column_events(merged)) == fields(merge_events(*streams))
+    assert merged["msg_sizes_offsets"][-1] == len(merged["msg_sizes"])
+
+
+def test_streaming_fills_cache(tmp_path, monkeypatch):
+    events = make_events(100)
+    trace = tmp_path / "trace"
+    trace.mkdir()
+    (trace / "stream_0").write_bytes(b"")
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(cache, "iter_trace_events", lambda tracename, names: iter(events))
+
+    stream = cache.iter_caching_trace_events(str(trace), NAMES, ["a"], cache_dir)
+    assert next(stream) is events[0]
+    # nothing is cached until the whole trace was decoded
+    assert cache.cached_columns(str(trace), NAMES, cache_dir) is None
+    assert list(stream) == [e for e in events if e.name == "a"][1:]  # the decoded events themselves
+
+    columns = cache.cached_columns(str(trace), NAMES, cache_dir)
+    assert fields(cache.iter_column_events(columns)) == fields(events)
+
+
+def test_prune_least_recently_used(tmp_path):
+    columns = cache.events_to_columns(make_events(100), NAMES)
+    paths = []
+    for index in range(3):
+        path = str(tmp_path / "{}.npz".format(index))
+        cache.save_columns(path, columns)
+        os.utime(path, ns=(index * 10 ** 9, index * 10 ** 9))
+        paths.append(path)
+    size = os.path.getsize(paths[0])
+
+    cache.prune_cache(str(tmp_path), 2 * size)
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+    cache.prune_cache(str(tmp_path), None)
+    assert os.path.exists(paths[1])
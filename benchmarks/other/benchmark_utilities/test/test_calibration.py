@@ -0,0 +1,54 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Probe effect subtraction
+
+import numpy as np
+import pytest
+
+from benchmark_utilities.analysis.calibration import (
+    load_probe_calibration,
+    probe_costs_ns,
+    subtract_probe_costs,
+)
+from benchmark_utilities.analysis.events import TraceEvent
+
+CALIBRATION = {
+    "tracepoint_ns": 1000,
+    "msg_size": {"fixed_ns": 500, "per_byte_ns": 0.5},
+}
+
+
+def test_probe_costs_and_subtraction():
+    costs = load_probe_calibration(CALIBRATION)
+    msg_set = [
+        TraceEvent("a_cb_init", 0, msg_sizes=(1000, 100)),
+        TraceEvent("a_cb_fini", 100000, msg_sizes=(1000, 100)),
+        TraceEvent("b_cb_init", 100500),
+    ]
+    assert probe_costs_ns([msg_set], costs).tolist() == [[2550, 2550, 1000]]
+
+    ns = np.array([[msg.ns for msg in msg_set]])
+    # the last hop is shorter than its cost, it's subtracted down to zero
+    assert subtract_probe_costs(ns, probe_costs_ns([msg_set], costs)).tolist() == [[0, 97450, 97450]]
+
+
+def test_analyzer_subtracts_probe_costs(make_analyzer, synthetic_trace):
+    raw = make_analyzer()
+    calibrated = make_analyzer()
+    calibrated.set_probe_calibration(CALIBRATION)
+    trace = synthetic_trace(raw, rate=30.0, duration=2.0, stage_ns=1500000, jitter_ns=300000)
+
+    sets = {ba: ba.msgsets_from_trace_identifier(trace) for ba in (raw, calibrated)}
+    assert len(sets[raw]) == len(sets[calibrated]) == 60
+
+    # synthetic events trace no sizes, each hop costs a tracepoint call
+    indices = raw.benchmark_indices()
+    hops = indices[-1] - max(indices[0] - 1, 0)
+    difference = np.sum(raw.barchart_data_latency_ns(sets[raw]), axis=1) \
+        - np.sum(calibrated.barchart_data_latency_ns(sets[calibrated]), axis=1)
+    assert (difference == 1000 * (len(raw.target_chain) - 1)).all()
+    assert raw.latency_histogram.mean() - calibrated.latency_histogram.mean() == pytest.approx(hops * 1e-3, rel=0.05)
@@ -0,0 +1,84 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Assembly and matching of chains out of synthetic events
+
+from benchmark_utilities.analysis.chains import ChainAssembler, ChainMatcher
+from benchmark_utilities.analysis.events import TraceEvent
+
+CHAIN = ["a", "b", "c"]
+
+
+def assemble(assembler, events):
+    return list(assembler.assemble(
+        [TraceEvent(name, ns, header_sec=id) for id, name, ns in events], lambda event: event.header_sec))
+
+
+def test_late_events_of_retired_chains_are_discarded():
+    assembler = ChainAssembler(CHAIN, window_ns=100)
+    chains = assemble(assembler, [
+        (1, "a", 0), (1, "b", 10), (1, "c", 20),  # completed
+        (2, "a", 30), (2, "b", 40),
+        (1, "c", 100),  # late, chain 1 completed
+        (3, "a", 135),  # evicts chain 2
+        (2, "c", 150),  # late, chain 2 evicted
+        (3, "b", 160), (3, "c", 170),
+    ])
+    assert [[event.ns for event in chain] for chain in chains] == [[0, 10, 20], [135, 160, 170]]
+    assert assembler.lost == 1
+    assert assembler.dropped == [(30, 1)]
+
+
+def test_drop_records_last_position_added():
+    assembler = ChainAssembler(CHAIN, window_ns=None, parents=[(), (), (0, 1)])
+    assemble(assembler, [(1, "b", 0), (1, "a", 10)])
+    # both inputs present, the last one added was a
+    assert assembler.dropped == [(0, 0)]
+
+
+def match(matcher, events):
+    return [[event.ns for event in chain] for chain in matcher.match(
+        [TraceEvent(name, ns, vpid=1, vtid=vtid) for name, ns, vtid in events])]
+
+
+def test_interleaved_chains_of_a_process():
+    # two threads of the same process, each event advances the oldest chain expecting it
+    matcher = ChainMatcher(CHAIN)
+    assert match(matcher, [
+        ("a", 0, 11), ("a", 5, 12), ("b", 10, 11), ("b", 15, 12), ("c", 20, 11), ("c", 25, 12),
+    ]) == [[0, 10, 20], [5, 15, 25]]
+    assert matcher.lost == 0
+
+    # one more than the chains in flight discards the oldest
+    matcher = ChainMatcher(CHAIN, max_inflight=2)
+    assert match(matcher, [
+        ("a", 0, 11), ("a", 5, 12), ("a", 10, 13), ("b", 15, 12), ("b", 20, 13), ("c", 25, 12), ("c", 30, 13),
+    ]) == [[5, 15, 25], [10, 20, 30]]
+    assert matcher.dropped == [(0, 0)]
+
+
+def test_restarted_chain():
+    # a single chain in flight, restarting it discards the partial one
+    matcher = ChainMatcher(CHAIN, max_inflight=1)
+    assert match(matcher, [("a", 0, 11), ("b", 10, 11), ("a", 20, 11), ("b", 30, 11), ("c", 40, 11)]) == [[20, 30, 40]]
+    assert matcher.dropped == [(0, 1)]
+
+    # with several in flight, it's discarded once older than the window
+    matcher = ChainMatcher(CHAIN, window_ns=100)
+    assert match(matcher, [("a", 0, 11), ("b", 10, 11), ("a", 200, 11), ("b", 210, 11), ("c", 220, 11)]) == [[200, 210, 220]]
+    assert matcher.dropped == [(0, 1)]
+
+
+def test_analyzer_max_inflight(analyzer, synthetic_trace):
+    # frames taking longer than the period, processed by two threads
+    trace = synthetic_trace(analyzer, rate=30.0, duration=2.0, stage_ns=5000000, threads=2)
+    analyzer.set_trace_sets_filter_type("name")
+    assert len(analyzer.msgsets_from_trace(trace)) == 60
+    assert analyzer.lost_msgs == 0
+
+    analyzer.set_chain_max_inflight(1)
+    assert len(analyzer.msgsets_from_trace(trace)) < 60
+    assert analyzer.lost_msgs > 0
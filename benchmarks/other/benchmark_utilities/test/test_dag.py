@@ -0,0 +1,81 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Fan-in chains (a3_stereo_image_proc)
+
+import numpy as np
+import pytest
+
+from benchmark_utilities.analysis.dag import chain_branches, chain_parents, critical_mask
+from benchmark_utilities.analysis.segments import segment_breakdown
+
+
+@pytest.fixture
+def analyzer(make_analyzer):
+    return make_analyzer("a3_stereo_image_proc")
+
+
+def test_chain_parents():
+    labels = ["a", "b", "c", "d", "e"]
+    parents = chain_parents(labels, [None, None, [], None, ["b", "d"]])
+    assert parents == [(), (0,), (), (2,), (1, 3)]
+    assert chain_branches(parents) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        chain_parents(labels, [None, None, None, None, ["e"]])
+
+
+def test_critical_path_follows_last_input():
+    parents = [(), (0,), (), (2,), (1, 3)]
+    ns = np.array([[0, 10, 0, 20, 30], [0, 25, 0, 20, 30]], dtype=np.int64)
+    mask = critical_mask(ns, parents)
+    assert mask.tolist() == [[False, False, True, True, True], [True, True, False, False, True]]
+
+
+def test_dag_sets_and_join_wait(analyzer, synthetic_trace):
+    assert analyzer.is_dag()
+    parents = analyzer.chain_parents()
+    trace = synthetic_trace(analyzer, rate=30.0, duration=5.0, drop_rate=0.05,
+                            stage_ns=1000000, jitter_ns=400000, threads=2)
+    sets = analyzer.msgsets_from_trace_identifier(trace)
+    assert len(sets) + analyzer.lost_msgs == 150
+
+    # each event follows its parents, both inputs joined before the output
+    for msg_set in sets:
+        for position, parent in enumerate(parents):
+            assert all(msg_set[index].ns <= msg_set[position].ns for index in parent)
+
+    breakdown = analyzer.dag_breakdown(sets)
+    assert [branch["name"] for branch in breakdown["branches"]] == [
+        "robotperf_image_input", "robotperf_image_input (2)", "robotperf_image_output"]
+    ns = np.array([[msg.ns for msg in msg_set] for msg_set in sets])
+    wait = np.abs(ns[:, 1] - ns[:, 3]) / 1e6
+    (join,) = breakdown["joins"]
+    assert join["mean"] == pytest.approx(wait.mean())
+    assert sum(join["last"].values()) == pytest.approx(1.0)
+    assert breakdown["branches"][2]["critical"] == 1.0
+    assert breakdown["end_to_end"]["mean"] == pytest.approx(((ns[:, 5] - ns[:, [0, 2]].min(axis=1)) / 1e6).mean())
+
+
+def test_dag_segments(analyzer):
+    segments = analyzer.segments()
+    transports = [(segment.start, segment.end) for segment in segments if segment.kind == "transport"]
+    # along parent edges only, none between the two inputs
+    assert transports == [(1, 4), (3, 4)]
+
+    # the first input arrives last at the join in the first set, the second one in the other two
+    ns = np.array([
+        [0, 30, 5, 10, 40, 50],
+        [0, 10, 5, 30, 40, 50],
+        [5, 10, 0, 20, 40, 50],
+    ], dtype=np.int64) * 1000000
+    breakdown = {entry["name"]: entry for entry in segment_breakdown(ns, segments, parents=analyzer.chain_parents())}
+    assert breakdown["robotperf_image_input"]["critical"] == pytest.approx(1 / 3)
+    assert breakdown["robotperf_image_input -> robotperf_image_output"]["critical"] == pytest.approx(1 / 3)
+    assert breakdown["robotperf_image_input (2) -> robotperf_image_output"]["critical"] == pytest.approx(2 / 3)
+    assert breakdown["robotperf_image_output"]["critical"] == 1.0
+    # from the earliest source
+    output = breakdown["robotperf_image_output"]
+    assert output["share"] == pytest.approx(10 / 50)
@@ -0,0 +1,49 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Drop funnel of a1_perception_2nodes out of synthetic frames dropped along the chain
+
+from collections import Counter
+
+import pytest
+
+from benchmark_utilities.analysis.synthetic import synthesize_events
+
+
+def test_drop_funnel_counts_each_hop(analyzer, synthetic_trace):
+    events = synthesize_events(analyzer.target_chain, rate=30.0, duration=5.0, drop_rate=0.2)
+    trace = synthetic_trace(analyzer, events)
+    sets = analyzer.msgsets_from_trace_identifier(trace)
+
+    # dropped frames stop at a tracepoint, the hop leaving it
+    traced = Counter((event.header_sec, event.header_nsec) for event in events)
+    lost_hops = Counter(count - 1 for count in traced.values() if count < len(analyzer.target_chain))
+    assert len(sets) + analyzer.lost_msgs == len(traced) == 150
+    assert analyzer.lost_msgs == sum(lost_hops.values()) > 0
+    # out of every frame entering the chain
+    assert analyzer.lost_percentage(sets) == pytest.approx(analyzer.lost_msgs / 150 * 100)
+
+    stages = analyzer.hop_stages()
+    funnel = analyzer.drop_funnel(sets)
+    assert [entry["stage"] for entry in funnel] == list(dict.fromkeys(stages))
+    for entry in funnel:
+        hops = [hop for hop, stage in enumerate(stages) if stage == entry["stage"]]
+        assert entry["dropped"] == sum(lost_hops[hop] for hop in hops)
+        assert entry["reached"] == 150 - sum(count for hop, count in lost_hops.items() if hop < hops[0])
+    assert funnel[0]["reached"] == 150
+    assert funnel[-1]["reached"] - funnel[-1]["dropped"] == len(sets)
+
+    rates = analyzer.drop_rates(1.0, sets)
+    assert rates["started"].sum() == 150
+    assert rates["dropped"].sum(axis=0).tolist() == [entry["dropped"] for entry in funnel]
+
+
+def test_graph_chains_have_no_funnel(make_analyzer, synthetic_trace):
+    analyzer = make_analyzer("a3_stereo_image_proc")
+    analyzer.msgsets_from_trace_identifier(synthetic_trace(analyzer, rate=30.0, duration=2.0, drop_rate=0.2))
+    assert analyzer.lost_msgs
+    assert analyzer.drop_funnel() is None
+    assert analyzer.drop_rates() is None
@@ -0,0 +1,53 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# modules only needed to decode traces, plot or report, never at import time
+HEAVY_MODULES = ("bt2", "pandas", "bokeh", "plotly", "turtle", "tabnanny", "ros2benchmark")
+
+# import time budget of the analyzer, in seconds
+IMPORT_TIME_BUDGET = 0.5
+
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+start = time.perf_counter()
+from benchmark_utilities.analysis import BenchmarkAnalyzer
+elapsed = time.perf_counter() - start
+BenchmarkAnalyzer("a1_perception_2nodes")
+print(json.dumps({
+    "elapsed": elapsed,
+    "heavy": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def measure_startup():
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_dir, env.get("PYTHONPATH")]))
+    outs = subprocess.check_output(
+        [sys.executable, "-c", STARTUP_SCRIPT % (HEAVY_MODULES,)], env=env)
+    return json.loads(outs.decode().splitlines()[-1])
+
+
+def test_import_time():
+    for module in ("numpy", "yaml", "wasabi"):
+        pytest.importorskip(module)
+    # best of a few runs, to tell import time apart from a noisy machine
+    runs = [measure_startup() for _ in range(3)]
+    assert not runs[0]["heavy"], \
+        "heavy modules imported along with the analyzer: " + ", ".join(runs[0]["heavy"])
+    elapsed = min(run["elapsed"] for run in runs)
+    assert elapsed < IMPORT_TIME_BUDGET, \
+        "importing the analyzer took %.3f s (budget %.3f s)" % (elapsed, IMPORT_TIME_BUDGET)
@@ -0,0 +1,123 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Live analysis over replayed synthetic traces
+
+import pytest
+
+from benchmark_utilities.analysis.live import RollingMetrics, TraceFollower, replay_events
+from benchmark_utilities.analysis.synthetic import synthesize_events
+
+SYNTHETIC = {
+    "rate": 30.0,
+    "duration": 20.0,
+    "drop_rate": 0.05,
+    "stage_ns": 1500000,
+    "jitter_ns": 300000,
+    "threads": 2,
+}
+
+
+class FakeClock:
+    """
+    Clock advanced by sleeping, so that replays take no time
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def events(analyzer):
+    return synthesize_events(analyzer.target_chain, **SYNTHETIC)
+
+
+def test_replay_paces_events(events):
+    clock = FakeClock()
+    replayed = []
+    for event in replay_events(events, speed=2.0, clock=clock, sleep=clock.sleep):
+        # events are delivered once due, at twice the speed they were traced
+        assert clock() == pytest.approx((event.ns - events[0].ns) / 2e9, abs=1e-6)
+        replayed.append(event)
+    assert replayed == events
+
+
+def test_live_metrics_match_batch(make_analyzer, synthetic_trace, analyzer, events):
+    clock = FakeClock()
+    snapshots = list(analyzer.live_metrics(
+        replay_events(events, clock=clock, sleep=clock.sleep), interval=5.0, window_ns=5 * 10**9))
+
+    # at 5, 10 and 15 s of trace time, and a last one when the stream ends
+    assert len(snapshots) == 4
+    assert [snapshot["time"] for snapshot in snapshots] == sorted(snapshot["time"] for snapshot in snapshots)
+
+    # same sets as analyzing the whole trace at once
+    batch = make_analyzer()
+    trace = synthetic_trace(batch, events)
+    sets = batch.msgsets_from_trace_identifier(trace)
+    last = snapshots[-1]
+    assert last["sets"] == len(sets)
+    assert last["lost"] == batch.lost_msgs
+    assert last["percentiles"] == pytest.approx(batch.latency_histogram.percentiles())
+    for snapshot in snapshots[:-1]:
+        assert snapshot["fps"] == pytest.approx(SYNTHETIC["rate"] * (1 - SYNTHETIC["drop_rate"]), rel=0.15)
+
+
+def test_rolling_metrics_memory_is_bounded():
+    metrics = RollingMetrics(window_ns=10**9)
+    for i in range(10000):
+        ns = i * 10**7  # 100 Hz
+        metrics.add_set(ns, 10**6, 1000)
+        metrics.add_power(ns, 5.0)
+        metrics.advance(ns)
+        assert len(metrics.outputs) <= 100
+        assert len(metrics.power) <= 100
+    snapshot = metrics.snapshot()
+    assert snapshot["sets"] == 10000
+    assert snapshot["fps"] == pytest.approx(100.0)
+    assert snapshot["MB/s"] == pytest.approx(0.1)
+    assert snapshot["power"] == pytest.approx(5.0)
+    assert snapshot["latency"]["mean"] == pytest.approx(1.0)
+
+
+def test_trace_follower_yields_each_event_once(tmp_path, events):
+    trace = tmp_path / "trace"
+    trace.mkdir()
+    (trace / "metadata").write_text("")
+    written = {"count": 0, "decoded": 0}
+    step = len(events) // 10
+
+    def decode(trace_dir, stream_file, names, begin_ns):
+        # even events are traced by one CPU, odd ones by another whose
+        # stream lags behind by up to 100 events until the trace is complete
+        cpu = int(stream_file[-1])
+        visible = events[:written["count"]]
+        if written["count"] < len(events):
+            visible = visible[:max(0, written["count"] - 100 * cpu)]
+        for event in visible[cpu::2]:
+            if begin_ns is None or event.ns >= begin_ns:
+                written["decoded"] += 1
+                yield event
+
+    def write_more(seconds):
+        written["count"] = min(written["count"] + step, len(events))
+        for cpu in range(2):
+            (trace / "channel0_{}".format(cpu)).write_text("x" * written["count"])
+
+    follower = TraceFollower(str(trace), [], lateness_ns=2 * 10**9, idle_timeout=None,
+                             decode=decode, sleep=write_more)
+    followed = list(follower.events(finished=lambda: written["count"] == len(events)))
+    assert followed == events
+    assert follower.late == 0
+    # each poll decodes from the latest event of each stream on, not the whole trace
+    assert follower.decoded == len(events)
+    assert written["decoded"] <= len(events) + 2 * follower.polls
@@ -0,0 +1,78 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Power and energy of a1_perception_2nodes out of synthetic power samples
+
+import numpy as np
+import pytest
+
+from benchmark_utilities.analysis.events import TraceEvent
+from benchmark_utilities.analysis.power import energy_metrics, power_series, power_summary
+from benchmark_utilities.analysis.synthetic import synthesize_events
+
+NS = 1000000000
+SAMPLES_NS = np.array([0, 1, 2, 4]) * NS
+SAMPLES_W = np.array([1.0, 3.0, 1.0, 2.0])
+
+
+def test_power_summary_integrates_trapezoids():
+    summary = power_summary(SAMPLES_NS, SAMPLES_W)
+    assert summary["joules"] == pytest.approx(2 + 2 + 3)
+    assert summary["seconds"] == 4.0
+    assert summary["mean"] == pytest.approx(7 / 4)
+    assert (summary["peak"], summary["min"]) == (3.0, 1.0)
+    # cumulative, at each sample
+    assert summary["series"]["joules"].tolist() == pytest.approx([0, 2, 4, 7])
+
+
+def test_power_summary_clips_to_the_window():
+    # boundaries interpolated between the samples around them
+    summary = power_summary(SAMPLES_NS, SAMPLES_W, (NS // 2, 3 * NS))
+    assert summary["joules"] == pytest.approx((2 + 3) / 2 * 0.5 + 2 + (1 + 1.5) / 2)
+    assert summary["seconds"] == 2.5
+    assert summary["samples"] == 2
+    assert summary["series"]["time"].tolist() == pytest.approx([0, 0.5, 1.5, 2.5])
+    # held constant out of the samples
+    summary = power_summary(SAMPLES_NS, SAMPLES_W, (-NS, 6 * NS))
+    assert summary["joules"] == pytest.approx(1 + 7 + 2 * 2)
+    assert summary["peak"] == 3.0
+
+    metrics = energy_metrics(summary, 4, 250.0)
+    assert metrics["joules_per_frame"] == pytest.approx(12 / 4)
+    assert metrics["edp"] == pytest.approx(12 / 4 * 0.25)
+
+
+def test_analyze_power_keeps_the_target_sets(analyzer, synthetic_trace, monkeypatch):
+    monkeypatch.delenv("TYPE", raising=False)
+    results = []
+    monkeypatch.setattr(analyzer, "add_result", results.append)
+    events = synthesize_events(analyzer.target_chain, rate=30.0, duration=2.0)
+    start = events[0].ns
+    power = [TraceEvent(analyzer.power_chain[0], start + ns, vpid=1, power=watts)
+             for ns, watts in zip((SAMPLES_NS / 2).astype(np.int64), SAMPLES_W)]
+    trace = synthetic_trace(analyzer, sorted(events + power, key=lambda event: event.ns))
+    analyzer.set_trace_sets_filter_type()
+
+    watts = analyzer.analyze_power(trace)
+    assert len(analyzer.image_pipeline_msg_sets) == 60
+    assert all(len(msg_set) == len(analyzer.target_chain) for msg_set in analyzer.image_pipeline_msg_sets)
+    assert power_series(analyzer.power_msg_sets)[1].tolist() == SAMPLES_W.tolist()
+    (result,) = results
+    assert result["value"] == watts
+    assert result["energy"]["joules_per_frame"] == pytest.approx(result["energy"]["joules"] / 60, rel=1e-5)
+
+
+def test_no_power_samples_skips_energy(analyzer, synthetic_trace, monkeypatch):
+    monkeypatch.delenv("TYPE", raising=False)
+    results = []
+    monkeypatch.setattr(analyzer, "add_result", results.append)
+    monkeypatch.setattr(analyzer, "plot_latency_results", lambda: None)
+    trace = synthetic_trace(analyzer, rate=30.0, duration=2.0)
+
+    assert analyzer.analyze_power(trace) is None
+    analyzer.analyze_latency(trace, add_power=True)
+    assert results == []
+    assert len(analyzer.image_pipeline_msg_sets) == 60
@@ -0,0 +1,28 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Results of the analyzer
+
+
+def test_histogram_accounts_for_the_latest_trace(analyzer, synthetic_trace):
+    ba = analyzer
+    latencies = []
+    for seed, stage_ns in enumerate((1000000, 3000000)):
+        # same number of sets in both traces, different latencies
+        trace = synthetic_trace(ba, rate=30.0, duration=2.0, stage_ns=stage_ns, seed=seed)
+        ba.image_pipeline_msg_sets = ba.msgsets_from_trace_identifier(trace)
+        ba.bar_charts_latency()
+        latencies.append(ba.image_pipeline_msg_sets_barchart_ns)
+
+        # recorded while forming the sets, for those sets only
+        assert ba.benchmark_histogram(latencies[-1]) is ba.latency_histogram
+        assert ba.latency_histogram.count == len(ba.image_pipeline_msg_sets) == 60
+
+    # latencies of the first trace are histogrammed on their own
+    first = ba.benchmark_histogram(latencies[0])
+    assert first is not ba.latency_histogram
+    assert first.count == 60
+    assert first.mean() < ba.latency_histogram.mean()
@@ -0,0 +1,51 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Segments of a1_perception_2nodes (input, rectify, resize and output nodes)
+
+import numpy as np
+import pytest
+
+from benchmark_utilities.analysis.segments import chain_segments, segment_breakdown
+
+
+def test_chain_segments(analyzer):
+    segments = chain_segments(analyzer.target_chain, analyzer.target_chain_dissambiguous)
+    assert [(segment.name, segment.kind, segment.start, segment.end) for segment in segments] == [
+        ("robotperf_image_input", "callback", 0, 1),
+        ("robotperf_image_input -> image_proc_rectify", "transport", 1, 2),
+        ("image_proc_rectify", "callback", 2, 5),
+        ("image_proc_rectify", "op", 3, 4),
+        ("image_proc_rectify -> image_proc_resize", "transport", 5, 6),
+        ("image_proc_resize", "callback", 6, 9),
+        ("image_proc_resize", "op", 7, 8),
+        ("image_proc_resize -> robotperf_image_output", "transport", 9, 10),
+        ("robotperf_image_output", "callback", 10, 11),
+    ]
+
+
+def test_segment_breakdown(analyzer):
+    segments = chain_segments(analyzer.target_chain, analyzer.target_chain_dissambiguous)
+    # relative timestamps of each hop, the rectify callback is the longest in
+    # the first two sets, the transport to resize in the third
+    hops = np.array([
+        [1, 1, 1, 5, 1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 6, 1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 1, 1, 9, 1, 1, 1, 1, 1],
+    ], dtype=np.int64) * 1000000
+    ns = np.cumsum(np.hstack((np.zeros((3, 1), dtype=np.int64), hops)), axis=1)
+    breakdown = {(entry["name"], entry["kind"]): entry for entry in segment_breakdown(ns, segments)}
+
+    rectify = breakdown[("image_proc_rectify", "callback")]
+    assert rectify["mean"] == pytest.approx((7 + 8 + 3) / 3)
+    assert rectify["share"] == pytest.approx(rectify["mean"] / ((15 + 16 + 19) / 3))
+    assert rectify["bottleneck"] == pytest.approx(2 / 3)
+    assert breakdown[("image_proc_rectify -> image_proc_resize", "transport")]["bottleneck"] == pytest.approx(1 / 3)
+    # nested spans are never the bottleneck, their node is
+    assert breakdown[("image_proc_rectify", "op")]["bottleneck"] == 0.0
+    assert sum(entry["bottleneck"] for entry in breakdown.values()) == pytest.approx(1.0)
+    # a linear chain is critical end to end
+    assert all(entry["critical"] == 1.0 for entry in breakdown.values())
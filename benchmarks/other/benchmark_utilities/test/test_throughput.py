@@ -0,0 +1,51 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+# Written by Martiño Crespo <martinho@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+# Throughput rates against brute force over synthetic output series
+
+import numpy as np
+import pytest
+
+from benchmark_utilities.analysis.throughput import NS_PER_S, decayed_rates, windowed_rates
+
+
+def series(seed=0, outputs=400):
+    # irregular outputs, with bursts sharing a timestamp and stalls
+    rng = np.random.default_rng(seed)
+    gaps = rng.choice([0, 10000000, 30000000, 2000000000], size=outputs, p=[0.1, 0.5, 0.38, 0.02])
+    ns = 1000000000000 + np.cumsum(gaps).astype(np.int64)
+    sizes = rng.integers(1000, 100000, size=outputs)
+    return ns, sizes
+
+
+@pytest.mark.parametrize("values", [False, True])
+def test_windowed_rates(values):
+    ns, sizes = series()
+    sizes = sizes if values else np.ones(len(ns), dtype=np.int64)
+    window_ns = 500000000
+    times, rates = windowed_rates(ns, sizes if values else None, window_ns)
+
+    expected = [(t, sizes[(ns > t - window_ns) & (ns <= t)].sum() * NS_PER_S / window_ns)
+                for t in ns if t >= ns[0] + window_ns]
+    assert times.tolist() == [t for t, _ in expected]
+    assert rates.tolist() == pytest.approx([rate for _, rate in expected])
+
+
+@pytest.mark.parametrize("time_constant_ns", [200000000, 1000000])  # the latter rebases exponentials
+def test_decayed_rates(time_constant_ns):
+    ns, sizes = series()
+    times, rates = decayed_rates(ns, sizes, time_constant_ns)
+
+    expected = [np.sum(sizes[:i + 1] * np.exp(-(ns[i] - ns[:i + 1]) / time_constant_ns)) * NS_PER_S / time_constant_ns
+                for i in range(len(ns))]
+    assert times.tolist() == ns.tolist()
+    assert rates.tolist() == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("ns", [[], [5], [5, 5, 5]])
+def test_no_rates_without_a_span(ns):
+    for times, rates in (windowed_rates(ns), decayed_rates(ns)):
+        assert len(times) == len(rates) == 0
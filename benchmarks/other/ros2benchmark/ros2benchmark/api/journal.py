@@ -0,0 +1,118 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import fcntl
+import json
+import os
+import tempfile
+
+from ros2benchmark.verb import Benchmark, search_benchmarks
+
+# journal of results not yet folded into benchmark.yaml files, at the root of the benchmarks repo
+JOURNAL_FILENAME = "results.jsonl"
+
+
+def append_result(journal_path, benchmark_name, result):
+    """
+    Appends a result to the journal, one JSON line per result
+
+    The line is written with a single write on a file opened with O_APPEND,
+    under an exclusive lock and followed by an fsync, so concurrent jobs
+    appending to the same journal never interleave nor lose results.
+    Costs the same regardless of the number of benchmarks and results.
+
+    :param journal_path: path of the journal, e.g. /tmp/benchmarks/results.jsonl
+    :param benchmark_name: name of the benchmark, as in its benchmark.yaml
+    :param result: dict with the result, see BenchmarkAnalyzer.add_result
+    """
+    line = json.dumps({"benchmark": benchmark_name, "result": result}, default=str) + "\n"
+    fd = os.open(journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.write(fd, line.encode("utf-8"))
+        os.fsync(fd)
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def read_journal(journal_file):
+    """
+    Returns the entries of a journal, a list of dicts with "benchmark" and "result"
+
+    NOTE: a last line without newline (e.g. a job killed while writing) is ignored.
+
+    :param journal_file: file object of the journal, opened for reading
+    """
+    entries = []
+    for line in journal_file:
+        if not line.endswith("\n"):
+            break
+        if line.strip():
+            entries.append(json.loads(line))
+    return entries
+
+
+def write_atomically(path, content):
+    """
+    Replaces the content of a file, readers see either the old or the new content
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def compact_journal(journal_path, searchpath):
+    """
+    Folds the results of the journal into the benchmark.yaml file of their
+    benchmark, and removes them from the journal
+
+    The journal is locked meanwhile, so results appended concurrently wait
+    and land in the journal once compacted. Results of benchmarks not
+    found in searchpath stay in the journal.
+
+    :param journal_path: path of the journal, e.g. /tmp/benchmarks/results.jsonl
+    :param searchpath: where to look for benchmark.yaml files
+    :returns: dict mapping each benchmark.yaml updated to the number of results added
+    """
+    if not os.path.exists(journal_path):
+        return {}
+
+    with open(journal_path, "r+") as journal_file:
+        fcntl.flock(journal_file.fileno(), fcntl.LOCK_EX)
+        entries = read_journal(journal_file)
+        pending = {}
+        for entry in entries:
+            pending.setdefault(entry["benchmark"], []).append(entry["result"])
+
+        compacted = {}
+        for meta in search_benchmarks(searchpath=searchpath):
+            if not pending:
+                break
+            benchmark = Benchmark(meta)
+            results = pending.pop(benchmark.name, None)
+            if results is None:
+                continue
+            benchmark.results.extend(results)
+            write_atomically(meta, str(benchmark))
+            compacted[meta] = len(results)
+
+        # keep results of benchmarks not found, drop the rest
+        left = [entry for entry in entries if entry["benchmark"] in pending]
+        journal_file.seek(0)
+        journal_file.truncate()
+        for entry in left:
+            journal_file.write(json.dumps(entry, default=str) + "\n")
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+    return compacted
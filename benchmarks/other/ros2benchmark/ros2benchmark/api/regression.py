@@ -0,0 +1,116 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import numpy as np
+
+# whether higher values of each metric are better
+HIGHER_IS_BETTER = {
+    "latency": False,
+    "power": False,
+    "throughput": True,
+}
+
+# results are compared within the same benchmark, hardware, type and datasource
+GROUP_FIELDS = ("id", "hardware", "type", "datasource", "metric")
+
+# scales the median absolute deviation into a standard deviation estimate (normal data)
+MAD_SCALE = 1.4826
+
+
+def result_p99(result):
+    """
+    p99 of a latency result when stored (see BenchmarkAnalyzer.results), None otherwise
+    """
+    if result["metric"] != "latency":
+        return None
+    percentiles = result.get("percentiles") or {}
+    if percentiles.get("p99") is None:
+        return None
+    return float(percentiles["p99"])
+
+
+def detect_regressions(results, tolerance=10.0, mad_threshold=3.0, window=10, min_baseline=3):
+    """
+    Checks the latest run of each group of results (see GROUP_FIELDS)
+    against the runs before it
+
+    The baseline is the median of the previous runs (up to window of them).
+    Latency runs are compared by their p99 when all of them store it.
+    A run regresses when it is worse than the baseline by more than both
+    tolerance % of the baseline and mad_threshold times the (scaled) median
+    absolute deviation of the baseline runs, so that noisy benchmarks need
+    a larger change to be flagged than stable ones.
+
+    :param results: results (e.g. out of a ResultsIndex), with "epoch"
+    :param tolerance: allowed change, in % of the baseline
+    :param mad_threshold: allowed change, in robust standard deviations
+    :param window: number of previous runs making the baseline
+    :param min_baseline: minimum number of previous runs to check a group
+    :returns: list of dicts, one per group checked, with "regression" set
+    to True for the groups whose latest run regressed
+    """
+    groups = {}
+    for position, result in enumerate(results):
+        if result["metric"] not in HIGHER_IS_BETTER:
+            continue
+        key = tuple(result[field] for field in GROUP_FIELDS)
+        groups.setdefault(key, []).append((result["epoch"], position, result))
+
+    checks = []
+    for key, runs in groups.items():
+        if len(runs) < min_baseline + 1:
+            continue
+        runs.sort(key=lambda run: run[:2])  # by time, then in order of appearance
+        runs = runs[-window - 1:]
+        # p99 latency if stored for all runs compared, values otherwise
+        p99s = [result_p99(run[2]) for run in runs]
+        if all(p99 is not None for p99 in p99s):
+            statistic = "p99"
+            values = np.array(p99s, dtype=np.float64)
+        else:
+            statistic = "value"
+            values = np.array([run[2]["value"] for run in runs], dtype=np.float64)
+        latest = values[-1]
+        previous = values[:-1]
+
+        baseline = float(np.median(previous))
+        spread = MAD_SCALE * float(np.median(np.abs(previous - baseline)))
+        allowed = max(abs(baseline) * tolerance / 100.0, mad_threshold * spread)
+        change = latest - baseline
+        worse = -change if HIGHER_IS_BETTER[key[-1]] else change
+
+        check = dict(zip(GROUP_FIELDS, key))
+        check.update({
+            "timestampt": runs[-1][2]["timestampt"],
+            "metric_unit": runs[-1][2]["metric_unit"],
+            "statistic": statistic,
+            "baseline": baseline,
+            "baseline_runs": len(previous),
+            "mad": spread,
+            "latest": float(latest),
+            "change": float(change / baseline * 100) if baseline else float("nan"),
+            "allowed": allowed,
+            "regression": bool(worse > allowed),
+        })
+        checks.append(check)
+    return checks
+
+
+def regressions_markdown(checks, only_regressions=False):
+    """
+    Markdown table out of detect_regressions
+    """
+    md = "| Status | Benchmark | Hardware | Type | Datasource | Metric | Statistic | Baseline (runs) | Latest | Change | Allowed |\n"
+    md += "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |\n"
+    for check in sorted(checks, key=lambda check: (not check["regression"], check["id"], check["hardware"])):
+        if only_regressions and not check["regression"]:
+            continue
+        md += "| {} | {} | {} | {} | {} | {} | {} | {:.3f} {} ({}) | {:.3f} {} | {:+.2f} % | ±{:.3f} |\n".format(
+            "❌ regression" if check["regression"] else "✅",
+            check["id"], check["hardware"], check["type"], check["datasource"], check["metric"], check["statistic"],
+            check["baseline"], check["metric_unit"], check["baseline_runs"],
+            check["latest"], check["metric_unit"], check["change"], check["allowed"])
+    return md
@@ -0,0 +1,183 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import hashlib
+import json
+import os
+import sqlite3
+
+from ros2benchmark.verb import Benchmark, Result
+
+# bump whenever the layout of the index changes, older indexes get rebuilt
+INDEX_VERSION = 2
+DEFAULT_INDEX_PATH = "/tmp/ros2benchmark/results.sqlite3"
+
+# result fields that can be queried, indexed
+INDEXED_FIELDS = ("id", "hardware", "metric", "type")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    id TEXT,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT,
+    name TEXT,
+    hardware TEXT,
+    metric TEXT,
+    type TEXT,
+    epoch INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS results_id ON results (id);
+CREATE INDEX IF NOT EXISTS results_hardware ON results (hardware);
+CREATE INDEX IF NOT EXISTS results_metric ON results (metric);
+CREATE INDEX IF NOT EXISTS results_type ON results (type);
+"""
+
+
+def file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class ResultsIndex:
+    """
+    SQLite index of the results of every benchmark.yaml file
+
+    Each benchmark.yaml is parsed once and its results stored as rows,
+    indexed by id, hardware, metric and type. Refreshing the index only
+    re-parses the files whose modification time or size changed and
+    whose content (sha1) differs from the one indexed, so listing,
+    summarizing or reporting results doesn't re-read the whole tree.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        """
+        :param index_path: path of the SQLite database, ":memory:" to keep it in memory
+        """
+        if index_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        self.connection = sqlite3.connect(index_path)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            with self.connection:
+                self.connection.execute("DROP TABLE IF EXISTS files")
+                self.connection.execute("DROP TABLE IF EXISTS results")
+                self.connection.execute("PRAGMA user_version = {}".format(INDEX_VERSION))
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self, benchmark_meta_paths):
+        """
+        Brings the index up to date with a list of benchmark.yaml files
+
+        :param benchmark_meta_paths: paths of benchmark.yaml files, see search_benchmarks
+        :returns: number of files (re-)parsed
+        """
+        indexed = {
+            path: (mtime_ns, size, sha1)
+            for path, mtime_ns, size, sha1 in self.connection.execute(
+                "SELECT path, mtime_ns, size, sha1 FROM files")
+        }
+        parsed = 0
+        with self.connection:
+            for meta in benchmark_meta_paths:
+                path = os.path.abspath(meta)
+                stat = os.stat(path)
+                entry = indexed.get(path)
+                if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                sha1 = file_sha1(path)
+                if entry is not None and entry[2] == sha1:  # touched, not changed
+                    self.connection.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                        (stat.st_mtime_ns, stat.st_size, path))
+                    continue
+                self.index_file(meta, path, stat, sha1)
+                parsed += 1
+
+            # forget files removed since they were indexed
+            for path in indexed:
+                if not os.path.exists(path):
+                    self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                    self.connection.execute("DELETE FROM results WHERE path = ?", (path,))
+        return parsed
+
+    def index_file(self, meta, path, stat, sha1):
+        benchmark = Benchmark(meta)
+        self.connection.execute("DELETE FROM results WHERE path = ?", (path,))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, sha1, benchmark.id, benchmark.name))
+        self.connection.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (path, position, record.id, record.name,
+                 record.hardware, record.metric, record.type, record.epoch,
+                 json.dumps(record.to_dict(), default=str))
+                for position, record in enumerate(benchmark.records())
+            ])
+
+    def results(self, benchmark_meta_paths=None, **fields):
+        """
+        Returns the results indexed, as Result records, in file and then
+        result order
+
+        :param benchmark_meta_paths: only return results of these files, None for all
+        :param fields: equality filters on INDEXED_FIELDS, e.g. id="a1", metric="latency"
+        """
+        query = "SELECT data FROM results"
+        conditions = []
+        parameters = []
+        for field, value in fields.items():
+            if field not in INDEXED_FIELDS:
+                raise ValueError("can't query results by '{}', use one of {}".format(field, INDEXED_FIELDS))
+            conditions.append(field + " = ?")
+            parameters.append(value)
+        if benchmark_meta_paths is not None:
+            conditions.append(self.paths_condition(benchmark_meta_paths, parameters))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY path, position"
+
+        return [Result(**json.loads(data)) for data, in self.connection.execute(query, parameters)]
+
+    def benchmarks(self, benchmark_meta_paths=None):
+        """
+        Returns a list of (id, name) of the benchmarks indexed
+
+        :param benchmark_meta_paths: only return these files, None for all
+        """
+        query = "SELECT id, name FROM files"
+        parameters = []
+        if benchmark_meta_paths is not None:
+            query += " WHERE " + self.paths_condition(benchmark_meta_paths, parameters)
+        return self.connection.execute(query + " ORDER BY path", parameters).fetchall()
+
+    @staticmethod
+    def paths_condition(benchmark_meta_paths, parameters):
+        paths = [os.path.abspath(meta) for meta in benchmark_meta_paths]
+        parameters.extend(paths)
+        return "path IN ({})".format(", ".join("?" * len(paths)))
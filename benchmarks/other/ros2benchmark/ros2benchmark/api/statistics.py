@@ -0,0 +1,203 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import math
+import numpy as np
+
+# samples are kept as weighted distributions: sorted unique values and their counts,
+# so that merged histograms of many runs (millions of samples) stay small
+
+
+class Distribution:
+    """
+    Weighted distribution of samples: sorted unique values and their counts
+
+    Built out of raw samples (e.g. latency arrays, per-run values) or out of
+    the histograms stored with results (see LatencyHistogram.to_dict in
+    benchmark_utilities), merging all the runs of a configuration.
+    """
+
+    def __init__(self, values, counts):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.n = int(self.counts.sum())
+
+    @classmethod
+    def from_samples(cls, samples):
+        values, counts = np.unique(np.asarray(samples, dtype=np.float64).ravel(), return_counts=True)
+        return cls(values, counts)
+
+    @classmethod
+    def from_histograms(cls, histograms):
+        """
+        Merges histograms (as stored with results) into a distribution
+
+        Each bucket is represented by its highest value, clamped to the
+        minimum and maximum of the histogram, same as the percentiles
+        LatencyHistogram reports.
+        """
+        values = []
+        counts = []
+        for histogram in histograms:
+            if not histogram or not histogram.get("count"):
+                continue
+            log_base = math.log1p(histogram["precision"])
+            indices = np.array([int(index) for index in histogram["buckets"]], dtype=np.int64)
+            uppers = histogram["lowest"] * np.exp((indices + 1) * log_base)
+            values.append(np.clip(uppers, histogram["min"], histogram["max"]))
+            counts.append(np.array([int(count) for count in histogram["buckets"].values()], dtype=np.int64))
+        if not values:
+            return cls([], [])
+        values = np.concatenate(values)
+        counts = np.concatenate(counts)
+        unique, inverse = np.unique(values, return_inverse=True)
+        return cls(unique, np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64))
+
+    def __len__(self):
+        return self.n
+
+    def quantile(self, q):
+        cumulative = np.cumsum(self.counts)
+        return float(self.values[np.searchsorted(cumulative, max(1, math.ceil(q * self.n)))])
+
+    def mean(self):
+        return float(np.dot(self.values, self.counts) / self.n)
+
+
+def resampled_statistic(distribution, statistic, resamples, rng):
+    """
+    Statistic of bootstrap resamples of a distribution, vectorized
+
+    Resampling n samples with replacement out of a weighted distribution
+    amounts to drawing the counts of its values from a multinomial.
+
+    :param statistic: "mean" or a quantile (0-1)
+    :returns: array with the statistic of each resample
+    """
+    counts = rng.multinomial(distribution.n, distribution.counts / distribution.n, size=resamples)
+    if statistic == "mean":
+        return counts @ distribution.values / distribution.n
+    rank = max(1, math.ceil(statistic * distribution.n))
+    positions = (np.cumsum(counts, axis=1) < rank).sum(axis=1)
+    return distribution.values[positions]
+
+
+def bootstrap_ci(distribution, statistic=0.5, confidence=0.95, resamples=2000, seed=0):
+    """
+    Percentile bootstrap confidence interval of a statistic
+
+    :param statistic: "mean" or a quantile (0-1), e.g. 0.5 for the median
+    :returns: (low, high)
+    """
+    rng = np.random.default_rng(seed)
+    estimates = resampled_statistic(distribution, statistic, resamples, rng)
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(estimates, alpha)), float(np.quantile(estimates, 1 - alpha))
+
+
+def bootstrap_difference_ci(baseline, candidate, statistic=0.5, confidence=0.95, resamples=2000, seed=0):
+    """
+    Percentile bootstrap confidence interval of the difference of a
+    statistic between two distributions (candidate - baseline)
+
+    :returns: (low, high)
+    """
+    rng = np.random.default_rng(seed)
+    differences = (resampled_statistic(candidate, statistic, resamples, rng)
+                   - resampled_statistic(baseline, statistic, resamples, rng))
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(differences, alpha)), float(np.quantile(differences, 1 - alpha))
+
+
+def mann_whitney_u(baseline, candidate):
+    """
+    Two-sided Mann-Whitney U test, normal approximation with tie and
+    continuity corrections
+
+    :returns: (U of the candidate, p-value)
+    """
+    n1 = baseline.n
+    n2 = candidate.n
+    values = np.union1d(baseline.values, candidate.values)
+    counts1 = np.zeros(len(values), dtype=np.float64)
+    counts2 = np.zeros(len(values), dtype=np.float64)
+    counts1[np.searchsorted(values, baseline.values)] = baseline.counts
+    counts2[np.searchsorted(values, candidate.values)] = candidate.counts
+
+    # average rank of each group of ties
+    ties = counts1 + counts2
+    ranks = np.cumsum(ties) - ties + (ties + 1) / 2
+    u = float(np.dot(counts2, ranks)) - n2 * (n2 + 1) / 2
+
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    tie_term = float(np.sum(ties ** 3 - ties)) / (n * (n - 1)) if n > 1 else 0.0
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def kolmogorov_smirnov(baseline, candidate):
+    """
+    Two-sample Kolmogorov-Smirnov test, asymptotic p-value
+
+    :returns: (D statistic, p-value)
+    """
+    values = np.union1d(baseline.values, candidate.values)
+    cdfs = []
+    for distribution in (baseline, candidate):
+        counts = np.zeros(len(values), dtype=np.float64)
+        counts[np.searchsorted(values, distribution.values)] = distribution.counts
+        cdfs.append(np.cumsum(counts) / distribution.n)
+    d = float(np.max(np.abs(cdfs[0] - cdfs[1])))
+
+    en = math.sqrt(baseline.n * candidate.n / (baseline.n + candidate.n))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 1e-3:
+        return d, 1.0
+    k = np.arange(1, 101)
+    p = 2 * float(np.sum((-1.0) ** (k - 1) * np.exp(-2 * k * k * lam * lam)))
+    return d, min(1.0, max(0.0, p))
+
+
+def describe_distribution(distribution, confidence=0.95, resamples=2000, seed=0):
+    """
+    Median, mean and p99 of a distribution with their bootstrap confidence intervals
+
+    :returns: dict, e.g. {"n": ..., "median": ..., "median_ci": (low, high), ...}
+    """
+    summary = {"n": distribution.n}
+    for name, statistic in (("median", 0.5), ("mean", "mean"), ("p99", 0.99)):
+        if statistic == "mean":
+            summary[name] = distribution.mean()
+        else:
+            summary[name] = distribution.quantile(statistic)
+        summary[name + "_ci"] = bootstrap_ci(distribution, statistic, confidence, resamples, seed)
+    return summary
+
+
+def compare_distributions(baseline, candidate, confidence=0.95, resamples=2000, seed=0):
+    """
+    Compares two distributions: change of the median with its bootstrap
+    confidence interval, Mann-Whitney U and Kolmogorov-Smirnov tests
+
+    :returns: dict
+    """
+    baseline_median = baseline.quantile(0.5)
+    difference = candidate.quantile(0.5) - baseline_median
+    u, u_p = mann_whitney_u(baseline, candidate)
+    d, d_p = kolmogorov_smirnov(baseline, candidate)
+    return {
+        "median_difference": difference,
+        "median_difference_ci": bootstrap_difference_ci(baseline, candidate, 0.5, confidence, resamples, seed),
+        "median_change": difference / baseline_median * 100 if baseline_median else float("nan"),
+        "mann_whitney_u": u,
+        "mann_whitney_p": u_p,
+        "ks_d": d,
+        "ks_p": d_p,
+    }
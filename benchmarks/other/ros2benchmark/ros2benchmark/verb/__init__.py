@@ -3,6 +3,8 @@
 # Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
 # Licensed under the Apache License, Version 2.0
 
+import calendar
+import datetime
 import os
 import subprocess
 import sys
@@ -137,6 +139,100 @@ class VerbExtension:
         raise NotImplementedError()
 
 
+# formats of the "timestampt" of results, e.g. 08-07-2023 or 2023-07-08 12:00:00
+TIMESTAMP_FORMATS = ("%d-%m-%Y", "%Y-%m-%d %H:%M:%S")
+
+
+def timestamp_epoch(timestampt):
+    """
+    Parses the "timestampt" of a result into seconds since the epoch (UTC)
+
+    :param timestampt: str in one of TIMESTAMP_FORMATS (or a datetime/date,
+    as YAML may load unquoted timestamps)
+    :returns: int
+    """
+    if isinstance(timestampt, datetime.datetime):
+        return calendar.timegm(timestampt.utctimetuple())
+    if isinstance(timestampt, datetime.date):
+        return calendar.timegm(timestampt.timetuple())
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(str(timestampt).strip(), timestamp_format)
+        except ValueError:
+            continue
+        return calendar.timegm(parsed.timetuple())
+    raise ValueError("Could not parse timestamp: {} (formats: {})".format(timestampt, TIMESTAMP_FORMATS))
+
+
+class Result:
+    """
+    Compact record of a benchmark result, with its timestamp parsed once
+
+    Fields can be accessed as attributes or as keys (e.g. result["value"]),
+    same as the result dicts of Benchmark. Fields other than the ones in
+    __slots__ (e.g. percentiles, histogram) are kept in "extra".
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "metric",
+        "metric_unit",
+        "type",
+        "hardware",
+        "category",
+        "timestampt",
+        "epoch",
+        "value",
+        "note",
+        "datasource",
+        "extra",
+    )
+
+    def __init__(self, **fields):
+        self.extra = {}
+        self.epoch = None
+        for key, value in fields.items():
+            self[key] = value
+        if self.epoch is None:
+            self.epoch = timestamp_epoch(self.timestampt)
+
+    @classmethod
+    def from_entry(cls, entry, benchmark):
+        """
+        Builds a record out of a result dict of a Benchmark
+        """
+        return cls(id=benchmark.id, name=benchmark.name, **entry)
+
+    def __getitem__(self, key):
+        if key != "extra" and key in self.__slots__:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key != "extra" and key in self.__slots__:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return (key != "extra" and key in self.__slots__) or key in self.extra
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def to_dict(self):
+        """
+        Plain representation of the record, including "epoch"
+        """
+        data = {key: getattr(self, key) for key in self.__slots__ if key != "extra"}
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return "Result({})".format(self.to_dict())
+
+
 class Benchmark:
     def __init__(self, yaml_file):
         with open(yaml_file, "r") as f:
@@ -149,6 +245,7 @@ class Benchmark:
         self.graph = yaml_data["graph"]
         self.reproduction = yaml_data["reproduction"]
         self.results = []
+        self.analysis = yaml_data.get("analysis")  # chains to analyze, see "ros2 benchmark analyze"
         self.path = yaml_file.replace("/benchmark.yaml", "")
 
         # print("debugging: ", self.name)
@@ -165,7 +262,7 @@ class Benchmark:
                 note = result["result"]["note"]
                 datasource = result["result"]["datasource"]
 
-                self.results.append({
+                entry = {
                     "metric": metric,
                     "metric_unit": metric_unit,
                     "type": result_type, # "type" is a reserved keyword in Python, so we use "result_type
@@ -175,11 +272,22 @@ class Benchmark:
                     "value": value,
                     "note": note,
                     "datasource": datasource
-                })
+                }
+                # keep structured extras (e.g. percentiles, jitter, histogram)
+                for key in result["result"]:
+                    if key not in entry:
+                        entry[key] = result["result"][key]
+                self.results.append(entry)
 
             except KeyError as e:
                 print(f"{e} not found in benchmark.yml of: {self.name} (timestamp: {timestampt})")
 
+    def records(self):
+        """
+        Returns the results of the benchmark as Result records
+        """
+        return [Result.from_entry(entry, self) for entry in self.results]
+
     def __str__(self):
         yaml_data = {
             "id": self.id,
@@ -190,6 +298,8 @@ class Benchmark:
             "reproduction": self.reproduction,
             "results": [{"result": result} for result in self.results]
         }
+        if self.analysis is not None:
+            yaml_data["analysis"] = self.analysis
 
         key_order = ["id", "name", "description", "short", "graph", "reproduction", "results"]
         return yaml.dump(yaml_data, sort_keys=key_order)
@@ -0,0 +1,130 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+from ros2benchmark.verb import VerbExtension, Benchmark, search_benchmarks, red
+import os
+import sys
+
+
+def find_benchmark(benchmark, searchpath="src"):
+    """
+    Returns the path of the benchmark.yaml of a benchmark, None if not found
+
+    :param: benchmark: benchmark id or name (e.g. a5 or a5_resize)
+    :param: searchpath: where to look for benchmarks
+    """
+    for meta in search_benchmarks(searchpath=searchpath):
+        bench = Benchmark(meta)
+        if benchmark in (bench.id, bench.name):
+            return meta
+    return None
+
+
+def parse_metrics(metrics):
+    """
+    Returns a list of metrics out of a string like "[latency, throughput]"
+    or "latency,power"
+    """
+    if isinstance(metrics, (list, tuple)):
+        return list(metrics)
+    return [element.strip() for element in metrics.strip("[]").split(",") if element.strip()]
+
+
+def analyze_benchmark(
+    benchmark_yaml,
+    hardware_device_type="cpu",
+    trace_path="/tmp/analysis/trace",
+    metrics=("latency",),
+    integrated=False,
+    trace_sets_filter_type=None,
+    workers=1,
+    probe_calibration=None,
+):
+    """
+    Analyzes the traces of a benchmark, as declared in the "analysis"
+    section of its benchmark.yaml
+
+    All metrics are analyzed in this process by a single analyzer, so
+    trace events are decoded once and shared among them.
+
+    :param: benchmark_yaml: path of the benchmark.yaml file
+    :param: hardware_device_type: hardware device type (e.g. cpu or fpga)
+    :param: trace_path: path to trace files (e.g. /tmp/analysis/trace)
+    :param: metrics: metrics to analyze (latency, throughput and/or power)
+    :param: integrated: integrated version of the nodes (only for fpga now)
+    :param: trace_sets_filter_type: "name" or "ID", overrides the benchmark's
+    :param: workers: processes decoding traces, see BenchmarkAnalyzer.set_parallel_decoding
+    :param: probe_calibration: output of probe_calibration, subtracts the cost
+    of the instrumentation from latencies, see BenchmarkAnalyzer.set_probe_calibration
+    """
+    # imported here, loads bt2, bokeh, pandas, etc.
+    from benchmark_utilities.analysis import BenchmarkAnalyzer
+
+    ba = BenchmarkAnalyzer.from_benchmark_yaml(benchmark_yaml, hardware_device_type, integrated)
+    if trace_sets_filter_type:
+        ba.set_trace_sets_filter_type(trace_sets_filter_type)
+    ba.set_parallel_decoding(workers)
+    if probe_calibration:
+        ba.set_probe_calibration(probe_calibration)
+    ba.analyze(parse_metrics(metrics), trace_path)
+    return ba
+
+
+class AnalyzeVerb(VerbExtension):
+    """
+    Analyze the traces of a benchmark in the workspace.
+
+    Chains of tracepoints are declared in the "analysis" section of each
+    benchmark's benchmark.yaml.
+
+    NOTE: each benchmark should follow the specification
+    detailed at https://github.com/robotperf/benchmarks/blob/main/benchmarks/README.md
+    """
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            "benchmark", help="Benchmark id or name (e.g. a5 or a5_resize)")
+        parser.add_argument(
+            "--hardware_device_type", default="cpu",
+            help="Hardware Device Type (e.g. cpu or fpga)")
+        parser.add_argument(
+            "--trace_path", default="/tmp/analysis/trace",
+            help="Path to trace files (e.g. /tmp/analysis/trace)")
+        parser.add_argument(
+            "--metrics", default="latency",
+            help="List of metrics to be analyzed (e.g. latency,throughput,power)")
+        parser.add_argument(
+            "--integrated", default="false",
+            help="Integrated or separated version of the Resize and Rectify nodes (only for fpga now)")
+        parser.add_argument(
+            "--trace_sets_filter_type", default=None,
+            help="Whether to filter trace sets by name or by unique ID (name or ID)")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Number of processes decoding traces (0 for all CPUs)")
+        parser.add_argument(
+            "--probe_calibration", default=None,
+            help="YAML file written by probe_calibration (a1_perception_2nodes), "
+                 "to subtract the cost of the instrumentation from latencies")
+        parser.add_argument(
+            "--searchpath", default="src",
+            help="Where to look for benchmarks")
+
+    def main(self, *, args):
+        benchmark_yaml = find_benchmark(args.benchmark, args.searchpath)
+        if not benchmark_yaml:
+            red("Benchmark " + args.benchmark + " not found in " + os.path.abspath(args.searchpath))
+            sys.exit(1)
+
+        analyze_benchmark(
+            benchmark_yaml,
+            args.hardware_device_type,
+            args.trace_path,
+            args.metrics,
+            args.integrated.lower() == "true",
+            args.trace_sets_filter_type,
+            args.workers or None,
+            args.probe_calibration,
+        )
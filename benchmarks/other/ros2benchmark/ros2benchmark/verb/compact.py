@@ -0,0 +1,39 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from ros2benchmark.verb import VerbExtension, green, yellow
+from ros2benchmark.api.journal import JOURNAL_FILENAME, compact_journal, read_journal
+
+
+class CompactVerb(VerbExtension):
+    """
+    Fold the results journal into each benchmark's benchmark.yaml.
+
+    Results are recorded by appending them to a journal (see
+    ros2benchmark.api.journal), so that concurrent jobs don't race
+    rewriting the same benchmark.yaml file.
+    """
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            "--searchpath", default="/tmp/benchmarks",
+            help="Benchmarks repo, where to look for benchmarks")
+        parser.add_argument(
+            "--journal", default=None,
+            help="Results journal, defaults to " + JOURNAL_FILENAME + " within searchpath")
+
+    def main(self, *, args):
+        journal_path = args.journal or os.path.join(args.searchpath, JOURNAL_FILENAME)
+        compacted = compact_journal(journal_path, args.searchpath)
+        for meta, count in compacted.items():
+            green("Added " + str(count) + " result(s) to " + meta)
+
+        if os.path.exists(journal_path):
+            with open(journal_path, "r") as journal_file:
+                left = read_journal(journal_file)
+            for entry in left:
+                yellow("Benchmark " + str(entry["benchmark"]) + " not found, result kept in " + journal_path)
@@ -0,0 +1,159 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+from ros2benchmark.verb import VerbExtension, search_benchmarks, red, yellow
+from ros2benchmark.api.results import ResultsIndex
+from ros2benchmark.api.statistics import Distribution, compare_distributions, describe_distribution
+import os
+import sys
+
+
+def parse_configuration(spec):
+    """
+    Returns the result fields selecting a configuration, out of a string
+    like "Intel i7-8700K" (hardware) or "hardware=Kria KR260,type=black"
+    """
+    if "=" not in spec:
+        return {"hardware": spec}
+    configuration = {}
+    for element in spec.split(","):
+        key, _, value = element.partition("=")
+        configuration[key.strip()] = value.strip()
+    return configuration
+
+
+def select_results(results, configuration):
+    return [result for result in results
+            if all(str(result.get(key)) == value for key, value in configuration.items())]
+
+
+def configuration_distribution(results):
+    """
+    Distribution of the samples of a configuration, aggregating its runs
+
+    Runs with a stored histogram contribute all their samples, merged. If
+    any run lacks it (e.g. results recorded before histograms were
+    stored), the value of each run is used as a sample instead.
+
+    :returns: (Distribution, "histograms" or "values")
+    """
+    histograms = [result.get("histogram") for result in results]
+    if histograms and all(histograms):
+        distribution = Distribution.from_histograms(histograms)
+        if distribution.n:
+            return distribution, "histograms"
+    return Distribution.from_samples([result["value"] for result in results]), "values"
+
+
+def compare_configurations(results, baseline, candidate, confidence=0.95, resamples=2000):
+    """
+    Compares the results of two configurations of a benchmark
+
+    :param results: results of the benchmark (e.g. out of a ResultsIndex)
+    :param baseline: dict of result fields selecting the baseline, see parse_configuration
+    :param candidate: dict of result fields selecting the candidate
+    :returns: dict with "baseline" and "candidate" summaries and the "comparison"
+    """
+    summaries = {}
+    distributions = {}
+    for label, configuration in (("baseline", baseline), ("candidate", candidate)):
+        selected = select_results(results, configuration)
+        if not selected:
+            raise ValueError("No results for the " + label + " configuration: " + str(configuration))
+        distribution, source = configuration_distribution(selected)
+        summary = describe_distribution(distribution, confidence, resamples)
+        summary.update({"runs": len(selected), "source": source})
+        summaries[label] = summary
+        distributions[label] = distribution
+    summaries["comparison"] = compare_distributions(
+        distributions["baseline"], distributions["candidate"], confidence, resamples)
+    return summaries
+
+
+def comparison_markdown(comparison, baseline_label, candidate_label, metric_unit="", alpha=0.05):
+    """
+    Markdown tables out of compare_configurations
+    """
+    def interval(summary, key):
+        low, high = summary[key + "_ci"]
+        return "{:.3f} [{:.3f}, {:.3f}]".format(summary[key], low, high)
+
+    md = "| Configuration | Runs | Samples | Median | Mean | p99 |\n"
+    md += "| --- | --- | --- | --- | --- | --- |\n"
+    for label, name in (("baseline", baseline_label), ("candidate", candidate_label)):
+        summary = comparison[label]
+        md += "| {} | {} | {} ({}) | {} | {} | {} |\n".format(
+            name, summary["runs"], summary["n"], summary["source"],
+            interval(summary, "median"), interval(summary, "mean"), interval(summary, "p99"))
+
+    result = comparison["comparison"]
+    low, high = result["median_difference_ci"]
+    significant = result["mann_whitney_p"] < alpha
+    md += "\n| Median change | Mann-Whitney U (p) | KS D (p) | Significant (p < {}) |\n".format(alpha)
+    md += "| --- | --- | --- | --- |\n"
+    md += "| {:+.3f} {} [{:+.3f}, {:+.3f}] ({:+.2f} %) | {:.1f} ({:.4f}) | {:.3f} ({:.4f}) | {} |\n".format(
+        result["median_difference"], metric_unit, low, high, result["median_change"],
+        result["mann_whitney_u"], result["mann_whitney_p"], result["ks_d"], result["ks_p"],
+        "yes" if significant else "no")
+    return md
+
+
+class CompareVerb(VerbExtension):
+    """
+    Compare the results of two configurations of a benchmark.
+
+    Runs of each configuration are aggregated (merging their histograms
+    when stored) and compared with bootstrap confidence intervals and
+    Mann-Whitney U and Kolmogorov-Smirnov tests.
+    """
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            "benchmark", help="Benchmark id or name (e.g. a1 or a1_perception_2nodes)")
+        parser.add_argument(
+            "--baseline", required=True,
+            help="Baseline configuration, hardware (e.g. \"Intel i7-8700K\") or fields (e.g. \"hardware=Kria KR260,type=black\")")
+        parser.add_argument(
+            "--candidate", required=True,
+            help="Candidate configuration, same syntax as --baseline")
+        parser.add_argument(
+            "--metric", default="latency",
+            help="Metric to compare (e.g. latency, throughput or power)")
+        parser.add_argument(
+            "--confidence", type=float, default=0.95,
+            help="Confidence level of the intervals")
+        parser.add_argument(
+            "--resamples", type=int, default=2000,
+            help="Number of bootstrap resamples")
+        parser.add_argument(
+            "--searchpath", default="src",
+            help="Where to look for benchmarks")
+
+    def main(self, *, args):
+        benchmark_meta_paths = search_benchmarks(searchpath=args.searchpath)
+        with ResultsIndex() as index:
+            index.refresh(benchmark_meta_paths)
+            ids = [benchmark_id for benchmark_id, name in index.benchmarks(benchmark_meta_paths)
+                   if args.benchmark in (benchmark_id, name)]
+            if not ids:
+                red("Benchmark " + args.benchmark + " not found in " + os.path.abspath(args.searchpath))
+                sys.exit(1)
+            results = index.results(benchmark_meta_paths, id=ids[0], metric=args.metric)
+
+        try:
+            comparison = compare_configurations(
+                results,
+                parse_configuration(args.baseline),
+                parse_configuration(args.candidate),
+                args.confidence,
+                args.resamples)
+        except ValueError as e:
+            red(str(e))
+            sys.exit(1)
+
+        for label in ("baseline", "candidate"):
+            if comparison[label]["source"] == "values":
+                yellow("No histograms stored for all " + label + " runs, comparing the value of each run instead")
+        print(comparison_markdown(comparison, args.baseline, args.candidate, results[0]["metric_unit"]))
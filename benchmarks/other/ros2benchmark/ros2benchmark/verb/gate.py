@@ -0,0 +1,92 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+
+from ros2benchmark.verb import VerbExtension, Result, search_benchmarks, green, red, yellow
+from ros2benchmark.api.journal import read_journal
+from ros2benchmark.api.regression import detect_regressions, regressions_markdown
+from ros2benchmark.api.results import ResultsIndex
+import os
+import sys
+
+
+def journal_results(journal_path, benchmarks):
+    """
+    Results of a journal not yet compacted (see "ros2 benchmark compact"), as Result records
+
+    :param benchmarks: list of (id, name) of the benchmarks, see ResultsIndex.benchmarks
+    """
+    if not journal_path or not os.path.exists(journal_path):
+        return []
+    ids = {name: benchmark_id for benchmark_id, name in benchmarks}
+    with open(journal_path, "r") as journal_file:
+        entries = read_journal(journal_file)
+    return [Result(id=ids[entry["benchmark"]], name=entry["benchmark"], **entry["result"])
+            for entry in entries if entry["benchmark"] in ids]
+
+
+class GateVerb(VerbExtension):
+    """
+    Check whether the latest results of the benchmarks regressed.
+
+    The latest run of each benchmark, hardware, type, datasource and metric
+    is compared against the runs before it (p99 latency, throughput and
+    power). Exits with a non-zero code if any of them regressed, so that
+    CI pipelines can block changes that make benchmarks slower.
+    """
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            "benchmarks", nargs="*",
+            help="Benchmark ids to check (e.g. a1 a2), all if none given")
+        parser.add_argument(
+            "--hardware", default=None,
+            help="Only check results of this hardware")
+        parser.add_argument(
+            "--tolerance", type=float, default=10.0,
+            help="Allowed change with respect to the baseline, in %%")
+        parser.add_argument(
+            "--mad_threshold", type=float, default=3.0,
+            help="Allowed change, in median absolute deviations of the baseline runs")
+        parser.add_argument(
+            "--window", type=int, default=10,
+            help="Number of previous runs making the baseline")
+        parser.add_argument(
+            "--min_baseline", type=int, default=3,
+            help="Minimum number of previous runs to check a benchmark")
+        parser.add_argument(
+            "--journal", default=None,
+            help="Also check results of this journal not yet compacted (e.g. /tmp/benchmarks/results.jsonl)")
+        parser.add_argument(
+            "--all", action="store_true",
+            help="List all results checked, not only regressions")
+        parser.add_argument(
+            "--searchpath", default="src",
+            help="Where to look for benchmarks")
+
+    def main(self, *, args):
+        benchmark_meta_paths = search_benchmarks(searchpath=args.searchpath)
+        with ResultsIndex() as index:
+            index.refresh(benchmark_meta_paths)
+            results = index.results(benchmark_meta_paths)
+            results += journal_results(args.journal, index.benchmarks(benchmark_meta_paths))
+
+        if args.benchmarks:
+            results = [result for result in results if result["id"] in args.benchmarks]
+        if args.hardware:
+            results = [result for result in results if result["hardware"] == args.hardware]
+
+        checks = detect_regressions(
+            results, args.tolerance, args.mad_threshold, args.window, args.min_baseline)
+        if not checks:
+            yellow("No results with at least " + str(args.min_baseline) + " previous runs to check")
+            return
+
+        regressions = [check for check in checks if check["regression"]]
+        if regressions or args.all:
+            print(regressions_markdown(checks, only_regressions=not args.all))
+        if regressions:
+            red(str(len(regressions)) + " of " + str(len(checks)) + " results regressed")
+            sys.exit(1)
+        green("No regressions in " + str(len(checks)) + " results checked")
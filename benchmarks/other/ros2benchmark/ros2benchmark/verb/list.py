@@ -6,6 +6,7 @@
 from ros2cli.node.strategy import add_arguments as add_strategy_node_arguments
 from ros2cli.node.strategy import NodeStrategy
 from ros2benchmark.verb import VerbExtension, Benchmark, run, search_benchmarks
+from ros2benchmark.api.results import ResultsIndex
 import os
 import yaml
 
@@ -22,6 +23,7 @@ class ListVerb(VerbExtension):
         # get paths of "benchmark.yaml" files for each benchmark
         benchmark_meta_paths = search_benchmarks()
         
-        for meta in benchmark_meta_paths:
-            benchmark = Benchmark(meta)
-            print(benchmark.name)
\ No newline at end of file
+        with ResultsIndex() as index:
+            index.refresh(benchmark_meta_paths)
+            for benchmark_id, name in index.benchmarks(benchmark_meta_paths):
+                print(name)
\ No newline at end of file
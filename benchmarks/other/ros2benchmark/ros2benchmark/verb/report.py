@@ -7,12 +7,66 @@ from ros2cli.node.strategy import add_arguments as add_strategy_node_arguments
 from ros2cli.node.strategy import NodeStrategy
 from ros2benchmark.verb import VerbExtension, Benchmark, run, search_benchmarks
 from ros2benchmark.verb.summary import SummaryVerb
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
 import os
 import yaml
 import pprint
-import matplotlib.pyplot as plt
 import arrow
-import random
+import zlib
+
+
+def plot_digest(plot):
+    """
+    Hash of everything a plot is rendered from
+    """
+    content = json.dumps(plot, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(content).hexdigest()
+
+
+def render_plot(plot, force=False):
+    """
+    Render a bar plot prepared with ReportVerb.prepare_plot and save it to
+    plot["plotpath"]
+
+    The hash of the plot data is saved next to the figure (.sha1), the plot
+    is skipped when the figure exists and its data didn't change since.
+    Bar colors are derived from the bar names, so that they don't change
+    across renders.
+
+    :returns: True if rendered, False if skipped
+    """
+    digest = plot_digest(plot)
+    digestpath = plot["plotpath"] + ".sha1"
+    if not force and os.path.exists(plot["plotpath"]) and os.path.exists(digestpath):
+        with open(digestpath, "r") as f:
+            if f.read().strip() == digest:
+                return False
+
+    import matplotlib
+    matplotlib.use("Agg")  # render off-screen, also within worker processes
+    import matplotlib.pyplot as plt
+
+    colors = [plt.cm.viridis((zlib.crc32(name.encode("utf-8")) % 1000) / 1000.0, alpha=alpha)
+              for name, alpha in zip(plot["names"], plot["alphas"])]
+
+    # Create a bar plot
+    plt.figure(figsize=(10, 5))
+    # plt.bar(names, values, color='blue')
+    plt.bar(plot["names"], plot["values"], color=colors)
+    plt.title(plot["title"])
+    plt.xlabel(plot["xlabel"])
+    plt.ylabel(plot["ylabel"])
+    plt.xticks(rotation=87)  # Rotate x-axis labels for better visibility
+
+    # Save the figure and close
+    plt.savefig(plot["plotpath"], bbox_inches='tight')
+    plt.close()
+
+    with open(digestpath, "w") as f:
+        f.write(digest)
+    return True
 
 
 class ReportVerb(VerbExtension):
@@ -78,32 +132,25 @@ class ReportVerb(VerbExtension):
         return return_str
 
     @staticmethod
-    def plot_data(data, 
-                  title,
-                  xlabel,
-                  ylabel,
-                  name_function=plot_function_names,
-                  value_function=plot_function_values, 
-                  filter=None, 
-                  unique=False,
-                  sortedata=False, 
-                  sortedatareverse=False,
-                  filterout=None):
+    def prepare_plot(data, 
+                     title,
+                     xlabel,
+                     ylabel,
+                     name_function=plot_function_names,
+                     value_function=plot_function_values, 
+                     filter=None, 
+                     unique=False,
+                     sortedata=False, 
+                     sortedatareverse=False,
+                     filterout=None):
         """
-        Plot the data in a bar plot and save it to a file.
+        Prepare the data of a bar plot, see plot_data for the parameters.
 
-        :param data: list of dicts with the data to plot
-        :param title: title of the plot
-        :param name_function: function to extract the name from the data
-        :param value_function: function to extract the value from the data
-        :param filter: function to filter the data
-        :param unique: if True, only the most recent entry for each 'name', 'hardware', 'type', 'datasource' combination is plotted
-        :param sortedata: if True, the data is sorted by value
-        :param sortedatareverse: if True, the data is sorted by value in reverse order
-        :param filterout: list of tuples (hardware, type) to filter out and not consider
+        :returns: dict with everything needed to render the plot (see render_plot),
+        made of plain values so that it can be sent to another process
         """
 
-        plotpath = '/tmp/report-' + title + '-latency.png'
+        plotpath = '/tmp/report-' + title + '.png'  # titles name the metric, e.g. a1-latency
         if filter:
             # Filter data using the provided function
             filtered_data = [d for d in data if filter(d)]
@@ -118,7 +165,7 @@ class ReportVerb(VerbExtension):
                 name = entry['name'] + entry['hardware'] + entry['type'] + entry['datasource']
             
                 # NOTE: condition 1: if not in dict or more recent than the one in the dict
-                # if name not in filtered_dict or arrow.get(entry['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime > arrow.get(filtered_dict[name]['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime:
+                # if name not in filtered_dict or entry['epoch'] > filtered_dict[name]['epoch']:
 
                 # NOTE: condition 2: if not in dict or lower "value" than the one in the dict
                 # not in filterout and greater then 0.001 (heuristic to remove outliers, close to zero)
@@ -134,40 +181,82 @@ class ReportVerb(VerbExtension):
             filtered_data = sorted(filtered_data, key=lambda x: x['value'], reverse=True)
 
         # extac
-        names = [name_function(d) for d in filtered_data]
-        values = [value_function(d) for d in filtered_data]
+        return {
+            "plotpath": plotpath,
+            "title": title,
+            "xlabel": xlabel,
+            "ylabel": ylabel,
+            "names": [name_function(d) for d in filtered_data],
+            "values": [value_function(d) for d in filtered_data],
+            "alphas": [0.2 if (d['type'].lower() == "grey") else 1.0 for d in filtered_data],
+        }
 
+    @staticmethod
+    def plot_data(data, 
+                  title,
+                  xlabel,
+                  ylabel,
+                  name_function=plot_function_names,
+                  value_function=plot_function_values, 
+                  filter=None, 
+                  unique=False,
+                  sortedata=False, 
+                  sortedatareverse=False,
+                  filterout=None):
+        """
+        Plot the data in a bar plot and save it to a file.
 
-        # # debug
-        # print(names)
-        # print(values)
-        # # print(filtered_data)
-        
-        # colors = [plt.cm.viridis(random.random()) for _ in range(len(names))]
-        colors = [plt.cm.viridis(random.random(), alpha=0.2 if (data['type'].lower() == "grey") else 1.0) for data in filtered_data]
-
-        # Create a bar plot
-        plt.figure(figsize=(10, 5))
-        # plt.bar(names, values, color='blue')
-        plt.bar(names, values, color=colors)
-        plt.title(title)
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
-        plt.xticks(rotation=87)  # Rotate x-axis labels for better visibility
-
-        # Save the figure and close
-        plt.savefig(plotpath, bbox_inches='tight')
-        plt.close()
-        
-        return plotpath
+        :param data: list of dicts with the data to plot
+        :param title: title of the plot
+        :param name_function: function to extract the name from the data
+        :param value_function: function to extract the value from the data
+        :param filter: function to filter the data
+        :param unique: if True, only the most recent entry for each 'name', 'hardware', 'type', 'datasource' combination is plotted
+        :param sortedata: if True, the data is sorted by value
+        :param sortedatareverse: if True, the data is sorted by value in reverse order
+        :param filterout: list of tuples (hardware, type) to filter out and not consider
+        """
+        plot = ReportVerb.prepare_plot(data, title, xlabel, ylabel,
+                                       name_function=name_function,
+                                       value_function=value_function,
+                                       filter=filter,
+                                       unique=unique,
+                                       sortedata=sortedata,
+                                       sortedatareverse=sortedatareverse,
+                                       filterout=filterout)
+        render_plot(plot)
+        return plot["plotpath"]
 
+    @staticmethod
+    def render_plots(plots, workers=None, force=False):
+        """
+        Render plots (see prepare_plot) in a pool of processes
+
+        :param workers: number of processes, defaults to the number of CPUs
+        :param force: render all plots, even if their data didn't change
+        :returns: number of plots rendered
+        """
+        if not plots:
+            return 0
+        if workers == 1:
+            return sum(render_plot(plot, force) for plot in plots)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return sum(pool.map(render_plot, plots, [force] * len(plots)))
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            "--workers", type=int, default=0,
+            help="Number of processes rendering plots (0 for all CPUs)")
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Render all plots, even those whose data didn't change")
 
     def main(self, *, args):
         # get paths of "benchmark.yaml" files for each benchmark
         benchmark_meta_paths = search_benchmarks()
         list_results = SummaryVerb.preprocess(benchmark_meta_paths)
-        list_ids = SummaryVerb.extract_unique_x(list_results, "id")
-        alphabetical_list_ids = sorted(list_ids)
+        results_by_id_metric = SummaryVerb.group_by(list_results, "id", "metric")
+        alphabetical_list_ids = sorted({benchmark_id for benchmark_id, metric in results_by_id_metric})
 
         # pprint.pprint(list_results)
 
@@ -220,6 +309,7 @@ class ReportVerb(VerbExtension):
         # 1. Print all results for each benchmark
         ######################################################
         benchmark_id_report += "## Benchmark results by `id`\n"
+        plots = []  # rendered at once, see ReportVerb.render_plots
 
         # unique condition
         unique_condition = True
@@ -243,17 +333,19 @@ class ReportVerb(VerbExtension):
 
             ## ⏱ latency
             filter_out = [("Kria KR260", "black")]
-            filtered_data = [item for item in list_results if (item['id'] == benchmark_id and item['metric'] == "latency")]
+            filtered_data = results_by_id_metric.get((benchmark_id, "latency"), [])
             sorted_filtered_data = sorted(filtered_data, key=lambda x: x['value'])
-            plotpath = (ReportVerb.plot_data(sorted_filtered_data,
-                                             xlabel="Hardware (timestamp)",
-                                             ylabel="Latency (ms)",
-                                             name_function=ReportVerb.plot_function_names_forid,
-                                             value_function=ReportVerb.plot_function_values,
-                                             title=benchmark_id + "-latency",
-                                             unique=unique_condition,
-                                             sortedata=True,
-                                             filterout = filter_out))
+            plot = (ReportVerb.prepare_plot(sorted_filtered_data,
+                                            xlabel="Hardware (timestamp)",
+                                            ylabel="Latency (ms)",
+                                            name_function=ReportVerb.plot_function_names_forid,
+                                            value_function=ReportVerb.plot_function_values,
+                                            title=benchmark_id + "-latency",
+                                            unique=unique_condition,
+                                            sortedata=True,
+                                            filterout = filter_out))
+            plots.append(plot)
+            plotpath = plot["plotpath"]
             benchmark_id_report += f"\n![{plotpath}]({plotpath})\n"
             benchmark_id_report += SummaryVerb.to_markdown_table(sorted_filtered_data, 
                                                                  benchmark_id+"-latency",
@@ -263,17 +355,19 @@ class ReportVerb(VerbExtension):
 
             ## ⚡ power
             filter_out = []
-            filtered_data = [item for item in list_results if (item['id'] == benchmark_id and item['metric'] == "power")]
+            filtered_data = results_by_id_metric.get((benchmark_id, "power"), [])
             sorted_filtered_data = sorted(filtered_data, key=lambda x: x['value'])
-            plotpath = (ReportVerb.plot_data(sorted_filtered_data,
-                                             xlabel="Hardware (timestamp)",
-                                             ylabel="Power (W)",
-                                             name_function=ReportVerb.plot_function_names_forid,
-                                             value_function=ReportVerb.plot_function_values,
-                                             title=benchmark_id + "-power",
-                                             unique=unique_condition,
-                                             sortedata=True,
-                                             filterout = filter_out))
+            plot = (ReportVerb.prepare_plot(sorted_filtered_data,
+                                            xlabel="Hardware (timestamp)",
+                                            ylabel="Power (W)",
+                                            name_function=ReportVerb.plot_function_names_forid,
+                                            value_function=ReportVerb.plot_function_values,
+                                            title=benchmark_id + "-power",
+                                            unique=unique_condition,
+                                            sortedata=True,
+                                            filterout = filter_out))
+            plots.append(plot)
+            plotpath = plot["plotpath"]
             benchmark_id_report += f"\n![{plotpath}]({plotpath})\n"
             benchmark_id_report += SummaryVerb.to_markdown_table(sorted_filtered_data, 
                                                                  benchmark_id+"-power",
@@ -283,17 +377,19 @@ class ReportVerb(VerbExtension):
 
             ## 📶 throughput
             filter_out = []
-            filtered_data = [item for item in list_results if (item['id'] == benchmark_id and item['metric'] == "throughput")]
+            filtered_data = results_by_id_metric.get((benchmark_id, "throughput"), [])
             sorted_filtered_data = sorted(filtered_data, key=lambda x: x['value'], reverse=True)
-            plotpath = (ReportVerb.plot_data(sorted_filtered_data,
-                                             xlabel="Hardware (timestamp)",
-                                             ylabel="Throughput (FPS)",
-                                             name_function=ReportVerb.plot_function_names_forid,
-                                             value_function=ReportVerb.plot_function_values,
-                                             title=benchmark_id + "-throughput",
-                                             unique=unique_condition,
-                                             sortedatareverse=True,
-                                             filterout = filter_out))
+            plot = (ReportVerb.prepare_plot(sorted_filtered_data,
+                                            xlabel="Hardware (timestamp)",
+                                            ylabel="Throughput (FPS)",
+                                            name_function=ReportVerb.plot_function_names_forid,
+                                            value_function=ReportVerb.plot_function_values,
+                                            title=benchmark_id + "-throughput",
+                                            unique=unique_condition,
+                                            sortedatareverse=True,
+                                            filterout = filter_out))
+            plots.append(plot)
+            plotpath = plot["plotpath"]
             benchmark_id_report += f"\n![{plotpath}]({plotpath})\n"
             benchmark_id_report += SummaryVerb.to_markdown_table(sorted_filtered_data, 
                                                                  benchmark_id+"-throughput",
@@ -308,12 +404,14 @@ class ReportVerb(VerbExtension):
         # ######################################################
         benchmark_id_report += "## Benchmarking results by `hardware` solution\n"
         # NOTE: ordered by timestamp and name
-        list_hardware = SummaryVerb.extract_unique_x(list_results, "hardware")
-        for hw in list_hardware:
-            extracted_data = [d for d in list_results if d['hardware'] == hw]
+        for hw, extracted_data in SummaryVerb.group_by(list_results, "hardware").items():
             benchmark_id_report += SummaryVerb.to_markdown_table(extracted_data, hw)
         
 
+        # render plots, only those whose data changed
+        rendered = ReportVerb.render_plots(plots, args.workers or None, args.force)
+        print("Rendered {} of {} plots".format(rendered, len(plots)))
+
         # produce report
         self.write_to_file('/tmp/report.md', benchmark_id_report)
         print("Writing report to /tmp/report.md")
@@ -6,11 +6,11 @@
 from ros2cli.node.strategy import add_arguments as add_strategy_node_arguments
 from ros2cli.node.strategy import NodeStrategy
 from ros2benchmark.verb import VerbExtension, Benchmark, run, search_benchmarks
+from ros2benchmark.api.results import DEFAULT_INDEX_PATH, ResultsIndex
 import os
 import yaml
 import pprint
 import matplotlib.pyplot as plt
-import arrow
 
 
 class SummaryVerb(VerbExtension):
@@ -22,10 +22,15 @@ class SummaryVerb(VerbExtension):
     """
 
     @staticmethod
-    def preprocess(benchmark_meta_paths):
+    def preprocess(benchmark_meta_paths, index_path=DEFAULT_INDEX_PATH):
         """ Preprocess a benchmark and return list with all results
 
-        End up dumpting a list with dicts as follows
+        Results are read from a ResultsIndex, which only re-parses the
+        benchmark.yaml files changed since the last invocation. Pass
+        index_path=None to parse every file instead.
+
+        End up dumpting a list with Result records (see ros2benchmark.verb.Result),
+        whose timestamps are parsed once into "epoch", as follows
         {
             "metric": metric,
             "metric_unit": metric_unit,
@@ -38,16 +43,18 @@ class SummaryVerb(VerbExtension):
             "datasource": datasource
             "name": name
             "id": id
+            "epoch": seconds since the epoch of timestampt
         }    
         """
+        if index_path is not None:
+            with ResultsIndex(index_path) as index:
+                index.refresh(benchmark_meta_paths)
+                return index.results(benchmark_meta_paths)
+
         list_preprocess = []
         
         for meta in benchmark_meta_paths:
-            benchmark = Benchmark(meta)
-            for result in benchmark.results:
-                result["name"] = benchmark.name
-                result["id"] = benchmark.id
-                list_preprocess.append(result)
+            list_preprocess.extend(Benchmark(meta).records())
         
         return list_preprocess
 
@@ -60,7 +67,7 @@ class SummaryVerb(VerbExtension):
         filtered_dict = {}
         for entry in data:
             name = entry['name'] + entry['hardware'] + entry['type'] + entry['datasource']
-            if name not in filtered_dict or arrow.get(entry['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime > arrow.get(filtered_dict[name]['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime:
+            if name not in filtered_dict or entry['epoch'] > filtered_dict[name]['epoch']:
                 filtered_dict[name] = entry
         return filtered_dict.values()        
 
@@ -72,19 +79,19 @@ class SummaryVerb(VerbExtension):
         filtered_dict = {}
         for entry in filtered_data:
             name = entry['name']
-            if name not in filtered_dict or arrow.get(entry['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime > arrow.get(filtered_dict[name]['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime:
+            if name not in filtered_dict or entry['epoch'] > filtered_dict[name]['epoch']:
                 filtered_dict[name] = entry
 
-        # Extract 'name' and 'value' for each filtered record
-        names = [d['name'] for d in filtered_dict.values()]
-        values = [d['value'] for d in filtered_dict.values()]
-
+        # sort records (not names and values apart, which would unpair them)
+        filtered_data = list(filtered_dict.values())
         if sortedata:
-            names = sorted(names, key=lambda x: x['value'])
-            values = sorted(values, key=lambda x: x['value'])
+            filtered_data.sort(key=lambda x: x['value'])
         if sortedatareverse:
-            names = sorted(names, key=lambda x: x['value'], reverse=True)
-            values = sorted(values, key=lambda x: x['value'], reverse=True)
+            filtered_data.sort(key=lambda x: x['value'], reverse=True)
+
+        # Extract 'name' and 'value' for each filtered record
+        names = [d['name'] for d in filtered_data]
+        values = [d['value'] for d in filtered_data]
 
         # Create a bar plot
         plt.figure(figsize=(10, 5))
@@ -101,6 +108,17 @@ class SummaryVerb(VerbExtension):
     def filter_robotcore(d):
         return d['hardware'] == 'ROBOTCORE'
 
+    @staticmethod
+    def group_by(data, *keys):
+        """ Groups data in a single pass, returns a dict mapping the values of
+        keys (a tuple if several keys) to the list of entries with them,
+        in order of first appearance"""
+        groups = {}
+        for d in data:
+            group = d[keys[0]] if len(keys) == 1 else tuple(d[key] for key in keys)
+            groups.setdefault(group, []).append(d)
+        return groups
+
     @staticmethod
     def extract_unique_x(data, x="hardware"):
         hardware_set = {d[x] for d in data}
@@ -116,7 +134,7 @@ class SummaryVerb(VerbExtension):
         # Sort the data by 'timestampt' and 'name' and 'metric'
         sorted_data = sorted(
             data,
-            key=lambda d: (arrow.get(d['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime, d['name']),
+            key=lambda d: (d['epoch'], d['name']),
             reverse=True
         )
 
@@ -128,7 +146,7 @@ class SummaryVerb(VerbExtension):
                 name = entry['name'] + entry['hardware'] + entry['type'] + entry['datasource']
             
                 # NOTE: condition 1: if not in dict or more recent than the one in the dict
-                # if name not in filtered_dict or arrow.get(entry['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime > arrow.get(filtered_dict[name]['timestampt'], ['D-M-YYYY', 'YYYY-MM-DD HH:mm:ss']).datetime:
+                # if name not in filtered_dict or entry['epoch'] > filtered_dict[name]['epoch']:
 
                 # NOTE: condition 2: if not in dict or lower "value" than the one in the dict
                 # not in filterout and greater then 0.001 (heuristic to remove outliers, close to zero)
@@ -229,9 +247,7 @@ class SummaryVerb(VerbExtension):
         # 2. Print all results grouped by hardware solution, for all of the solutions
         ######################################################
         # NOTE: ordered by timestamp and name
-        list_hardware = self.extract_unique_x(list_results, "hardware")
-        for hw in list_hardware:
-            extracted_data = [d for d in list_results if d['hardware'] == hw]
+        for hw, extracted_data in SummaryVerb.group_by(list_results, "hardware").items():
             print(SummaryVerb.to_markdown_table(extracted_data, hw))
         ######################################################                
 
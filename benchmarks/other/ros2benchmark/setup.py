@@ -43,6 +43,10 @@ The package provides the benchmark command for the ROS 2 command line tools.""",
             "update = ros2benchmark.verb.update:UpdateVerb",
             "summary = ros2benchmark.verb.summary:SummaryVerb",
             "report = ros2benchmark.verb.report:ReportVerb",
+            "analyze = ros2benchmark.verb.analyze:AnalyzeVerb",
+            "compact = ros2benchmark.verb.compact:CompactVerb",
+            "compare = ros2benchmark.verb.compare:CompareVerb",
+            "gate = ros2benchmark.verb.gate:GateVerb",
         ],
     },
 )
@@ -0,0 +1,76 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import pytest
+
+pytest.importorskip("ament_index_python")
+pytest.importorskip("ros2cli")
+yaml = pytest.importorskip("yaml")
+
+from ros2benchmark.api.journal import append_result, compact_journal, read_journal  # noqa: E402
+
+BENCHMARK = {
+    "id": "a1",
+    "name": "a1_perception_2nodes",
+    "description": "Perception computational graph with 2 nodes",
+    "short": "Graph with 2 nodes",
+    "graph": "imgs/a1_perception_2nodes.svg",
+    "reproduction": "ros2 launch a1_perception_2nodes trace_a1_perception_2nodes.launch.py",
+    "results": [],
+}
+
+
+def make_result(value):
+    return {
+        "hardware": "kr260",
+        "category": "perception",
+        "metric": "latency",
+        "metric_unit": "ms",
+        "timestampt": "2023-05-01 10:00:00",
+        "value": value,
+        "note": "",
+        "datasource": "perception/image",
+        "type": "grey",
+        "percentiles": {"p50": value, "p99": 2 * value},
+    }
+
+
+def test_journal_round_trip(tmp_path):
+    journal = str(tmp_path / "results.jsonl")
+    for value in (1.0, 2.0, 3.0):
+        append_result(journal, "a1_perception_2nodes", make_result(value))
+    # a job killed while writing its line
+    with open(journal, "a") as f:
+        f.write('{"benchmark": "a1_perception_2nodes", "res')
+
+    with open(journal) as f:
+        entries = read_journal(f)
+    assert [entry["benchmark"] for entry in entries] == ["a1_perception_2nodes"] * 3
+    assert [entry["result"] for entry in entries] == [make_result(value) for value in (1.0, 2.0, 3.0)]
+
+
+def test_compact_journal(tmp_path):
+    meta = tmp_path / "benchmarks" / "a1_perception_2nodes" / "benchmark.yaml"
+    meta.parent.mkdir(parents=True)
+    meta.write_text(yaml.dump(BENCHMARK))
+    journal = str(tmp_path / "results.jsonl")
+    append_result(journal, "a1_perception_2nodes", make_result(1.0))
+    append_result(journal, "unknown", make_result(5.0))
+    append_result(journal, "a1_perception_2nodes", make_result(2.0))
+    with open(journal, "a") as f:
+        f.write('{"benchmark": "a1_perception_2nodes"')
+
+    assert compact_journal(journal, str(tmp_path / "benchmarks")) == {str(meta): 2}
+    with open(meta) as f:
+        results = [entry["result"] for entry in yaml.safe_load(f)["results"]]
+    assert [result["value"] for result in results] == [1.0, 2.0]
+    assert results[1]["percentiles"] == {"p50": 2.0, "p99": 4.0}
+
+    # results of benchmarks not found stay, the truncated line is dropped
+    with open(journal) as f:
+        assert [entry["benchmark"] for entry in read_journal(f)] == ["unknown"]
+    assert compact_journal(journal, str(tmp_path / "benchmarks")) == {}
+    assert compact_journal(str(tmp_path / "missing.jsonl"), str(tmp_path / "benchmarks")) == {}
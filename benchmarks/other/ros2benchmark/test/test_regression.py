@@ -0,0 +1,81 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("ament_index_python")
+
+from ros2benchmark.api.regression import detect_regressions  # noqa: E402
+
+
+def make_runs(values, metric="latency", p99s=None, id="a1"):
+    """
+    Results of consecutive runs of a benchmark, oldest first
+    """
+    runs = []
+    for epoch, value in enumerate(values):
+        result = {
+            "id": id,
+            "hardware": "kr260",
+            "type": "grey",
+            "datasource": "perception/image",
+            "metric": metric,
+            "metric_unit": "ms" if metric == "latency" else "fps",
+            "timestampt": "2023-05-0{} 10:00:00".format(epoch + 1),
+            "epoch": 1682935200 + 86400 * epoch,
+            "value": value,
+        }
+        if p99s is not None and p99s[epoch] is not None:
+            result["percentiles"] = {"p50": value, "p99": p99s[epoch]}
+        runs.append(result)
+    return runs
+
+
+def test_p99_and_value_fallback():
+    values = [10.0, 10.1, 9.9, 10.0, 10.1, 10.0]
+    p99s = [20.0, 20.2, 19.8, 20.1, 19.9, 30.0]
+    (check,) = detect_regressions(make_runs(values, p99s=p99s))
+    assert check["statistic"] == "p99"
+    assert check["baseline"] == 20.0
+    assert check["baseline_runs"] == 5
+    assert check["latest"] == 30.0
+    assert check["change"] == pytest.approx(50.0)
+    assert check["regression"]
+
+    # a run without p99 compares all of them by their value
+    p99s[2] = None
+    (check,) = detect_regressions(make_runs(values, p99s=p99s))
+    assert check["statistic"] == "value"
+    assert check["baseline"] == 10.0
+    assert not check["regression"]
+
+
+def test_direction():
+    regressions = {}
+    for metric, latest in (("latency", 12.0), ("latency", 8.0), ("throughput", 8.0), ("throughput", 12.0)):
+        (check,) = detect_regressions(make_runs([10.0] * 4 + [latest], metric))
+        regressions[(metric, latest)] = check["regression"]
+    assert regressions == {
+        ("latency", 12.0): True,
+        ("latency", 8.0): False,
+        ("throughput", 8.0): True,
+        ("throughput", 12.0): False,
+    }
+
+    # within the tolerance, or within the noise of the baseline
+    assert not detect_regressions(make_runs([10.0] * 4 + [10.5]))[0]["regression"]
+    assert not detect_regressions(make_runs([8.0, 12.0, 9.0, 11.0, 12.5]))[0]["regression"]
+
+
+def test_min_baseline():
+    results = make_runs([10.0, 10.0, 10.0, 20.0], id="a1") + make_runs([10.0, 10.0, 20.0], id="a2")
+    results += make_runs([1.0, 1.0, 1.0, 5.0], metric="power_consumption")  # no direction known
+    # runs are sorted by time, regardless of the order they are given in
+    checks = detect_regressions(list(reversed(results)), min_baseline=3)
+    assert [(check["id"], check["regression"]) for check in checks] == [("a1", True)]
+    assert [check["id"] for check in detect_regressions(results, min_baseline=2)] == ["a1", "a2"]
+    assert detect_regressions(results, min_baseline=4) == []
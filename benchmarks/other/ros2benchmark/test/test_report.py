@@ -0,0 +1,55 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import pytest
+
+pytest.importorskip("ament_index_python")
+pytest.importorskip("ros2cli")
+pytest.importorskip("yaml")
+pytest.importorskip("arrow")
+pytest.importorskip("matplotlib")
+
+from ros2benchmark.verb.report import ReportVerb, render_plot  # noqa: E402
+
+
+def make_results(values):
+    return [
+        {"name": "a1_perception_2nodes", "hardware": hardware, "type": "grey",
+         "datasource": "perception/image", "value": value}
+        for hardware, value in zip(("Kria KR260", "Intel i7-8700K"), values)
+    ]
+
+
+def prepare(tmp_path, metric, values):
+    plot = ReportVerb.prepare_plot(make_results(values), "a1-" + metric, "Hardware (timestamp)", "Value",
+                                   name_function=ReportVerb.plot_function_names_forid, sortedata=True)
+    plot["plotpath"] = str(tmp_path / plot["plotpath"].lstrip("/").replace("/", "-"))
+    return plot
+
+
+def test_plot_paths_name_their_metric():
+    paths = [ReportVerb.prepare_plot(make_results([1.0, 2.0]), "a1-" + metric, "", "")["plotpath"]
+             for metric in ("latency", "throughput", "power")]
+    assert paths == ["/tmp/report-a1-latency.png", "/tmp/report-a1-throughput.png", "/tmp/report-a1-power.png"]
+
+
+def test_render_skips_unchanged_plots(tmp_path):
+    plot = prepare(tmp_path, "latency", [1.0, 2.0])
+    assert render_plot(plot)
+    with open(plot["plotpath"] + ".sha1") as f:
+        digest = f.read()
+
+    # same data, skipped unless forced
+    assert not render_plot(prepare(tmp_path, "latency", [1.0, 2.0]))
+    assert render_plot(prepare(tmp_path, "latency", [1.0, 2.0]), force=True)
+
+    # data changed, rendered again
+    plot = prepare(tmp_path, "latency", [1.0, 3.0])
+    assert render_plot(plot)
+    with open(plot["plotpath"] + ".sha1") as f:
+        assert f.read() != digest
+    assert not render_plot(plot)
+    assert ReportVerb.render_plots([plot, prepare(tmp_path, "power", [1.0, 3.0])], workers=1) == 1
@@ -0,0 +1,86 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import os
+
+import pytest
+
+pytest.importorskip("ament_index_python")
+pytest.importorskip("ros2cli")
+yaml = pytest.importorskip("yaml")
+
+from ros2benchmark.api.results import ResultsIndex  # noqa: E402
+
+
+def make_benchmark(id, name, values):
+    return {
+        "id": id,
+        "name": name,
+        "description": "",
+        "short": "",
+        "graph": "",
+        "reproduction": "",
+        "results": [
+            {"result": {
+                "hardware": "kr260",
+                "category": "perception",
+                "metric": "latency",
+                "metric_unit": "ms",
+                "timestampt": "2023-05-01 10:00:00",
+                "value": value,
+                "note": "",
+                "datasource": "perception/image",
+                "type": "grey",
+            }}
+            for value in values
+        ],
+    }
+
+
+def write_benchmark(tmp_path, id, name, values):
+    meta = tmp_path / "benchmarks" / name / "benchmark.yaml"
+    meta.parent.mkdir(parents=True, exist_ok=True)
+    meta.write_text(yaml.dump(make_benchmark(id, name, values)))
+    return str(meta)
+
+
+def test_refresh_reparses_changed_files_only(tmp_path, monkeypatch):
+    metas = [
+        write_benchmark(tmp_path, "a1", "a1_perception_2nodes", [1.0, 2.0]),
+        write_benchmark(tmp_path, "a2", "a2_rectify", [3.0]),
+    ]
+    parsed = []
+    index_file = ResultsIndex.index_file
+    monkeypatch.setattr(ResultsIndex, "index_file",
+                        lambda self, meta, *args: parsed.append(meta) or index_file(self, meta, *args))
+
+    with ResultsIndex(str(tmp_path / "index.sqlite3")) as index:
+        assert index.refresh(metas) == 2
+        assert [result.value for result in index.results()] == [1.0, 2.0, 3.0]
+        assert index.refresh(metas) == 0
+
+        # touched, same content
+        stat = os.stat(metas[0])
+        os.utime(metas[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        assert index.refresh(metas) == 0
+
+        write_benchmark(tmp_path, "a2", "a2_rectify", [3.0, 4.0])
+        del parsed[:]
+        assert index.refresh(metas) == 1
+        assert parsed == [metas[1]]
+        assert [result.value for result in index.results(id="a2")] == [3.0, 4.0]
+        assert [result.value for result in index.results(id="a1")] == [1.0, 2.0]
+
+        # removed since indexed
+        os.remove(metas[0])
+        assert index.refresh(metas[1:]) == 0
+        assert index.benchmarks() == [("a2", "a2_rectify")]
+        assert [result.id for result in index.results()] == ["a2", "a2"]
+
+    # persisted across connections
+    with ResultsIndex(str(tmp_path / "index.sqlite3")) as index:
+        assert index.refresh(metas[1:]) == 0
+        assert [result.value for result in index.results()] == [3.0, 4.0]
@@ -0,0 +1,95 @@
+# Copyright (C) Acceleration Robotics S.L.U. - All Rights Reserved
+#
+# Written by Víctor Mayoral-Vilches <victor@accelerationrobotics.com>
+# Licensed under the Apache License, Version 2.0
+#
+
+import json
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("ament_index_python")
+
+from ros2benchmark.api.statistics import (  # noqa: E402
+    Distribution,
+    kolmogorov_smirnov,
+    mann_whitney_u,
+)
+
+PRECISION = 0.01
+LOWEST = 0.001
+
+
+def make_histogram(values):
+    """
+    Histogram of values as stored with results, see LatencyHistogram.to_dict
+    """
+    buckets = {}
+    for value in values:
+        index = int(math.log(value / LOWEST) / math.log1p(PRECISION))
+        buckets[index] = buckets.get(index, 0) + 1
+    return {
+        "precision": PRECISION,
+        "lowest": LOWEST,
+        "count": len(values),
+        "min": min(values),
+        "max": max(values),
+        "sum": sum(values),
+        "sum_squares": sum(value * value for value in values),
+        "buckets": buckets,
+    }
+
+
+def test_quantile():
+    distribution = Distribution.from_samples(np.arange(1, 101))
+    assert distribution.quantile(0.0) == 1
+    assert distribution.quantile(0.5) == 50
+    assert distribution.quantile(0.99) == 99
+    assert distribution.quantile(1.0) == 100
+    assert distribution.mean() == pytest.approx(50.5)
+
+    weighted = Distribution([1.0, 2.0, 3.0], [1, 1, 2])
+    assert len(weighted) == 4
+    assert [weighted.quantile(q) for q in (0.25, 0.5, 0.75, 1.0)] == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_from_histograms():
+    histograms = [make_histogram([1.0, 1.0, 2.0]), make_histogram([3.0, 3.0]), {}, {"count": 0}]
+    # bucket indices become strings once results went through JSON
+    stored = json.loads(json.dumps(histograms))
+    assert all(isinstance(index, str) for index in stored[0]["buckets"])
+
+    distribution = Distribution.from_histograms(stored)
+    assert len(distribution) == 5
+    # buckets are represented by their highest value, within the min and max
+    assert distribution.quantile(0.2) == pytest.approx(1.0, rel=PRECISION)
+    assert distribution.quantile(0.6) == 2.0
+    assert distribution.quantile(1.0) == 3.0
+    reference = Distribution.from_histograms(histograms)
+    assert distribution.values.tolist() == reference.values.tolist()
+    assert distribution.counts.tolist() == reference.counts.tolist()
+
+    assert len(Distribution.from_histograms([{}, None])) == 0
+
+
+def test_tests_match_scipy():
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(1)
+    # rounded, so that samples tie
+    baseline = np.round(rng.normal(10.0, 1.0, 500), 1)
+    candidate = np.round(rng.normal(10.2, 1.0, 400), 1)
+    baseline_distribution = Distribution.from_samples(baseline)
+    candidate_distribution = Distribution.from_samples(candidate)
+
+    u, p = mann_whitney_u(baseline_distribution, candidate_distribution)
+    expected = stats.mannwhitneyu(candidate, baseline, alternative="two-sided", method="asymptotic")
+    assert u == pytest.approx(expected.statistic)
+    assert p == pytest.approx(expected.pvalue)
+
+    # same statistic, p-values of slightly different asymptotic approximations
+    d, p = kolmogorov_smirnov(baseline_distribution, candidate_distribution)
+    expected = stats.ks_2samp(baseline, candidate, method="asymp")
+    assert d == pytest.approx(expected.statistic)
+    assert p == pytest.approx(expected.pvalue, rel=0.05)
@@ -0,0 +1,228 @@
+/*
+   @@@@@@@@@@@@@@@@@@@@
+   @@@@@@@@@&@@@&&@@@@@
+   @@@@@ @@  @@    @@@@
+   @@@@@ @@  @@    @@@@
+   @@@@@ @@  @@    @@@@ Copyright (c) 2023, Acceleration Robotics®
+   @@@@@ @@  @@    @@@@ Author: Víctor Mayoral Vilches <victor@accelerationrobotics.com>
+   @@@@@ @@  @@    @@@@ Author: Martiño Crespo <martinho@accelerationrobotics.com>
+   @@@@@@@@@&@@@@@@@@@@
+   @@@@@@@@@@@@@@@@@@@@
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+
+// Probe effect calibration of the tracetools_benchmark instrumentation.
+//
+// Measures, in a local loop and without any ROS graph, what the
+// instrumentation of the benchmark components costs on this host:
+//
+//   - a tracepoint call (robotperf_image_input_cb_init, sizes precomputed)
+//   - the message size computation the components run for each
+//     tracepoint (get_msg_size, a full serialization of the message), for
+//     CameraInfo and Image messages of several resolutions, fitted as
+//     fixed_ns + per_byte_ns * bytes
+//
+// and writes the results as YAML, to be loaded by the analyzer (see
+// BenchmarkAnalyzer.set_probe_calibration). Tracepoints only cost what
+// they do in a benchmark while recorded, so run it within a tracing
+// session enabling the robotperf_benchmarks events, e.g.:
+//
+//   lttng create calibration && lttng enable-event -u 'robotperf_benchmarks:*' && lttng start
+//   ros2 run a1_perception_2nodes probe_calibration --output /tmp/analysis/probe_calibration.yaml
+//   lttng destroy calibration
+//
+// The measurements assume the build flags of the benchmark components
+// (-O2, see CMakeLists.txt) minus -finstrument-functions: the calibration
+// times the instrumentation itself, not the function entry/exit hooks
+// instrumented code pays on top of it, which are part of what the
+// components do rather than of the probe effect subtracted.
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <string>
+#include <utility>
+#include <vector>
+#include <unistd.h>
+
+#include <rclcpp/serialization.hpp>
+#include <rclcpp/serialized_message.hpp>
+#include <sensor_msgs/msg/camera_info.hpp>
+#include <sensor_msgs/msg/image.hpp>
+
+#include "tracetools_benchmark/tracetools.h"
+
+namespace robotperf
+{
+
+namespace perception
+{
+
+using Clock = std::chrono::steady_clock;
+
+// Median time per call (ns) of f, out of repetitions batches of batch calls
+template<typename F>
+double median_ns(F && f, int repetitions, int batch)
+{
+  std::vector<double> samples;
+  samples.reserve(repetitions);
+  for (int repetition = 0; repetition < repetitions; ++repetition) {
+    auto start = Clock::now();
+    for (int call = 0; call < batch; ++call) {
+      f();
+    }
+    auto elapsed = std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start);
+    samples.push_back(static_cast<double>(elapsed.count()) / batch);
+  }
+  std::nth_element(samples.begin(), samples.begin() + samples.size() / 2, samples.end());
+  return samples[samples.size() / 2];
+}
+
+// Same size computation as the benchmark components (see ImageInputComponent::get_msg_size)
+template<typename MsgT>
+size_t get_msg_size(const MsgT & msg)
+{
+  rclcpp::SerializedMessage serialized_data;
+  rclcpp::Serialization<MsgT> serialization;
+  serialization.serialize_message(reinterpret_cast<const void *>(&msg), &serialized_data);
+  return serialized_data.size();
+}
+
+sensor_msgs::msg::Image make_image(uint32_t width, uint32_t height)
+{
+  sensor_msgs::msg::Image image;
+  image.header.frame_id = "camera";
+  image.width = width;
+  image.height = height;
+  image.encoding = "rgb8";
+  image.step = width * 3;
+  image.data.assign(static_cast<size_t>(image.step) * height, 0x55);
+  return image;
+}
+
+struct SizeSample
+{
+  std::string type;
+  uint32_t width;
+  uint32_t height;
+  size_t bytes;
+  double ns;
+};
+
+}  // namespace perception
+
+}  // namespace robotperf
+
+int main(int argc, char * argv[])
+{
+  using robotperf::perception::SizeSample;
+  using robotperf::perception::get_msg_size;
+  using robotperf::perception::make_image;
+  using robotperf::perception::median_ns;
+
+  std::string output = "/tmp/analysis/probe_calibration.yaml";
+  int repetitions = 201;
+  for (int i = 1; i < argc; ++i) {
+    if (std::strcmp(argv[i], "--output") == 0 && i + 1 < argc) {
+      output = argv[++i];
+    } else if (std::strcmp(argv[i], "--repetitions") == 0 && i + 1 < argc) {
+      repetitions = std::max(1, std::atoi(argv[++i]));
+    } else {
+      std::cerr << "usage: probe_calibration [--output FILE] [--repetitions N]" << std::endl;
+      return 1;
+    }
+  }
+
+  // loop overhead, subtracted from every measurement
+  volatile uint32_t sink = 0;
+  const double loop_ns = median_ns([&sink]() {sink = sink + 1;}, repetitions, 10000);
+
+  // tracepoint alone, with sizes precomputed
+  const uint32_t width = 640, height = 480;
+  auto image = make_image(width, height);
+  sensor_msgs::msg::CameraInfo info;
+  info.width = width;
+  info.height = height;
+  const size_t image_size = get_msg_size(image);
+  const size_t info_size = get_msg_size(info);
+  const double tracepoint_ns = median_ns(
+    [&]() {
+      TRACEPOINT(
+        robotperf_image_input_cb_init,
+        nullptr,  // no node
+        static_cast<const void *>(&image),
+        static_cast<const void *>(&info),
+        image.header.stamp.nanosec,
+        image.header.stamp.sec,
+        image_size,
+        info_size);
+    }, repetitions, 1000) - loop_ns;
+
+  // size computations, CameraInfo and images of increasing resolution
+  std::vector<SizeSample> samples;
+  samples.push_back(
+    {"sensor_msgs/msg/CameraInfo", info.width, info.height, info_size,
+      median_ns([&]() {sink = sink + get_msg_size(info);}, repetitions, 100) - loop_ns});
+  const std::vector<std::pair<uint32_t, uint32_t>> resolutions = {
+    {320, 240}, {640, 480}, {1280, 720}, {1920, 1080}};
+  for (const auto & resolution : resolutions) {
+    auto sample_image = make_image(resolution.first, resolution.second);
+    samples.push_back(
+      {"sensor_msgs/msg/Image", resolution.first, resolution.second, get_msg_size(sample_image),
+        median_ns([&]() {sink = sink + get_msg_size(sample_image);}, repetitions, 3) - loop_ns});
+  }
+
+  // least squares fit, ns = fixed_ns + per_byte_ns * bytes
+  double mean_bytes = 0.0, mean_ns = 0.0;
+  for (const auto & sample : samples) {
+    mean_bytes += static_cast<double>(sample.bytes) / samples.size();
+    mean_ns += sample.ns / samples.size();
+  }
+  double covariance = 0.0, variance = 0.0;
+  for (const auto & sample : samples) {
+    covariance += (sample.bytes - mean_bytes) * (sample.ns - mean_ns);
+    variance += (sample.bytes - mean_bytes) * (sample.bytes - mean_bytes);
+  }
+  const double per_byte_ns = variance > 0.0 ? std::max(0.0, covariance / variance) : 0.0;
+  const double fixed_ns = std::max(0.0, mean_ns - per_byte_ns * mean_bytes);
+
+  char hostname[256] = "unknown";
+  gethostname(hostname, sizeof(hostname) - 1);
+
+  std::ofstream out(output);
+  if (!out) {
+    std::cerr << "Can't write " << output << std::endl;
+    return 1;
+  }
+  out << "# probe effect of the tracetools_benchmark instrumentation, see probe_calibration.cpp\n";
+  out << "host: " << hostname << "\n";
+  out << "tracing: " << (ros_trace_compile_status() ? "true" : "false") << "\n";
+  out << "repetitions: " << repetitions << "\n";
+  out << "tracepoint_ns: " << std::max(0.0, tracepoint_ns) << "\n";
+  out << "msg_size:\n";
+  out << "  fixed_ns: " << fixed_ns << "\n";
+  out << "  per_byte_ns: " << per_byte_ns << "\n";
+  out << "  samples:\n";
+  for (const auto & sample : samples) {
+    out << "  - {type: " << sample.type << ", width: " << sample.width << ", height: " <<
+      sample.height << ", bytes: " << sample.bytes << ", ns: " << std::max(0.0, sample.ns) << "}\n";
+  }
+
+  std::cout << "tracepoint: " << tracepoint_ns << " ns, size computation: " << fixed_ns <<
+    " ns + " << per_byte_ns << " ns/byte, written to " << output << std::endl;
+  return 0;
+}